@@ -57,10 +57,27 @@ class Settings(BaseSettings):
     QDRANT_PORT: int = 6333
     QDRANT_API_KEY: Optional[str] = None
     QDRANT_COLLECTION_NAME: str = "claims"
+    QDRANT_PREFER_GRPC: bool = False  # Use gRPC instead of REST for vector traffic
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_GRPC_OPTIONS: dict[str, int] = {
+        "grpc.max_send_message_length": 64 * 1024 * 1024,
+        "grpc.max_receive_message_length": 64 * 1024 * 1024,
+    }
+
+    # Vector Store Backend
+    VECTOR_STORE_BACKEND: str = "qdrant"  # "qdrant" or "numpy" (in-process exact search)
+    VECTOR_STORE_PATH: Optional[str] = None  # Directory for numpy memmap persistence
 
     # Celery Configuration
     CELERY_BROKER_URL: Optional[str] = None
     CELERY_RESULT_BACKEND: Optional[str] = None
+    WORKER_POOL: str = "prefork"  # "prefork" (one task per process) or "async" (many tasks per process on one event loop)
+    WORKER_QUEUE: Optional[str] = None  # The one queue an async worker consumes (start it with -Q <queue>)
+    WORKER_QUEUE_CONCURRENCY: dict[str, int] = {  # Concurrent tasks of an async worker consuming each queue
+        "extraction": 8,
+        "retrieval": 64,
+        "decay": 32,
+    }
 
     @property
     def CELERY_BROKER(self) -> str:
@@ -75,12 +92,55 @@ class Settings(BaseSettings):
     GROK_API_BASE: str = "https://api.x.ai/v1"
     GROK_MODEL: str = "grok-beta"
 
+    # Claim Extraction Pipeline
+    EXTRACTION_CHUNK_CHARS: int = 12000  # Longer articles are extracted in paragraph-aligned chunks
+    EXTRACTION_CHUNK_CONCURRENCY: int = 2  # Grok extraction calls in flight per article
+    EXTRACTION_BATCH_SIZE: int = 96  # Claims per graph write / embedding / vector upsert batch (Cohere max)
+    EXTRACTION_QUEUE_DEPTH: int = 4  # Batches buffered between pipeline stages before backpressure
+    EXTRACTION_MAX_RETRIES: int = 3  # Retries of a failed extraction job (each resumes from its checkpoint)
+    EXTRACTION_RETRY_DELAY_SECONDS: int = 30  # Countdown before a failed extraction job is retried
+    BATCH_EXTRACTION_MAX_IN_FLIGHT: int = 50  # Articles dispatched at once per batch import (one chord per wave)
+    BATCH_FOLLOWUP_CHUNK_SIZE: int = 500  # New claims per chained decay / retrieval task
+
+    # Contradiction Scoring (local multilingual NLI cross-encoder)
+    NLI_ENABLED: bool = True
+    NLI_MODEL: str = "MoritzLaurer/mDeBERTa-v3-base-xnli-multilingual-nli-2mil7"
+    NLI_QUANTIZE: bool = False  # Dynamic int8 quantization of Linear layers (CPU)
+    NLI_BATCH_SIZE: int = 64  # Pairs per forward pass
+    NLI_MAX_LENGTH: int = 256  # Max tokens per (premise, hypothesis) pair
+    NLI_CONTRADICTION_THRESHOLD: float = 0.8  # At or above: contradiction
+    NLI_NO_CONTRADICTION_THRESHOLD: float = 0.2  # At or below: no contradiction
+    NLI_ESCALATE_TO_GROK: bool = True  # Send pairs between the thresholds to Grok
+
+    # Contradiction Verdict Cache (Redis + in-process LRU)
+    VERDICT_CACHE_ENABLED: bool = True
+    VERDICT_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60  # 30 days
+    VERDICT_CACHE_LRU_SIZE: int = 50000
+
+    # Decay Scoring
+    DECAY_LAZY_AGE: bool = False  # Store only base score + velocity boost; add age decay at read time
+    DECAY_REFRESH_TICK_SECONDS: int = 300  # How often the refresh scheduler pops due claims
+    DECAY_REFRESH_BATCH_SIZE: int = 500  # Claims re-scored per batch
+    DECAY_REFRESH_MAX_BATCHES: int = 20  # Batches per tick (bounds work per tick)
+    DECAY_REFRESH_FRACTION: float = 0.05  # Refresh after this fraction of a claim's half-life
+    DECAY_REFRESH_MIN_INTERVAL_HOURS: int = 24
+    DECAY_REFRESH_MAX_INTERVAL_DAYS: int = 90
+    DECAY_REFRESH_TRENDING_INTERVAL_HOURS: int = 6  # Trending claims are rechecked at least this often
+
     # X (Twitter) API Configuration
     X_API_KEY: str  # REQUIRED
     X_API_SECRET: str  # REQUIRED
     X_ACCESS_TOKEN: str  # REQUIRED
     X_ACCESS_TOKEN_SECRET: str  # REQUIRED
     X_BEARER_TOKEN: str  # REQUIRED
+    X_API_BASE: str = "https://api.twitter.com/2"
+    X_API_TIMEOUT_SECONDS: float = 10.0
+    X_API_MAX_CONNECTIONS: int = 20  # Pooled connections shared by all requests
+    X_API_MAX_RATE_LIMIT_WAIT_SECONDS: int = 30  # Longer waits fail fast instead
+    X_API_VELOCITY_CACHE_TTL_SECONDS: int = 3600  # Counts are hourly, so one fetch per entity per hour
+    X_STREAM_COUNTERS_ENABLED: bool = True  # Answer velocity from the mention monitor's counters when complete
+    X_STREAM_RULE_MAX_LENGTH: int = 512  # Filtered stream rule length limit for your access level
+    X_STREAM_MAX_RULES: int = 25  # Filtered stream rule count limit for your access level
 
     # Cohere API Configuration
     COHERE_API_KEY: str  # REQUIRED
@@ -93,6 +153,10 @@ class Settings(BaseSettings):
     # Cache Settings
     CACHE_TTL_SECONDS: int = 300  # 5 minutes
 
+    # Job Status (Redis hashes + pub/sub progress events)
+    JOB_STATUS_TTL_SECONDS: int = 7 * 24 * 60 * 60  # 7 days
+    JOB_PROGRESS_MIN_INTERVAL_SECONDS: float = 1.0  # Progress events per job are throttled to this rate
+
     # CORS Settings
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:3001"]
 
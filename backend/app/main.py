@@ -4,8 +4,11 @@ from fastapi.responses import JSONResponse
 from app.config import settings
 from app.routers import auth, ingest, graph, retrieve, triage
 from app.services.neo4j_client import neo4j_client
-from app.services.qdrant_client import qdrant_service
+from app.services.vector_store import vector_store
 from app.services.embedding_service import embedding_service
+from app.services.grok_client import grok_client
+from app.services.x_api_client import x_api_client
+from app.services.job_tracker import job_tracker
 from contextlib import asynccontextmanager
 
 
@@ -25,13 +28,13 @@ async def lifespan(app: FastAPI):
         print(f"✗ Failed to connect to Neo4j: {e}")
 
     try:
-        await qdrant_service.connect()
+        await vector_store.connect()
         # Create collection if it doesn't exist
-        if not await qdrant_service.collection_exists():
-            await qdrant_service.create_collection()
-        print("✓ Connected to Qdrant")
+        if not await vector_store.collection_exists():
+            await vector_store.create_collection()
+        print(f"✓ Connected to vector store ({settings.VECTOR_STORE_BACKEND})")
     except Exception as e:
-        print(f"✗ Failed to connect to Qdrant: {e}")
+        print(f"✗ Failed to connect to vector store: {e}")
 
     print(f"✓ Antibody API started on {settings.HOST}:{settings.PORT}")
 
@@ -41,8 +44,11 @@ async def lifespan(app: FastAPI):
     print("Shutting down Antibody API...")
 
     await neo4j_client.close()
-    await qdrant_service.close()
+    await vector_store.close()
     await embedding_service.close()
+    await grok_client.close()
+    await x_api_client.close()
+    await job_tracker.close()
 
     print("✓ Antibody API shutdown complete")
 
@@ -109,7 +115,7 @@ async def health_check():
 
     # Check Qdrant
     try:
-        await qdrant_service.collection_exists()
+        await vector_store.collection_exists()
         health_status["services"]["qdrant"] = "connected"
     except Exception as e:
         health_status["services"]["qdrant"] = f"error: {str(e)}"
@@ -16,6 +16,7 @@ class ClaimCreate(ClaimBase):
     """Model for creating a new claim"""
     is_immutable: bool = Field(default=False, description="Whether the claim is immutable")
     confidence_level: float = Field(default=0.5, ge=0.0, le=1.0)
+    entities: List[str] = Field(default_factory=list, description="Named entities the claim is about")
 
 
 class ClaimNode(ClaimBase):
@@ -26,6 +27,7 @@ class ClaimNode(ClaimBase):
     half_life_days: int = Field(default=365)
     is_immutable: bool = Field(default=False)
     contradiction_count: int = Field(default=0)
+    entities: List[str] = Field(default_factory=list)
     embedding: Optional[List[float]] = None
 
     class Config:
@@ -79,6 +81,14 @@ class ArticleIngestRequest(BaseModel):
     source_urls: List[str] = Field(default_factory=list)
 
 
+class BatchIngestRequest(BaseModel):
+    """Request model for batch article ingestion"""
+    articles: List[ArticleIngestRequest]
+    max_in_flight: Optional[int] = None  # Defaults to BATCH_EXTRACTION_MAX_IN_FLIGHT
+    chain_decay: bool = False  # Score decay for all new claims when extraction finishes
+    chain_retrieval: bool = False  # Run adversarial retrieval for all new claims when extraction finishes
+
+
 class ArticleIngestResponse(BaseModel):
     """Response model for article ingestion"""
     job_id: str
@@ -91,6 +101,7 @@ class JobStatus(BaseModel):
     job_id: str
     status: str  # queued, processing, completed, failed
     progress: Optional[int] = None  # percentage 0-100
+    message: Optional[str] = None
     result: Optional[dict] = None
     error: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
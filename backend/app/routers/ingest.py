@@ -1,45 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from app.models.claim import ArticleIngestRequest, ArticleIngestResponse, JobStatus
-from app.utils.auth import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from app.models.claim import ArticleIngestRequest, ArticleIngestResponse, BatchIngestRequest, JobStatus
+from app.models.user import TokenData
+from app.services.job_tracker import job_tracker
+from app.services.batch_ingest import batch_ingest
+from app.workers.extraction_worker import extract_claims_task, batch_extract_claims_task
+from app.utils.auth import get_current_user, get_websocket_user
 from uuid import uuid4
-from datetime import datetime
+import json
 
 router = APIRouter(prefix="/api/ingest", tags=["ingestion"])
 
-# In-memory job storage (in production, use Redis or PostgreSQL)
-jobs_db = {}
 
-
-@router.post("/article", response_model=ArticleIngestResponse, dependencies=[Depends(get_current_user)])
-async def ingest_article(article: ArticleIngestRequest):
+@router.post("/article", response_model=ArticleIngestResponse)
+async def ingest_article(article: ArticleIngestRequest, current_user: TokenData = Depends(get_current_user)):
     """
     Ingest a new article for claim extraction
 
-    This endpoint queues the article for processing and returns a job ID
+    This endpoint queues the article for processing and returns a job ID.
+    Follow the job with /ws/{job_id} or /events/{job_id} instead of polling.
     """
     # Generate job ID
     job_id = str(uuid4())
 
-    # Create job status record
-    job = JobStatus(
+    # Create job status record (in Redis, so every API replica sees it)
+    await job_tracker.create(job_id, owner_id=current_user.user_id)
+
+    # Queue the article for processing
+    extract_claims_task.delay(article.model_dump(), job_id)
+
+    return ArticleIngestResponse(
         job_id=job_id,
         status="queued",
-        progress=0,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        message=f"Article '{article.title}' queued for processing"
     )
 
-    jobs_db[job_id] = job
 
-    # Queue the article for processing
-    # In production, this would use Celery:
-    # from app.workers.extraction_worker import extract_claims_task
-    # extract_claims_task.delay(article.model_dump(), job_id)
+@router.post("/batch", response_model=ArticleIngestResponse)
+async def ingest_batch(batch: BatchIngestRequest, current_user: TokenData = Depends(get_current_user)):
+    """
+    Ingest many articles as one tracked, throttled workflow
+
+    Articles are staged in Redis and extracted max_in_flight at a time. The
+    returned job ID follows the whole batch (including any chained decay
+    scoring and retrieval) and ends with a summary of the import.
+    """
+    if not batch.articles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No articles to ingest"
+        )
+
+    batch_id = str(uuid4())
+
+    await job_tracker.create(batch_id, owner_id=current_user.user_id)
+    await batch_ingest.stage(
+        batch_id,
+        [article.model_dump() for article in batch.articles],
+        max_in_flight=batch.max_in_flight,
+        chain_decay=batch.chain_decay,
+        chain_retrieval=batch.chain_retrieval
+    )
+
+    # Only the batch ID goes through the broker; the articles are in Redis
+    batch_extract_claims_task.delay(batch_id=batch_id)
 
     return ArticleIngestResponse(
-        job_id=job_id,
+        job_id=batch_id,
         status="queued",
-        message=f"Article '{article.title}' queued for processing"
+        message=f"{len(batch.articles)} articles queued for processing"
     )
 
 
@@ -47,7 +76,7 @@ async def ingest_article(article: ArticleIngestRequest):
 async def get_job_status(job_id: str):
     """Get the status of an ingestion job"""
 
-    job = jobs_db.get(job_id)
+    job = await job_tracker.get(job_id)
 
     if not job:
         raise HTTPException(
@@ -58,14 +87,78 @@ async def get_job_status(job_id: str):
     return job
 
 
+async def _can_follow_job(job_id: str, user: TokenData) -> bool:
+    """Whether a user may follow a job's progress: its owner, or an admin"""
+    return user.role == "admin" or await job_tracker.owner(job_id) == user.user_id
+
+
+@router.websocket("/ws/{job_id}")
+async def job_progress_websocket(websocket: WebSocket, job_id: str):
+    """
+    Push an ingestion job's status over a WebSocket
+
+    Authenticate with a Bearer Authorization header or a `token` query
+    parameter. Sends the current status, then every progress update, and
+    closes once the job completes or fails. Failed authentication is closed
+    with code 4401; unknown jobs and other users' jobs with code 4404.
+    """
+    await websocket.accept()
+
+    current_user = await get_websocket_user(websocket)
+    if current_user is None:
+        await websocket.close(code=4401)
+        return
+
+    if not await _can_follow_job(job_id, current_user):
+        await websocket.close(code=4404)
+        return
+
+    sent = False
+    try:
+        async for job in job_tracker.events(job_id):
+            await websocket.send_text(job.model_dump_json())
+            sent = True
+    except WebSocketDisconnect:
+        return
+    except Exception as e:
+        print(f"Error streaming job {job_id} progress: {e}")
+        await websocket.close(code=1011)
+        return
+
+    await websocket.close(code=1000 if sent else 4404)
+
+
+@router.get("/events/{job_id}")
+async def job_progress_events(job_id: str, current_user: TokenData = Depends(get_current_user)):
+    """
+    Stream an ingestion job's status as server-sent events
+
+    Emits `status` events (the JobStatus JSON) until the job completes or
+    fails. Other users' jobs are reported as not found.
+    """
+    if not await job_tracker.get(job_id) or not await _can_follow_job(job_id, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+    async def event_stream():
+        try:
+            async for job in job_tracker.events(job_id):
+                yield f"event: status\ndata: {job.model_dump_json()}\n\n"
+        except Exception as e:
+            print(f"Error streaming job {job_id} progress: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/jobs", response_model=list[JobStatus], dependencies=[Depends(get_current_user)])
 async def list_jobs(limit: int = 50, offset: int = 0):
     """List all ingestion jobs with pagination"""
 
-    all_jobs = sorted(
-        jobs_db.values(),
-        key=lambda j: j.created_at,
-        reverse=True
-    )
-
-    return all_jobs[offset:offset + limit]
+    return await job_tracker.list_jobs(limit=limit, offset=offset)
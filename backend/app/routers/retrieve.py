@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi.responses import StreamingResponse
 from app.models.claim import ContradictingSource
 from app.services.adversarial_retriever import adversarial_retriever
 from app.services.neo4j_client import neo4j_client
@@ -6,6 +7,8 @@ from app.utils.auth import get_current_user
 from uuid import UUID
 from typing import List, Optional
 from pydantic import BaseModel
+import json
+import time
 
 router = APIRouter(prefix="/api/retrieve", tags=["retrieval"])
 
@@ -51,6 +54,63 @@ async def run_adversarial_retrieval(request: AdversarialRetrievalRequest):
     return contradicting_sources
 
 
+@router.post("/adversarial/stream", dependencies=[Depends(get_current_user)])
+async def stream_adversarial_retrieval(request: AdversarialRetrievalRequest):
+    """
+    Run adversarial retrieval, streaming results as server-sent events
+
+    Emits a `contradiction` event with a ContradictingSource as soon as each
+    one is confirmed, then a final `summary` event (or an `error` event if
+    retrieval fails part-way).
+    """
+    # Get the claim
+    claim = await neo4j_client.get_claim_by_id(request.claim_id)
+
+    if not claim:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Claim {request.claim_id} not found"
+        )
+
+    async def event_stream():
+        started = time.perf_counter()
+        found = 0
+
+        try:
+            async for contradicting_source in adversarial_retriever.stream_contradicting_sources(
+                claim_id=request.claim_id,
+                claim_text=claim.text,
+                target_languages=request.target_languages,
+                max_results=request.max_results
+            ):
+                found += 1
+                yield _sse_event("contradiction", contradicting_source.model_dump_json())
+        except Exception as e:
+            print(f"Error streaming adversarial retrieval: {e}")
+            yield _sse_event("error", json.dumps({"detail": str(e)}))
+            return
+
+        yield _sse_event("summary", json.dumps({
+            "claim_id": str(request.claim_id),
+            "contradictions_found": found,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000)
+        }))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Stop nginx from buffering the stream
+        }
+    )
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
 @router.post("/similar", dependencies=[Depends(get_current_user)])
 async def search_similar_claims(request: SimilarSearchRequest):
     """
@@ -76,10 +136,10 @@ async def get_retrieval_stats():
     """Get statistics about the retrieval system"""
 
     # In production, get actual stats from Qdrant and Neo4j
-    from app.services.qdrant_client import qdrant_service
+    from app.services.vector_store import vector_store
 
     try:
-        collection_info = await qdrant_service.get_collection_info()
+        collection_info = await vector_store.get_collection_info()
 
         return {
             "vector_database": collection_info,
@@ -1,10 +1,15 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from uuid import UUID
 from app.services.embedding_service import embedding_service
-from app.services.qdrant_client import qdrant_service
+from app.services.vector_store import vector_store
 from app.services.neo4j_client import neo4j_client
+from app.services.nli_service import nli_service
+from app.services.grok_client import grok_client
+from app.services.verdict_cache import verdict_cache
+from app.config import settings
 from app.models.claim import ContradictingSource
 from datetime import datetime
+import asyncio
 
 
 class AdversarialRetriever:
@@ -15,7 +20,22 @@ class AdversarialRetriever:
     def __init__(self):
         self.default_target_languages = ["en", "es", "fr", "de", "zh", "ar", "ru", "ja"]
         self.similarity_threshold = 0.75
-        self.max_results = 20
+        self.page_size = 20  # Candidates fetched and assessed per page
+        self.candidate_budget = 100  # Max candidates fetched per claim
+        self.batch_size = 96  # Matches the Cohere embed batch limit
+        self.max_concurrency = 8  # Concurrent candidate lookups/assessments per claim
+        self.max_claim_concurrency = 4  # Claims assessed concurrently per search page
+        self.contradiction_threshold = settings.NLI_CONTRADICTION_THRESHOLD
+        self.no_contradiction_threshold = settings.NLI_NO_CONTRADICTION_THRESHOLD
+        self.escalate_to_grok = settings.NLI_ESCALATE_TO_GROK
+
+    @property
+    def assessor_version(self) -> str:
+        """Identifies how verdicts are produced, for the pair verdict cache"""
+        grok = f"grok:{grok_client.model}" if self.escalate_to_grok else "no-grok"
+        return (
+            f"{nli_service.version}|{self.no_contradiction_threshold}-{self.contradiction_threshold}|{grok}"
+        )
 
     async def find_contradicting_sources(
         self,
@@ -27,6 +47,10 @@ class AdversarialRetriever:
         """
         Find potentially contradicting sources for a claim across multiple languages
 
+        Candidates are fetched and assessed a page at a time, stopping as soon
+        as max_results contradictions are confirmed or the candidate budget
+        is spent.
+
         Args:
             claim_id: ID of the claim to check
             claim_text: Text of the claim
@@ -36,58 +60,449 @@ class AdversarialRetriever:
         Returns:
             List of ContradictingSource objects
         """
+        results = await self.find_contradicting_sources_batch(
+            claims=[(claim_id, claim_text)],
+            target_languages=target_languages,
+            max_results=max_results
+        )
+        return results[claim_id]
+
+    async def find_contradicting_sources_batch(
+        self,
+        claims: List[Tuple[UUID, str]],
+        target_languages: Optional[List[str]] = None,
+        max_results: int = 10
+    ) -> Dict[UUID, List[ContradictingSource]]:
+        """
+        Find contradicting sources for many claims at once
+
+        Stored vectors are fetched in one request (claims missing from the
+        store are embedded in a single Cohere call) and searched with a single
+        Qdrant batch request per chunk of `batch_size` claims, then the
+        candidates are fanned back out and assessed per claim.
+
+        Args:
+            claims: List of (claim_id, claim_text) tuples
+            target_languages: Languages to search in (defaults to major languages)
+            max_results: Maximum number of contradicting sources per claim
+
+        Returns:
+            Dictionary mapping claim ID to its list of ContradictingSource objects
+        """
         if target_languages is None:
             target_languages = self.default_target_languages
 
-        # Generate embedding for the claim
-        claim_embedding = await embedding_service.embed_claim(claim_text)
+        results: Dict[UUID, List[ContradictingSource]] = {}
 
-        # Search for semantically similar claims in vector database
-        similar_claims = await qdrant_service.search_contradicting_claims(
-            query_vector=claim_embedding,
-            original_claim_id=claim_id,
-            target_languages=target_languages,
-            limit=self.max_results,
-            score_threshold=self.similarity_threshold
-        )
+        for i in range(0, len(claims), self.batch_size):
+            batch = claims[i:i + self.batch_size]
+
+            # Reuse stored vectors, embedding the rest in one call
+            claim_embeddings = await self._get_claim_vectors(batch)
+
+            results.update(await self._progressive_search(
+                claims=batch,
+                claim_embeddings=claim_embeddings,
+                target_languages=target_languages,
+                max_results=max_results
+            ))
+
+        return results
+
+    async def stream_contradicting_sources(
+        self,
+        claim_id: UUID,
+        claim_text: str,
+        target_languages: Optional[List[str]] = None,
+        max_results: int = 10
+    ) -> AsyncIterator[ContradictingSource]:
+        """
+        Yield contradicting sources for a claim as soon as each is confirmed
+
+        Same search and assessment as find_contradicting_sources, but results
+        are produced incrementally so callers can stream them to clients.
+
+        Args:
+            claim_id: ID of the claim to check
+            claim_text: Text of the claim
+            target_languages: Languages to search in (defaults to major languages)
+            max_results: Maximum number of contradicting sources to yield
+
+        Yields:
+            ContradictingSource objects, in similarity order within each page
+        """
+        if target_languages is None:
+            target_languages = self.default_target_languages
+
+        query_vector = (await self._get_claim_vectors([(claim_id, claim_text)]))[0]
+        found = 0
+        offset = 0
+
+        while found < max_results and offset < self.candidate_budget:
+            page_limit = min(self.page_size, self.candidate_budget - offset)
+
+            similar_claims = await vector_store.search_contradicting_claims(
+                query_vector=query_vector,
+                original_claim_id=claim_id,
+                target_languages=target_languages,
+                limit=page_limit,
+                score_threshold=self.similarity_threshold,
+                offset=offset
+            )
+
+            async for contradicting_source in self._iter_contradictions(
+                claim_id=claim_id,
+                claim_text=claim_text,
+                similar_claims=similar_claims,
+                max_results=max_results - found
+            ):
+                found += 1
+                yield contradicting_source
+
+            if len(similar_claims) < page_limit:
+                break
+
+            offset += page_limit
+
+    async def _progressive_search(
+        self,
+        claims: List[Tuple[UUID, str]],
+        claim_embeddings: List[List[float]],
+        target_languages: List[str],
+        max_results: int
+    ) -> Dict[UUID, List[ContradictingSource]]:
+        """
+        Page through the similarity ranking until enough contradictions are found
+
+        Each round issues one batched search for every claim still looking,
+        at the next offset, and assesses the page's claims concurrently. A
+        claim stops once it has max_results contradictions, its ranking is
+        exhausted (short page), or `candidate_budget` candidates have been
+        fetched for it.
+
+        Args:
+            claims: List of (claim_id, claim_text) tuples
+            claim_embeddings: Query vectors aligned with claims
+            target_languages: Languages to search in
+            max_results: Maximum number of contradicting sources per claim
+
+        Returns:
+            Dictionary mapping claim ID to its list of ContradictingSource objects
+        """
+        results: Dict[UUID, List[ContradictingSource]] = {claim_id: [] for claim_id, _ in claims}
+        active = list(range(len(claims)))
+        offset = 0
+        semaphore = asyncio.Semaphore(self.max_claim_concurrency)
+
+        async def assess_page(i: int, similar_claims: List[Dict[str, Any]]) -> List[ContradictingSource]:
+            claim_id, claim_text = claims[i]
+            async with semaphore:
+                return await self._collect_contradictions(
+                    claim_id=claim_id,
+                    claim_text=claim_text,
+                    similar_claims=similar_claims,
+                    max_results=max_results - len(results[claim_id])
+                )
+
+        while active and offset < self.candidate_budget:
+            page_limit = min(self.page_size, self.candidate_budget - offset)
+
+            # One batched search request for every claim still looking
+            pages = await vector_store.search_batch(
+                query_vectors=[claim_embeddings[i] for i in active],
+                original_claim_ids=[claims[i][0] for i in active],
+                target_languages=target_languages,
+                limit=page_limit,
+                score_threshold=self.similarity_threshold,
+                offset=offset
+            )
+
+            # Assess every claim's page concurrently
+            found = await asyncio.gather(*(
+                assess_page(i, similar_claims) for i, similar_claims in zip(active, pages)
+            ))
+
+            still_active = []
+            for i, similar_claims, contradicting_sources in zip(active, pages, found):
+                claim_id = claims[i][0]
+                results[claim_id].extend(contradicting_sources)
+
+                if len(results[claim_id]) < max_results and len(similar_claims) == page_limit:
+                    still_active.append(i)
+
+            active = still_active
+            offset += page_limit
+
+        return results
 
-        # For each similar claim, assess if it actually contradicts
-        contradicting_sources = []
+    async def _get_claim_vectors(self, claims: List[Tuple[UUID, str]]) -> List[List[float]]:
+        """
+        Get query vectors for claims, preferring the vectors stored at ingest
+
+        Claims already in the vector store need no embedding API call; only
+        claims missing from it are embedded, in a single batch.
+
+        Args:
+            claims: List of (claim_id, claim_text) tuples
 
-        for similar_claim in similar_claims:
-            # Get the full claim data from Neo4j
-            similar_claim_data = await neo4j_client.get_claim_by_id(
-                UUID(similar_claim["claim_id"])
+        Returns:
+            One vector per claim, in input order
+        """
+        stored_vectors = await vector_store.get_vectors([claim_id for claim_id, _ in claims])
+
+        missing = [
+            i for i, (claim_id, _) in enumerate(claims)
+            if str(claim_id) not in stored_vectors
+        ]
+        embedded = []
+        if missing:
+            embedded = await embedding_service.embed_batch(
+                [claims[i][1] for i in missing],
+                input_type="search_document"
             )
 
-            if not similar_claim_data:
-                continue
+        vectors = [stored_vectors.get(str(claim_id)) for claim_id, _ in claims]
+        for i, embedding in zip(missing, embedded):
+            vectors[i] = embedding
+
+        return vectors
+
+    async def _collect_contradictions(
+        self,
+        claim_id: UUID,
+        claim_text: str,
+        similar_claims: List[Dict[str, Any]],
+        max_results: int
+    ) -> List[ContradictingSource]:
+        """
+        Assess vector search candidates and keep the ones that contradict the claim
+
+        Args:
+            claim_id: ID of the claim being checked
+            claim_text: Text of the claim being checked
+            similar_claims: Candidates returned by the vector search
+            max_results: Maximum number of contradicting sources to return
 
-            # Check if claims contradict (simplified - in production use LLM)
-            is_contradicting = await self._assess_contradiction(
-                claim_text,
-                similar_claim_data.text
+        Returns:
+            List of ContradictingSource objects
+        """
+        return [
+            contradicting_source
+            async for contradicting_source in self._iter_contradictions(
+                claim_id, claim_text, similar_claims, max_results
             )
+        ]
+
+    async def _iter_contradictions(
+        self,
+        claim_id: UUID,
+        claim_text: str,
+        similar_claims: List[Dict[str, Any]],
+        max_results: int
+    ) -> AsyncIterator[ContradictingSource]:
+        """
+        Assess vector search candidates, yielding each contradiction once confirmed
 
-            if is_contradicting:
-                contradicting_source = ContradictingSource(
-                    url=similar_claim_data.source_url,
-                    text=similar_claim_data.text,
-                    language=similar_claim_data.language,
-                    confidence_score=similar_claim["score"],
-                    retrieved_at=datetime.utcnow()
+        Sources are yielded in similarity order. Checks for lower-ranked
+        candidates keep running while a caller consumes earlier results, and
+        are cancelled once max_results is reached or the caller stops early.
+
+        Args:
+            claim_id: ID of the claim being checked
+            claim_text: Text of the claim being checked
+            similar_claims: Candidates returned by the vector search
+            max_results: Maximum number of contradicting sources to yield
+
+        Yields:
+            ContradictingSource objects
+        """
+        if max_results <= 0:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_candidate(similar_claim: Dict[str, Any]):
+            async with semaphore:
+                # Get the full claim data from Neo4j
+                return await neo4j_client.get_claim_by_id(UUID(similar_claim["claim_id"]))
+
+        # Enrich all candidates concurrently
+        candidate_claims = await asyncio.gather(*(fetch_candidate(c) for c in similar_claims))
+        candidates = [
+            (similar_claim, similar_claim_data)
+            for similar_claim, similar_claim_data in zip(similar_claims, candidate_claims)
+            if similar_claim_data
+        ]
+
+        # Skip assessment for every pair whose verdict is already known
+        assessor_version = self.assessor_version
+        pair_keys = [
+            verdict_cache.pair_key(claim_text, similar_claim_data.text, assessor_version)
+            for _, similar_claim_data in candidates
+        ]
+        known_verdicts = await verdict_cache.get_many(pair_keys)
+        unknown = [
+            i for i, pair_key in enumerate(pair_keys)
+            if pair_key not in known_verdicts
+        ]
+
+        # Score every remaining pair in one batched NLI pass
+        unknown_scores = await self._score_pairs(
+            [(claim_text, candidates[i][1].text) for i in unknown]
+        )
+        nli_scores: List[Optional[float]] = [None] * len(candidates)
+        for i, nli_score in zip(unknown, unknown_scores):
+            nli_scores[i] = nli_score
+
+        new_verdicts: Dict[str, bool] = {}
+
+        async def check_candidate(
+            similar_claim: Dict[str, Any],
+            similar_claim_data,
+            pair_key: str,
+            nli_score: Optional[float]
+        ) -> Optional[ContradictingSource]:
+            if pair_key in known_verdicts:
+                is_contradicting = known_verdicts[pair_key]
+            else:
+                is_contradicting, is_final = await self._resolve_contradiction(
+                    claim_text,
+                    similar_claim_data.text,
+                    nli_score,
+                    semaphore
                 )
-                contradicting_sources.append(contradicting_source)
+                if is_final:
+                    new_verdicts[pair_key] = is_contradicting
+
+            if not is_contradicting:
+                return None
+
+            return ContradictingSource(
+                url=similar_claim_data.source_url,
+                text=similar_claim_data.text,
+                language=similar_claim_data.language,
+                confidence_score=similar_claim["score"],
+                retrieved_at=datetime.utcnow()
+            )
+
+        # Candidates arrive in score order. Start every check at once and
+        # consume them in that order so results stay sorted by score.
+        tasks = [
+            asyncio.create_task(check_candidate(similar_claim, similar_claim_data, pair_key, nli_score))
+            for (similar_claim, similar_claim_data), pair_key, nli_score in zip(candidates, pair_keys, nli_scores)
+        ]
+        found = 0
+
+        try:
+            for task in tasks:
+                contradicting_source = await task
+                if contradicting_source is None:
+                    continue
+
+                # Update contradiction count in Neo4j as each one is confirmed
+                await neo4j_client.increment_contradiction_count(claim_id)
+                found += 1
+                yield contradicting_source
 
-                if len(contradicting_sources) >= max_results:
+                if found >= max_results:
                     break
+        finally:
+            # Cancel outstanding checks once enough contradictions are confirmed
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await verdict_cache.set_many(new_verdicts)
+
+    async def assess_pairs(self, pairs: List[Tuple[str, str]]) -> List[bool]:
+        """
+        Assess many claim text pairs at once
 
-        # Update contradiction count in Neo4j if contradictions found
-        if contradicting_sources:
-            for _ in range(len(contradicting_sources)):
-                await neo4j_client.increment_contradiction_count(claim_id)
+        All pairs are scored in one batched NLI run, ambiguous pairs are
+        escalated to Grok concurrently, and final verdicts are written to the
+        verdict cache. Callers should drop pairs with cached verdicts first.
+
+        Args:
+            pairs: List of (claim_text, other_claim_text) tuples
+
+        Returns:
+            True per pair if the claims contradict, False otherwise
+        """
+        if not pairs:
+            return []
+
+        nli_scores = await self._score_pairs(pairs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        resolved = await asyncio.gather(*(
+            self._resolve_contradiction(claim_text, other_text, nli_score, semaphore)
+            for (claim_text, other_text), nli_score in zip(pairs, nli_scores)
+        ))
+
+        assessor_version = self.assessor_version
+        await verdict_cache.set_many({
+            verdict_cache.pair_key(claim_text, other_text, assessor_version): is_contradicting
+            for (claim_text, other_text), (is_contradicting, is_final) in zip(pairs, resolved)
+            if is_final
+        })
+
+        return [is_contradicting for is_contradicting, _ in resolved]
+
+    async def _score_pairs(self, pairs: List[Tuple[str, str]]) -> List[Optional[float]]:
+        """
+        Score claim text pairs with the local NLI model in one batched run
+
+        Returns None per pair when the NLI model is disabled or fails,
+        in which case the heuristic in _assess_contradiction is used.
+        """
+        if not nli_service.enabled or not pairs:
+            return [None] * len(pairs)
 
-        return contradicting_sources
+        try:
+            return await nli_service.score_pairs(pairs)
+        except Exception as e:
+            print(f"Error scoring contradictions with NLI model: {e}")
+            return [None] * len(pairs)
+
+    async def _resolve_contradiction(
+        self,
+        claim_text: str,
+        candidate_text: str,
+        nli_score: Optional[float],
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[bool, bool]:
+        """
+        Turn an NLI score into a verdict, escalating ambiguous pairs to Grok
+
+        Args:
+            claim_text: Text of the claim being checked
+            candidate_text: Text of the candidate claim
+            nli_score: Contradiction probability from the NLI model, or None
+            semaphore: Limits concurrent Grok calls for this claim
+
+        Returns:
+            Tuple of (is_contradicting, is_final). is_final is False when a
+            fallback produced the verdict, so it must not be cached.
+        """
+        if nli_score is None:
+            return await self._assess_contradiction(claim_text, candidate_text), False
+
+        if nli_score >= self.contradiction_threshold:
+            return True, True
+
+        if nli_score <= self.no_contradiction_threshold:
+            return False, True
+
+        if not self.escalate_to_grok:
+            return nli_score >= 0.5, True
+
+        try:
+            async with semaphore:
+                result = await grok_client.assess_contradiction(claim_text, candidate_text)
+            return result["contradicts"], True
+        except Exception as e:
+            print(f"Error escalating contradiction check to Grok: {e}")
+            return nli_score >= 0.5, False
 
     async def _assess_contradiction(
         self,
@@ -95,10 +510,9 @@ class AdversarialRetriever:
         claim2: str
     ) -> bool:
         """
-        Assess if two claims contradict each other
+        Assess if two claims contradict each other with a negation heuristic
 
-        This is a simplified implementation. In production, use an LLM
-        or fine-tuned NLI (Natural Language Inference) model.
+        Fallback used when the NLI model is disabled or unavailable.
 
         Args:
             claim1: First claim text
@@ -107,9 +521,6 @@ class AdversarialRetriever:
         Returns:
             True if claims contradict, False otherwise
         """
-        # Simplified heuristic approach
-        # In production, use Grok or a dedicated NLI model
-
         # Check for negation patterns
         negation_words = ["not", "no", "never", "false", "incorrect", "untrue", "disproven"]
 
@@ -134,11 +545,6 @@ class AdversarialRetriever:
             if len(significant_common) >= 2:
                 return True
 
-        # For a production system, use this approach instead:
-        # from app.services.grok_client import grok_client
-        # result = await grok_client.assess_contradiction(claim1, claim2)
-        # return result["contradicts"]
-
         return False
 
     async def search_similar_claims(
@@ -162,7 +568,7 @@ class AdversarialRetriever:
         query_embedding = await embedding_service.embed_query(query_text)
 
         # Search in vector database
-        similar_claims = await qdrant_service.search_similar_claims(
+        similar_claims = await vector_store.search_similar_claims(
             query_vector=query_embedding,
             limit=max_results,
             language=language,
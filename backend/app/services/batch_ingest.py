@@ -0,0 +1,177 @@
+from typing import List, Dict, Any, Optional
+from app.config import settings
+from app.utils.redis_client import get_redis
+import json
+import time
+
+
+class BatchIngest:
+    """
+    Redis-backed state for batch article imports
+
+    Articles are staged in a list (`batch:{id}:articles`) and handed out a
+    wave at a time, so the Celery workflow never carries the remaining
+    articles in its messages. Each completed wave adds to the batch counters,
+    the new claim IDs and the per-article results, which the final callback
+    turns into one summary.
+    """
+
+    def __init__(self):
+        self.key_prefix = "batch:"
+        self.ttl_seconds = settings.JOB_STATUS_TTL_SECONDS
+        self.max_in_flight = settings.BATCH_EXTRACTION_MAX_IN_FLIGHT
+        self.followup_chunk_size = settings.BATCH_FOLLOWUP_CHUNK_SIZE
+        self.max_reported_failures = 100  # Failed articles listed in the summary
+
+    def _key(self, batch_id: str, name: str) -> str:
+        return f"{self.key_prefix}{batch_id}:{name}"
+
+    async def stage(
+        self,
+        batch_id: str,
+        articles: List[Dict[str, Any]],
+        max_in_flight: Optional[int] = None,
+        chain_decay: bool = False,
+        chain_retrieval: bool = False
+    ):
+        """
+        Store a batch's articles and options
+
+        Args:
+            batch_id: The batch (also its job ID)
+            articles: Article dictionaries with article_id, title, content, source_urls
+            max_in_flight: Articles dispatched per wave
+            chain_decay: Score decay for all new claims at the end
+            chain_retrieval: Run adversarial retrieval for all new claims at the end
+        """
+        articles_key = self._key(batch_id, "articles")
+        meta_key = self._key(batch_id, "meta")
+
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.delete(articles_key)
+            for i in range(0, len(articles), 500):
+                pipe.rpush(articles_key, *[json.dumps(article) for article in articles[i:i + 500]])
+            pipe.hset(meta_key, mapping={
+                "total": len(articles),
+                "done": 0,
+                "succeeded": 0,
+                "failed": 0,
+                "claims_extracted": 0,
+                "waves": 0,
+                "started_at": time.time(),
+                "options": json.dumps({
+                    "max_in_flight": max_in_flight or self.max_in_flight,
+                    "chain_decay": chain_decay,
+                    "chain_retrieval": chain_retrieval
+                })
+            })
+            for name in ("articles", "meta"):
+                pipe.expire(self._key(batch_id, name), self.ttl_seconds)
+            await pipe.execute()
+
+    async def options(self, batch_id: str) -> Dict[str, Any]:
+        """The options the batch was staged with"""
+        value = await get_redis().hget(self._key(batch_id, "meta"), "options")
+        if value is None:
+            raise ValueError(f"Batch {batch_id} not found")
+        return json.loads(value)
+
+    async def counters(self, batch_id: str) -> Dict[str, int]:
+        """The batch's article and claim counters"""
+        return self._counters(await get_redis().hgetall(self._key(batch_id, "meta")))
+
+    async def next_wave(self, batch_id: str, size: int) -> List[Dict[str, Any]]:
+        """Remove and return the next `size` staged articles"""
+        key = self._key(batch_id, "articles")
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, size - 1)
+            pipe.ltrim(key, size, -1)
+            articles, _ = await pipe.execute()
+
+        return [json.loads(article) for article in articles]
+
+    async def record_wave(self, batch_id: str, results: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Add a wave's extraction results to the batch
+
+        Args:
+            batch_id: The batch
+            results: extract_claims_task results, one per article
+
+        Returns:
+            The batch counters after this wave
+        """
+        meta_key = self._key(batch_id, "meta")
+        claim_ids = [claim_id for result in results for claim_id in result.get("claim_ids", [])]
+        succeeded = sum(1 for result in results if result.get("status") == "completed")
+
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.hincrby(meta_key, "done", len(results))
+            pipe.hincrby(meta_key, "succeeded", succeeded)
+            pipe.hincrby(meta_key, "failed", len(results) - succeeded)
+            pipe.hincrby(meta_key, "claims_extracted", sum(result.get("claims_extracted", 0) for result in results))
+            pipe.hincrby(meta_key, "waves", 1)
+            if claim_ids:
+                pipe.rpush(self._key(batch_id, "claim_ids"), *claim_ids)
+            if results:
+                pipe.rpush(self._key(batch_id, "results"), *[
+                    json.dumps({
+                        "job_id": result.get("job_id"),
+                        "status": result.get("status"),
+                        "claims_extracted": result.get("claims_extracted", 0),
+                        "error": result.get("error")
+                    })
+                    for result in results
+                ])
+            for name in ("claim_ids", "results"):
+                pipe.expire(self._key(batch_id, name), self.ttl_seconds)
+            pipe.hgetall(meta_key)
+            *_, meta = await pipe.execute()
+
+        return self._counters(meta)
+
+    async def claim_ids(self, batch_id: str) -> List[str]:
+        """Every claim created by the batch so far"""
+        claim_ids = await get_redis().lrange(self._key(batch_id, "claim_ids"), 0, -1)
+        return [claim_id.decode() if isinstance(claim_id, bytes) else claim_id for claim_id in claim_ids]
+
+    async def summary(self, batch_id: str) -> Dict[str, Any]:
+        """Counters, throughput and failed articles for the batch"""
+        client = get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._key(batch_id, "meta"))
+            pipe.lrange(self._key(batch_id, "results"), 0, -1)
+            meta, results = await pipe.execute()
+
+        counters = self._counters(meta)
+        elapsed = time.time() - float(self._decode(meta).get("started_at", time.time()))
+        failures = [
+            {"job_id": result["job_id"], "error": result["error"]}
+            for result in map(json.loads, results)
+            if result["status"] != "completed"
+        ]
+
+        return {
+            **counters,
+            "elapsed_seconds": round(elapsed, 1),
+            "articles_per_minute": round(counters["done"] / elapsed * 60, 1) if elapsed > 0 else None,
+            "failures": failures[:self.max_reported_failures]
+        }
+
+    async def cleanup(self, batch_id: str):
+        """Drop the batch's working state (the job status keeps the summary)"""
+        await get_redis().delete(*[self._key(batch_id, name) for name in ("articles", "meta", "claim_ids", "results")])
+
+    def _decode(self, meta: Dict[Any, Any]) -> Dict[str, Any]:
+        return {(key.decode() if isinstance(key, bytes) else key): value for key, value in meta.items()}
+
+    def _counters(self, meta: Dict[Any, Any]) -> Dict[str, int]:
+        fields = self._decode(meta)
+        return {
+            name: int(fields.get(name, 0))
+            for name in ("total", "done", "succeeded", "failed", "claims_extracted", "waves")
+        }
+
+
+# Singleton instance
+batch_ingest = BatchIngest()
@@ -0,0 +1,202 @@
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from uuid import UUID
+from app.services.vector_store import vector_store
+from app.services.neo4j_client import neo4j_client
+from app.services.verdict_cache import verdict_cache
+from app.services.adversarial_retriever import adversarial_retriever
+from app.utils.redis_client import get_redis
+from datetime import datetime
+import json
+
+
+class ContradictionSweeper:
+    """
+    Corpus-wide contradiction discovery via an approximate similarity self-join
+
+    Pages through the whole vector store and uses each page's stored vectors
+    as one batched k-nearest-neighbour query, which builds an approximate kNN
+    graph over the claims collection without any embedding calls. Same-article
+    pairs (and, by default, same-language pairs) are dropped, pairs with a
+    cached verdict are skipped, and the rest are assessed in one batch per
+    page. Confirmed contradictions are written back to Neo4j in bulk.
+
+    Progress is checkpointed in Redis after every page, so an interrupted
+    sweep resumes from the last completed page.
+    """
+
+    def __init__(self):
+        self.page_size = 256
+        self.neighbours = 10  # k in the kNN graph
+        self.similarity_threshold = adversarial_retriever.similarity_threshold
+        self.checkpoint_ttl_seconds = 7 * 24 * 60 * 60  # 7 days
+        self.key_prefix = "sweep:"
+
+    async def run(
+        self,
+        sweep_id: str,
+        cross_language_only: bool = True,
+        max_pages: Optional[int] = None,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run (or resume) a sweep
+
+        Args:
+            sweep_id: Identifies the sweep and its checkpoint
+            cross_language_only: Only assess pairs of claims in different languages
+            max_pages: Stop after this many pages in this run (resume later)
+            progress_callback: Called with the checkpoint after every page
+
+        Returns:
+            The sweep checkpoint with counters and status
+        """
+        checkpoint = await self.load_checkpoint(sweep_id)
+        if checkpoint is None:
+            checkpoint = {
+                "sweep_id": sweep_id,
+                "status": "running",
+                "offset": None,
+                "pages": 0,
+                "claims_scanned": 0,
+                "candidate_pairs": 0,
+                "pairs_assessed": 0,
+                "contradictions_found": 0,
+                "relationships_created": 0,
+                "started_at": datetime.utcnow().isoformat(),
+                "updated_at": datetime.utcnow().isoformat()
+            }
+
+        if checkpoint["status"] == "completed":
+            return checkpoint
+
+        pages_this_run = 0
+
+        while True:
+            points, next_offset = await vector_store.scroll(
+                limit=self.page_size,
+                offset=checkpoint["offset"],
+                with_vectors=True
+            )
+
+            if points:
+                page_stats = await self._sweep_page(points, cross_language_only)
+                for key, value in page_stats.items():
+                    checkpoint[key] += value
+
+            checkpoint["offset"] = next_offset
+            checkpoint["pages"] += 1
+            checkpoint["updated_at"] = datetime.utcnow().isoformat()
+            if next_offset is None:
+                checkpoint["status"] = "completed"
+
+            await self.save_checkpoint(checkpoint)
+            pages_this_run += 1
+
+            if progress_callback:
+                progress_callback(checkpoint)
+
+            if checkpoint["status"] == "completed":
+                break
+
+            if max_pages and pages_this_run >= max_pages:
+                break
+
+        return checkpoint
+
+    async def load_checkpoint(self, sweep_id: str) -> Optional[Dict[str, Any]]:
+        """Load a sweep checkpoint from Redis"""
+        value = await get_redis().get(self.key_prefix + sweep_id)
+        return json.loads(value) if value else None
+
+    async def save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Persist a sweep checkpoint to Redis"""
+        await get_redis().set(
+            self.key_prefix + checkpoint["sweep_id"],
+            json.dumps(checkpoint),
+            ex=self.checkpoint_ttl_seconds
+        )
+
+    async def _sweep_page(self, points: List[Dict[str, Any]], cross_language_only: bool) -> Dict[str, int]:
+        """Join one page of claims against the collection and assess new pairs"""
+        neighbours = await vector_store.search_batch(
+            query_vectors=[point["vector"] for point in points],
+            original_claim_ids=[point["claim_id"] for point in points],
+            limit=self.neighbours,
+            score_threshold=self.similarity_threshold,
+            # Filtered inside the search, so same-language neighbours do not fill the k slots
+            exclude_languages=[point["payload"].get("language") for point in points] if cross_language_only else None
+        )
+
+        # Collect each unordered cross-article pair once, keeping its best score
+        pairs: Dict[Tuple[str, str], float] = {}
+        for point, candidates in zip(points, neighbours):
+            payload = point["payload"]
+            for candidate in candidates:
+                if candidate["article_id"] == payload.get("articleId"):
+                    continue
+                if cross_language_only and candidate["language"] == payload.get("language"):
+                    continue
+
+                pair = tuple(sorted((str(point["claim_id"]), str(candidate["claim_id"]))))
+                pairs[pair] = max(pairs.get(pair, 0.0), candidate["score"])
+
+        stats = {
+            "claims_scanned": len(points),
+            "candidate_pairs": len(pairs),
+            "pairs_assessed": 0,
+            "contradictions_found": 0,
+            "relationships_created": 0
+        }
+
+        if not pairs:
+            return stats
+
+        claim_ids = {claim_id for pair in pairs for claim_id in pair}
+        claims = await neo4j_client.get_claims_by_ids([UUID(claim_id) for claim_id in claim_ids])
+
+        # Pairs whose verdict is already known are not re-assessed: cached
+        # contradictions (e.g. judged by online retrieval) are still recorded
+        assessor_version = adversarial_retriever.assessor_version
+        pending = [
+            (claim_id, other_claim_id, score)
+            for (claim_id, other_claim_id), score in pairs.items()
+            if claim_id in claims and other_claim_id in claims
+        ]
+        pair_keys = [
+            verdict_cache.pair_key(claims[claim_id].text, claims[other_claim_id].text, assessor_version)
+            for claim_id, other_claim_id, _ in pending
+        ]
+        known_verdicts = await verdict_cache.get_many(pair_keys)
+        known_contradictions = [
+            pair for pair, pair_key in zip(pending, pair_keys)
+            if known_verdicts.get(pair_key) is True
+        ]
+        pending = [
+            pair for pair, pair_key in zip(pending, pair_keys)
+            if pair_key not in known_verdicts
+        ]
+
+        verdicts = await adversarial_retriever.assess_pairs([
+            (claims[claim_id].text, claims[other_claim_id].text)
+            for claim_id, other_claim_id, _ in pending
+        ])
+
+        contradictions = [
+            {"claim_id": claim_id, "other_claim_id": other_claim_id, "score": score}
+            for (claim_id, other_claim_id, score), is_contradicting in zip(pending, verdicts)
+            if is_contradicting
+        ]
+
+        stats["pairs_assessed"] = len(pending)
+        # Only pairs confirmed here: cached positives were counted when first judged
+        stats["contradictions_found"] = len(contradictions)
+        stats["relationships_created"] = await neo4j_client.create_contradiction_relationships(contradictions + [
+            {"claim_id": claim_id, "other_claim_id": other_claim_id, "score": score}
+            for claim_id, other_claim_id, score in known_contradictions
+        ])
+
+        return stats
+
+
+# Singleton instance
+contradiction_sweeper = ContradictionSweeper()
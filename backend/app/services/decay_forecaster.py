@@ -1,7 +1,9 @@
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple, Optional, Sequence, Union
 import math
 from datetime import datetime, timedelta
 from app.services.x_api_client import x_api_client
+import numpy as np
+import asyncio
 
 
 class DecayForecaster:
@@ -10,13 +12,16 @@ class DecayForecaster:
     def __init__(self):
         self.base_half_life_immutable = 3650  # 10 years for immutable claims
         self.base_half_life_mutable = 365  # 1 year for mutable claims
+        self.max_entities_to_check = 3  # Per claim
+        self.max_trending_concurrency = 16  # Entity velocity lookups at once in a batch
 
     async def calculate_decay_score(
         self,
         claim_text: str,
         is_immutable: bool,
         extracted_at: datetime,
-        check_trending: bool = True
+        check_trending: bool = True,
+        entities: Optional[List[str]] = None
     ) -> Tuple[float, int]:
         """
         Calculate decay score and half-life for a claim
@@ -26,10 +31,44 @@ class DecayForecaster:
             is_immutable: Whether the claim is classified as immutable
             extracted_at: When the claim was extracted
             check_trending: Whether to check X API for trending signals
+            entities: Entities stored for the claim
 
         Returns:
             Tuple of (decay_score, half_life_days)
         """
+        base_decay_score, velocity_boost, half_life_days = await self.calculate_decay_components(
+            claim_text=claim_text,
+            is_immutable=is_immutable,
+            check_trending=check_trending,
+            entities=entities
+        )
+
+        final_decay_score = self.apply_age_decay(base_decay_score, velocity_boost, is_immutable, extracted_at)
+
+        return final_decay_score, half_life_days
+
+    async def calculate_decay_components(
+        self,
+        claim_text: str,
+        is_immutable: bool,
+        check_trending: bool = True,
+        entities: Optional[List[str]] = None
+    ) -> Tuple[float, float, int]:
+        """
+        Calculate the time-independent parts of a claim's decay score
+
+        These are what lazy decay mode stores; the age term is added at read
+        time by apply_age_decay.
+
+        Args:
+            claim_text: The claim text
+            is_immutable: Whether the claim is classified as immutable
+            check_trending: Whether to check X API for trending signals
+            entities: Entities stored for the claim
+
+        Returns:
+            Tuple of (base_decay_score, velocity_boost, half_life_days)
+        """
         # Base half-life depends on mutability
         if is_immutable:
             half_life_days = self.base_half_life_immutable
@@ -38,24 +77,50 @@ class DecayForecaster:
             half_life_days = self.base_half_life_mutable
             base_decay_score = 0.5  # Moderate decay for mutable claims
 
-        # Calculate age-based decay
-        age_days = (datetime.utcnow() - extracted_at).days
-        age_decay_factor = self._calculate_decay_factor(age_days, half_life_days)
-
         # Check for trending signals (velocity boost)
         velocity_boost = 0.0
         if check_trending and not is_immutable:
-            velocity_boost = await self._check_trending_boost(claim_text)
-
-        # Combine factors
-        final_decay_score = min(base_decay_score + age_decay_factor + velocity_boost, 1.0)
+            velocity_boost = await self._check_trending_boost(claim_text, entities)
 
         # Adjust half-life based on velocity
         if velocity_boost > 0.3:
             # If trending, reduce half-life (faster decay)
             half_life_days = int(half_life_days * 0.5)
 
-        return final_decay_score, half_life_days
+        return base_decay_score, velocity_boost, half_life_days
+
+    def apply_age_decay(
+        self,
+        base_decay_score: float,
+        velocity_boost: float,
+        is_immutable: bool,
+        extracted_at: datetime,
+        now: Optional[datetime] = None
+    ) -> float:
+        """
+        Combine stored decay components with the age-based decay term
+
+        The age term uses the base half-life for the claim's mutability (not
+        the trending-adjusted one), matching calculate_decay_score.
+
+        Args:
+            base_decay_score: Stored base decay score
+            velocity_boost: Stored velocity boost
+            is_immutable: Whether the claim is classified as immutable
+            extracted_at: When the claim was extracted
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            Decay score (0-1)
+        """
+        half_life_days = self.base_half_life_immutable if is_immutable else self.base_half_life_mutable
+
+        # Calculate age-based decay
+        age_days = ((now or datetime.utcnow()) - extracted_at).days
+        age_decay_factor = self._calculate_decay_factor(age_days, half_life_days)
+
+        # Combine factors
+        return min(base_decay_score + age_decay_factor + velocity_boost, 1.0)
 
     def _calculate_decay_factor(self, age_days: int, half_life_days: int) -> float:
         """
@@ -78,43 +143,56 @@ class DecayForecaster:
 
         return min(decay_score, 0.5)  # Cap at 0.5 for age factor alone
 
-    async def _check_trending_boost(self, claim_text: str) -> float:
+    def extract_entities(self, claim_text: str) -> List[str]:
         """
-        Check if entities in the claim are trending and calculate velocity boost
+        Extract potential entity names from a claim's text
+
+        Only a fallback for claims stored without entities; entities are
+        normally extracted once at ingest and linked as Entity nodes.
 
         Args:
             claim_text: The claim text
 
         Returns:
-            Velocity boost factor (0.0 to 0.5)
+            Entity names, in order of appearance
         """
-        # Extract potential entity names (simplified - in production, use NER)
-        # For now, we'll look for capitalized words
+        # Look for capitalized words
         words = claim_text.split()
-        potential_entities = [
+        return [
             word.strip('.,!?;:')
             for word in words
             if word and word[0].isupper() and len(word) > 3
         ]
 
-        if not potential_entities:
-            return 0.0
+    def claim_entities(self, claim: Dict[str, Any]) -> List[str]:
+        """Entities to check for a claim dict: stored ones, else extracted from its text"""
+        return claim.get("entities") or self.extract_entities(claim["text"])
+
+    async def _check_trending_boost(self, claim_text: str, entities: Optional[List[str]] = None) -> float:
+        """
+        Check if entities in the claim are trending and calculate velocity boost
 
-        # Check velocity for the first few entities (to avoid rate limits)
-        max_entities_to_check = 3
+        Args:
+            claim_text: The claim text
+            entities: Entities stored for the claim (extracted from the text if not given)
+
+        Returns:
+            Velocity boost factor (0.0 to 0.5)
+        """
+        boosts = await self._velocity_boosts([
+            {"text": claim_text, "is_immutable": False, "entities": entities}
+        ])
+        return boosts[0]
+
+    def _boost_from_velocities(self, velocities: List[Dict[str, Any]]) -> float:
+        """Average velocity boost over a claim's trending entities"""
         total_velocity = 0.0
         entities_checked = 0
 
-        for entity in potential_entities[:max_entities_to_check]:
-            try:
-                velocity_data = await x_api_client.get_entity_velocity(entity)
-                if velocity_data.get("is_trending", False):
-                    total_velocity += min(velocity_data.get("velocity_score", 0.0) / 10.0, 0.5)
-                    entities_checked += 1
-            except Exception as e:
-                # If API fails, continue without velocity boost
-                print(f"Error checking velocity for {entity}: {e}")
-                continue
+        for velocity_data in velocities:
+            if velocity_data.get("is_trending", False):
+                total_velocity += min(velocity_data.get("velocity_score", 0.0) / 10.0, 0.5)
+                entities_checked += 1
 
         # Average velocity boost
         if entities_checked > 0:
@@ -145,6 +223,65 @@ class DecayForecaster:
 
         return vulnerability
 
+    def calculate_decay_scores(
+        self,
+        extracted_at: Sequence[Union[datetime, str]],
+        is_immutable: Sequence[bool],
+        velocity_boosts: Optional[Sequence[float]] = None,
+        now: Optional[datetime] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate decay scores and half-lives for many claims in one NumPy pass
+
+        Applies the same formula as calculate_decay_score to whole arrays,
+        so re-scoring large numbers of claims costs a few array operations
+        instead of a Python loop per claim.
+
+        Args:
+            extracted_at: Extraction timestamps (naive UTC datetimes or ISO strings)
+            is_immutable: Immutability flag per claim
+            velocity_boosts: Optional trending boost per claim (ignored for immutable claims)
+            now: Reference time (defaults to utcnow)
+
+        Returns:
+            Tuple of (decay_scores, half_life_days) arrays
+        """
+        now = np.datetime64(now or datetime.utcnow(), "us")
+        extracted = np.asarray(extracted_at, dtype="datetime64[us]")
+        immutable = np.asarray(is_immutable, dtype=bool)
+
+        base_decay_scores, boosts, half_life_days = self._decay_component_arrays(immutable, velocity_boosts)
+        base_half_life_days = np.where(immutable, self.base_half_life_immutable, self.base_half_life_mutable)
+
+        # Whole days, matching timedelta.days
+        age_days = (now - extracted) // np.timedelta64(1, "D")
+
+        # Exponential decay, capped at 0.5 for the age factor alone
+        age_decay_factors = np.minimum(1.0 - np.power(0.5, age_days / base_half_life_days), 0.5)
+
+        decay_scores = np.minimum(base_decay_scores + age_decay_factors + boosts, 1.0)
+
+        return decay_scores, half_life_days
+
+    def _decay_component_arrays(
+        self,
+        immutable: np.ndarray,
+        velocity_boosts: Optional[Sequence[float]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized calculate_decay_components: (base scores, boosts, half-lives)"""
+        half_life_days = np.where(immutable, self.base_half_life_immutable, self.base_half_life_mutable)
+        base_decay_scores = np.where(immutable, 0.1, 0.5)
+
+        if velocity_boosts is None:
+            boosts = np.zeros(len(immutable))
+        else:
+            boosts = np.where(immutable, 0.0, np.asarray(velocity_boosts, dtype=np.float64))
+
+        # Trending claims decay twice as fast
+        half_life_days = np.where(boosts > 0.3, half_life_days // 2, half_life_days)
+
+        return base_decay_scores, boosts, half_life_days
+
     async def batch_calculate_decay(
         self,
         claims: list[Dict[str, Any]],
@@ -153,25 +290,93 @@ class DecayForecaster:
         """
         Calculate decay scores for multiple claims in batch
 
+        Trending boosts (if requested) are fetched per mutable claim; the
+        scores themselves are computed in a single vectorized pass.
+
         Args:
             claims: List of claim dictionaries with text, is_immutable, extracted_at
+                and optionally entities
             check_trending: Whether to check trending (slower)
 
         Returns:
             List of (decay_score, half_life_days) tuples
         """
-        results = []
+        if not claims:
+            return []
+
+        velocity_boosts = await self._velocity_boosts(claims) if check_trending else None
+
+        decay_scores, half_life_days = self.calculate_decay_scores(
+            extracted_at=[claim["extracted_at"] for claim in claims],
+            is_immutable=[claim["is_immutable"] for claim in claims],
+            velocity_boosts=velocity_boosts
+        )
+
+        return list(zip(decay_scores.tolist(), half_life_days.tolist()))
+
+    async def batch_calculate_decay_components(
+        self,
+        claims: list[Dict[str, Any]],
+        check_trending: bool = False
+    ) -> list[Tuple[float, float, int]]:
+        """
+        Calculate the time-independent decay components for multiple claims
+
+        Args:
+            claims: List of claim dictionaries with text, is_immutable and optionally entities
+            check_trending: Whether to check trending (slower)
+
+        Returns:
+            List of (base_decay_score, velocity_boost, half_life_days) tuples
+        """
+        if not claims:
+            return []
+
+        velocity_boosts = await self._velocity_boosts(claims) if check_trending else None
 
-        for claim in claims:
-            decay_score, half_life = await self.calculate_decay_score(
-                claim_text=claim["text"],
-                is_immutable=claim["is_immutable"],
-                extracted_at=claim["extracted_at"],
-                check_trending=check_trending
-            )
-            results.append((decay_score, half_life))
+        base_decay_scores, boosts, half_life_days = self._decay_component_arrays(
+            np.asarray([claim["is_immutable"] for claim in claims], dtype=bool),
+            velocity_boosts
+        )
 
-        return results
+        return list(zip(base_decay_scores.tolist(), boosts.tolist(), half_life_days.tolist()))
+
+    async def _velocity_boosts(self, claims: list[Dict[str, Any]]) -> list[float]:
+        """
+        Trending boost per claim, looking up each distinct entity once
+
+        Claims are grouped by entity, so an entity shared by thousands of
+        claims in a batch costs one velocity lookup. Immutable claims are
+        never checked.
+        """
+        # Check velocity for the first few entities of each claim (to avoid rate limits)
+        claim_entities = [
+            [] if claim["is_immutable"] else self.claim_entities(claim)[:self.max_entities_to_check]
+            for claim in claims
+        ]
+        entities = {entity.lower(): entity for names in claim_entities for entity in names}
+
+        semaphore = asyncio.Semaphore(self.max_trending_concurrency)
+
+        async def velocity(entity: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await x_api_client.get_entity_velocity(entity)
+                except Exception as e:
+                    # If API fails, continue without velocity boost
+                    print(f"Error checking velocity for {entity}: {e}")
+                    return None
+
+        results = await asyncio.gather(*(velocity(entity) for entity in entities.values()))
+        velocities = dict(zip(entities, results))
+
+        return [
+            self._boost_from_velocities([
+                velocities[entity.lower()] for entity in names
+                if velocities[entity.lower()] is not None
+            ])
+            for names in claim_entities
+        ]
 
 
 # Singleton instance
@@ -0,0 +1,111 @@
+from typing import List, Optional, Tuple
+from app.config import settings
+from app.utils.redis_client import get_redis
+import random
+import time
+
+
+class DecayRefreshScheduler:
+    """
+    Half-life-aware schedule of when each claim's decay score is next due
+
+    Due times live in a Redis sorted set (member: claim ID, score: due unix
+    time). A claim is due again after a fixed fraction of its half-life,
+    clamped to a min/max interval, so immutable and slow-decaying claims are
+    rarely touched while trending claims are rechecked within hours. A little
+    jitter spreads claims scheduled together across the refresh window.
+    """
+
+    def __init__(self):
+        self.key = "decay:due"
+        self.seeded_key = "decay:seeded"  # Set once every existing claim has been scheduled
+        self.refresh_fraction = settings.DECAY_REFRESH_FRACTION
+        self.min_interval_seconds = settings.DECAY_REFRESH_MIN_INTERVAL_HOURS * 60 * 60
+        self.max_interval_seconds = settings.DECAY_REFRESH_MAX_INTERVAL_DAYS * 24 * 60 * 60
+        self.trending_interval_seconds = settings.DECAY_REFRESH_TRENDING_INTERVAL_HOURS * 60 * 60
+        self.jitter = 0.1  # +/- 10% of the interval
+
+    def next_due(self, half_life_days: int, trending: bool = False, now: Optional[float] = None) -> float:
+        """
+        Compute when a claim should next be refreshed
+
+        Args:
+            half_life_days: The claim's current half-life
+            trending: Whether the claim is currently trending
+            now: Reference unix time (defaults to now)
+
+        Returns:
+            Due time as a unix timestamp
+        """
+        interval = half_life_days * 24 * 60 * 60 * self.refresh_fraction
+        interval = min(max(interval, self.min_interval_seconds), self.max_interval_seconds)
+
+        if trending:
+            interval = min(interval, self.trending_interval_seconds)
+
+        interval *= random.uniform(1 - self.jitter, 1 + self.jitter)
+
+        return (now if now is not None else time.time()) + interval
+
+    async def schedule(self, entries: List[Tuple[str, float]], only_new: bool = False):
+        """
+        Set the due time for many claims
+
+        Args:
+            entries: List of (claim_id, due unix time) tuples
+            only_new: Leave claims that are already scheduled untouched
+        """
+        if not entries:
+            return
+
+        await get_redis().zadd(
+            self.key,
+            {str(claim_id): due for claim_id, due in entries},
+            nx=only_new
+        )
+
+    async def pop_due(self, limit: int, now: Optional[float] = None) -> List[str]:
+        """
+        Remove and return up to `limit` claims whose due time has passed
+
+        Each claim is claimed with its own ZREM, so concurrent workers never
+        pop the same claim twice.
+
+        Args:
+            limit: Maximum number of claims to pop
+            now: Reference unix time (defaults to now)
+
+        Returns:
+            Claim IDs, most overdue first
+        """
+        client = get_redis()
+        candidates = await client.zrangebyscore(self.key, "-inf", now if now is not None else time.time(), start=0, num=limit)
+        if not candidates:
+            return []
+
+        async with client.pipeline(transaction=False) as pipe:
+            for claim_id in candidates:
+                pipe.zrem(self.key, claim_id)
+            removed = await pipe.execute()
+
+        return [
+            claim_id.decode() if isinstance(claim_id, bytes) else claim_id
+            for claim_id, was_removed in zip(candidates, removed)
+            if was_removed
+        ]
+
+    async def size(self) -> int:
+        """Number of scheduled claims"""
+        return await get_redis().zcard(self.key)
+
+    async def is_seeded(self) -> bool:
+        """Whether the existing graph has been put on the schedule"""
+        return bool(await get_redis().exists(self.seeded_key))
+
+    async def mark_seeded(self):
+        """Record that the existing graph is on the schedule"""
+        await get_redis().set(self.seeded_key, time.time())
+
+
+# Singleton instance
+decay_scheduler = DecayRefreshScheduler()
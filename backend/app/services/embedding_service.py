@@ -1,4 +1,5 @@
 import cohere
+import httpx
 from typing import List, Union
 from app.config import settings
 
@@ -9,7 +10,15 @@ class EmbeddingService:
     def __init__(self):
         self.api_key = settings.COHERE_API_KEY
         self.model = settings.COHERE_MODEL
-        self.client = cohere.AsyncClient(api_key=self.api_key)
+        self._http_client = httpx.AsyncClient(timeout=60.0)
+        self.client = cohere.AsyncClient(api_key=self.api_key, httpx_client=self._http_client)
+
+    async def connect(self):
+        """Open a fresh Cohere client (e.g. in a forked worker process)"""
+        # Close the client being replaced so its pool is not leaked
+        await self._http_client.aclose()
+        self._http_client = httpx.AsyncClient(timeout=60.0)
+        self.client = cohere.AsyncClient(api_key=self.api_key, httpx_client=self._http_client)
 
     async def embed_text(self, text: str, input_type: str = "search_document") -> List[float]:
         """
@@ -89,8 +98,8 @@ class EmbeddingService:
         return await self.embed_text(query_text, input_type="search_query")
 
     async def close(self):
-        """Close the Cohere client"""
-        await self.client.close()
+        """Close the Cohere client's pooled connections"""
+        await self._http_client.aclose()
 
 
 # Singleton instance
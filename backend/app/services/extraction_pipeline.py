@@ -0,0 +1,270 @@
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Iterable
+from app.config import settings
+from app.models.claim import ClaimNode
+from app.services.grok_client import grok_client
+from app.services.neo4j_client import neo4j_client
+from app.services.vector_store import vector_store
+from app.services.embedding_service import embedding_service
+from app.services.decay_scheduler import decay_scheduler
+from app.utils.redis_client import get_redis
+from uuid import UUID, uuid5
+import asyncio
+import json
+import time
+
+_DONE = object()  # End-of-stream marker passed down the queues
+
+# Claim IDs are uuid5(article, text) in this namespace, so re-extracting an
+# article yields the same IDs and graph / vector writes stay idempotent
+CLAIM_ID_NAMESPACE = UUID("6f1c2a8e-4b7d-5e93-a1f0-3c9d8b2e7a45")
+
+
+class ExtractionPipeline:
+    """
+    Claim extraction as overlapping stages joined by bounded queues
+
+        extract (per chunk) -> graph write batches -> embedding batches -> vector upsert batches
+
+    Long articles are extracted in paragraph-aligned chunks, and each stage
+    takes batches as soon as the previous one hands them over, so graph
+    writes and embeddings for early claims run while later chunks are still
+    with Grok. Each queue holds at most `queue_depth` batches: a slow stage
+    makes the stages feeding it wait instead of buffering the whole article.
+    An article's wall time approaches its slowest stage instead of the sum.
+
+    With a job ID, progress is checkpointed in Redis (`extract:{job_id}`):
+    each chunk's extracted claims, and each batch once it is stored in Neo4j
+    and again once it is indexed. A retried job reuses the checkpointed
+    claims instead of calling Grok again and skips the writes already done.
+    Writes that ran but were not checkpointed are repeated safely, since
+    claim IDs are deterministic and both stores merge / upsert by ID.
+    """
+
+    def __init__(self):
+        self.chunk_chars = settings.EXTRACTION_CHUNK_CHARS
+        self.chunk_concurrency = settings.EXTRACTION_CHUNK_CONCURRENCY
+        self.batch_size = settings.EXTRACTION_BATCH_SIZE
+        self.queue_depth = settings.EXTRACTION_QUEUE_DEPTH
+        self.checkpoint_prefix = "extract:"
+        self.checkpoint_ttl_seconds = settings.JOB_STATUS_TTL_SECONDS
+
+    def claim_id(self, article_id: str, text: str) -> UUID:
+        """Deterministic ID for a claim extracted from an article"""
+        return uuid5(CLAIM_ID_NAMESPACE, f"{article_id}\n{text.strip()}")
+
+    def split_article(self, text: str) -> List[str]:
+        """
+        Split article text into chunks of at most chunk_chars at paragraph breaks
+
+        A single paragraph longer than chunk_chars becomes its own chunk.
+        """
+        chunks = []
+        current = []
+        length = 0
+
+        for paragraph in text.split("\n\n"):
+            if not paragraph.strip():
+                continue
+            if current and length + len(paragraph) > self.chunk_chars:
+                chunks.append("\n\n".join(current))
+                current = []
+                length = 0
+            current.append(paragraph)
+            length += len(paragraph) + 2
+
+        if current:
+            chunks.append("\n\n".join(current))
+
+        return chunks or [text]
+
+    async def run(
+        self,
+        article_data: Dict[str, Any],
+        progress_callback: Optional[Callable[[Dict[str, int]], Awaitable[None]]] = None,
+        job_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extract, store, embed and index an article's claims
+
+        Args:
+            article_data: Dictionary containing article_id, content, source_urls
+            progress_callback: Awaited with the stage counters after every
+                extracted chunk and every indexed batch
+            job_id: Checkpoint progress under this job, and resume from its
+                last checkpoint if the job ran before
+
+        Returns:
+            Dictionary with the stage counters and the stored claim_ids
+        """
+        chunks = self.split_article(article_data["content"])
+        checkpoint = await self.load_checkpoint(job_id) if job_id else {}
+        to_graph: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        to_embed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        to_index: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+
+        stats = {
+            "chunks": len(chunks),
+            "chunks_extracted": 0,
+            "claims_extracted": 0,
+            "claims_stored": 0,
+            "claims_indexed": 0
+        }
+        claim_ids: List[str] = []
+
+        async def report():
+            if progress_callback:
+                await progress_callback(dict(stats))
+
+        async def extract():
+            slots = asyncio.Semaphore(self.chunk_concurrency)
+
+            async def extract_chunk(chunk_index: int, chunk: str):
+                claim_nodes = checkpoint.get(f"chunk:{chunk_index}")
+
+                if claim_nodes is None:
+                    async with slots:
+                        claims = await grok_client.extract_claims(
+                            article_text=chunk,
+                            article_id=article_data["article_id"],
+                            source_urls=article_data.get("source_urls", [])
+                        )
+
+                    # The same claim twice in a chunk maps to one ID, so keep one
+                    unique = {}
+                    for claim in claims:
+                        claim_id = self.claim_id(article_data["article_id"], claim.text)
+                        unique.setdefault(claim_id, ClaimNode(
+                            id=claim_id,
+                            text=claim.text,
+                            source_url=claim.source_url,
+                            article_id=claim.article_id,
+                            is_immutable=claim.is_immutable,
+                            language=claim.language,
+                            entities=claim.entities
+                        ))
+                    claim_nodes = list(unique.values())
+                    await self._checkpoint(job_id, f"chunk:{chunk_index}", json.dumps(
+                        [claim_node.model_dump(mode="json") for claim_node in claim_nodes]
+                    ))
+
+                stats["chunks_extracted"] += 1
+                stats["claims_extracted"] += len(claim_nodes)
+                await report()
+
+                for i in range(0, len(claim_nodes), self.batch_size):
+                    await to_graph.put((f"batch:{chunk_index}:{i}", claim_nodes[i:i + self.batch_size]))
+
+            await _gather_or_cancel(extract_chunk(i, chunk) for i, chunk in enumerate(chunks))
+            await to_graph.put(_DONE)
+
+        async def write_graph():
+            while True:
+                item = await to_graph.get()
+                if item is _DONE:
+                    break
+
+                batch_key, batch = item
+                if checkpoint.get(batch_key) is None:
+                    await neo4j_client.create_claim_nodes(batch)
+                    # New claims are due for their first decay score right away
+                    await decay_scheduler.schedule([(str(c.id), time.time()) for c in batch], only_new=True)
+                    await self._checkpoint(job_id, batch_key, "stored")
+
+                stats["claims_stored"] += len(batch)
+                claim_ids.extend(str(c.id) for c in batch)
+                await to_embed.put(item)
+
+            await to_embed.put(_DONE)
+
+        async def embed():
+            while True:
+                item = await to_embed.get()
+                if item is _DONE:
+                    break
+
+                batch_key, batch = item
+                embeddings = None
+                if checkpoint.get(batch_key) != "indexed":
+                    embeddings = await embedding_service.embed_batch([c.text for c in batch])
+                await to_index.put((batch_key, batch, embeddings))
+
+            await to_index.put(_DONE)
+
+        async def index():
+            while True:
+                item = await to_index.get()
+                if item is _DONE:
+                    break
+
+                batch_key, batch, embeddings = item
+                if embeddings is not None:
+                    await vector_store.upsert_claim_embeddings([
+                        {
+                            "claim_id": claim_node.id,
+                            "embedding": embedding,
+                            "article_id": claim_node.article_id,
+                            "language": claim_node.language,
+                            "source_url": claim_node.source_url,
+                            "extracted_at": claim_node.extracted_at
+                        }
+                        for claim_node, embedding in zip(batch, embeddings)
+                    ])
+                    await self._checkpoint(job_id, batch_key, "indexed")
+
+                stats["claims_indexed"] += len(batch)
+                await report()
+
+        await _gather_or_cancel([extract(), write_graph(), embed(), index()])
+
+        # A claim repeated in two chunks is one node
+        return {**stats, "claim_ids": list(dict.fromkeys(claim_ids))}
+
+    async def load_checkpoint(self, job_id: str) -> Dict[str, Any]:
+        """
+        A job's checkpointed progress
+
+        Returns:
+            Dictionary of `chunk:{i}` to that chunk's extracted claims, and of
+            `batch:{i}:{start}` to "stored" or "indexed"
+        """
+        data = await get_redis().hgetall(self.checkpoint_prefix + job_id)
+
+        checkpoint = {}
+        for field, value in data.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            value = value.decode() if isinstance(value, bytes) else value
+            if field.startswith("chunk:"):
+                checkpoint[field] = [ClaimNode.model_validate(claim) for claim in json.loads(value)]
+            else:
+                checkpoint[field] = value
+        return checkpoint
+
+    async def clear_checkpoint(self, job_id: str):
+        """Drop a finished job's checkpoint"""
+        await get_redis().delete(self.checkpoint_prefix + job_id)
+
+    async def _checkpoint(self, job_id: Optional[str], field: str, value: str):
+        if not job_id:
+            return
+
+        key = self.checkpoint_prefix + job_id
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.hset(key, field, value)
+            pipe.expire(key, self.checkpoint_ttl_seconds)
+            await pipe.execute()
+
+
+async def _gather_or_cancel(coros: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Run coroutines concurrently; if one fails, cancel the rest and re-raise"""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+# Singleton instance
+extraction_pipeline = ExtractionPipeline()
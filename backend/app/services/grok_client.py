@@ -1,7 +1,8 @@
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from app.config import settings
 from app.models.claim import ClaimCreate
+import asyncio
 import json
 
 
@@ -16,6 +17,37 @@ class GrokClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def connect(self):
+        """Open the pooled HTTP client on the running event loop"""
+        self._get_client()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client for the running event loop
+
+        Connections are tied to the loop that opened them, so the client is
+        recreated whenever the running loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers=self.headers,
+                timeout=60.0
+            )
+            self._client_loop = loop
+
+        return self._client
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
     async def extract_claims(self, article_text: str, article_id: str, source_urls: List[str]) -> List[ClaimCreate]:
         """
@@ -31,28 +63,26 @@ class GrokClient:
         """
         prompt = self._build_extraction_prompt(article_text, source_urls)
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{self.api_base}/chat/completions",
-                headers=self.headers,
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an expert at extracting factual claims from encyclopedia articles. Extract individual, atomic claims with their sources and classify them as mutable or immutable."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "response_format": {"type": "json_object"}
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await self._get_client().post(
+            "/chat/completions",
+            json={
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are an expert at extracting factual claims from encyclopedia articles. Extract individual, atomic claims with their sources and classify them as mutable or immutable."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.3,
+                "response_format": {"type": "json_object"}
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
 
         # Parse the response
         claims_data = json.loads(result["choices"][0]["message"]["content"])
@@ -65,7 +95,8 @@ class GrokClient:
                 article_id=article_id,
                 is_immutable=claim_dict.get("temporal_classification") == "immutable",
                 confidence_level=claim_dict.get("confidence", 0.5),
-                language=claim_dict.get("language", "en")
+                language=claim_dict.get("language", "en"),
+                entities=[entity.strip() for entity in claim_dict.get("entities", []) if entity and entity.strip()]
             )
             claims.append(claim)
 
@@ -81,6 +112,7 @@ class GrokClient:
 3. Confidence level (0.0 to 1.0)
 4. Temporal classification: "mutable" (likely to change over time) or "immutable" (timeless fact)
 5. Language (ISO code)
+6. Entities: the named people, organizations, places, products and events the claim is about, as they are commonly written
 
 Sources:
 {sources_text}
@@ -96,7 +128,8 @@ Return a JSON object with this structure:
       "source": "string",
       "confidence": 0.0-1.0,
       "temporal_classification": "mutable" or "immutable",
-      "language": "en"
+      "language": "en",
+      "entities": ["string"]
     }}
   ]
 }}
@@ -127,30 +160,84 @@ Based on these contradicting sources, synthesize an updated, more accurate versi
 
 Return only the updated claim text, nothing else."""
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.api_base}/chat/completions",
-                headers=self.headers,
-                json={
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an expert fact-checker who synthesizes accurate claims from multiple sources."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.2
-                }
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await self._get_client().post(
+            "/chat/completions",
+            timeout=30.0,
+            json={
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are an expert fact-checker who synthesizes accurate claims from multiple sources."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.2
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
 
         return result["choices"][0]["message"]["content"].strip()
 
+    async def assess_contradiction(self, claim1: str, claim2: str) -> Dict[str, Any]:
+        """
+        Ask Grok whether two claims contradict each other
+
+        Args:
+            claim1: First claim text
+            claim2: Second claim text (may be in a different language)
+
+        Returns:
+            Dictionary with contradicts (bool), confidence (0-1) and explanation
+        """
+        prompt = f"""Claim A: {claim1}
+
+Claim B: {claim2}
+
+The claims may be in different languages. Do they contradict each other, i.e. can they not both be true?
+
+Return a JSON object with this structure:
+{{
+  "contradicts": true or false,
+  "confidence": 0.0-1.0,
+  "explanation": "string"
+}}
+"""
+
+        response = await self._get_client().post(
+            "/chat/completions",
+            timeout=30.0,
+            json={
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are an expert fact-checker who determines whether two factual claims contradict each other."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.0,
+                "response_format": {"type": "json_object"}
+            }
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        assessment = json.loads(result["choices"][0]["message"]["content"])
+
+        return {
+            "contradicts": bool(assessment.get("contradicts", False)),
+            "confidence": float(assessment.get("confidence", 0.5)),
+            "explanation": assessment.get("explanation", "")
+        }
+
 
 # Singleton instance
 grok_client = GrokClient()
@@ -0,0 +1,234 @@
+from typing import List, Dict, Any, Optional, Set, AsyncIterator
+from app.config import settings
+from app.models.claim import JobStatus
+from app.utils.redis_client import get_redis
+from collections import defaultdict
+from datetime import datetime
+import asyncio
+import json
+import time
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+class JobTracker:
+    """
+    Job status in Redis, with progress pushed over pub/sub
+
+    Each job is a hash (`job:{job_id}`) that workers update and any API
+    replica can read. Every update is published as the full status on
+    `job-events:{job_id}`. Progress-only updates are throttled per job to
+    one per JOB_PROGRESS_MIN_INTERVAL_SECONDS; status changes always go out.
+
+    In the API, one pattern subscription per process receives every job's
+    events and fans them out to local subscribers (WebSocket/SSE clients),
+    so open connections cost no extra Redis connections.
+    """
+
+    def __init__(self):
+        self.key_prefix = "job:"
+        self.index_key = "jobs:index"  # Sorted set of job ID by created time
+        self.channel_prefix = "job-events:"
+        self.ttl_seconds = settings.JOB_STATUS_TTL_SECONDS
+        self.min_interval_seconds = settings.JOB_PROGRESS_MIN_INTERVAL_SECONDS
+        self.subscriber_buffer = 100  # Events buffered per slow subscriber before the oldest is dropped
+        self._last_published: Dict[str, float] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+        self._listening: Optional[asyncio.Event] = None
+
+    async def create(self, job_id: str, owner_id: Optional[str] = None) -> JobStatus:
+        """Record a newly queued job, owned by the user who submitted it"""
+        now = time.time()
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(self.index_key, "-inf", now - self.ttl_seconds)
+            pipe.zadd(self.index_key, {job_id: now})
+            if owner_id is not None:
+                pipe.hset(self.key_prefix + job_id, "owner_id", owner_id)
+            await pipe.execute()
+
+        return await self.update(job_id, status="queued", progress=0)
+
+    async def update(
+        self,
+        job_id: str,
+        status: Optional[str] = None,
+        progress: Optional[int] = None,
+        message: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> Optional[JobStatus]:
+        """
+        Update a job and publish its new status
+
+        Updates that only move progress are dropped if the job published
+        less than min_interval_seconds ago.
+
+        Returns:
+            The job's status, or None if the update was throttled
+        """
+        now = time.time()
+        if status is None and now - self._last_published.get(job_id, 0.0) < self.min_interval_seconds:
+            return None
+
+        fields = {"updated_at": datetime.utcnow().isoformat()}
+        if status is not None:
+            fields["status"] = status
+        if progress is not None:
+            fields["progress"] = progress
+        if message is not None:
+            fields["message"] = message
+        if result is not None:
+            fields["result"] = json.dumps(result)
+        if error is not None:
+            fields["error"] = error
+
+        key = self.key_prefix + job_id
+        client = get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.hsetnx(key, "created_at", fields["updated_at"])
+            pipe.expire(key, self.ttl_seconds)
+            pipe.hgetall(key)
+            *_, data = await pipe.execute()
+
+        job = self._from_hash(job_id, data)
+        await client.publish(self.channel_prefix + job_id, job.model_dump_json())
+
+        if job.status in TERMINAL_STATUSES:
+            self._last_published.pop(job_id, None)
+        else:
+            self._last_published[job_id] = now
+
+        return job
+
+    async def get(self, job_id: str) -> Optional[JobStatus]:
+        """Current status of a job, or None if unknown or expired"""
+        data = await get_redis().hgetall(self.key_prefix + job_id)
+        return self._from_hash(job_id, data) if data else None
+
+    async def owner(self, job_id: str) -> Optional[str]:
+        """User ID of the job's owner, or None if unknown or created internally"""
+        owner_id = await get_redis().hget(self.key_prefix + job_id, "owner_id")
+        return owner_id.decode() if isinstance(owner_id, bytes) else owner_id
+
+    async def list_jobs(self, limit: int = 50, offset: int = 0) -> List[JobStatus]:
+        """Jobs, newest first"""
+        client = get_redis()
+        job_ids = await client.zrevrange(self.index_key, offset, offset + limit - 1)
+        if not job_ids:
+            return []
+
+        job_ids = [job_id.decode() if isinstance(job_id, bytes) else job_id for job_id in job_ids]
+        async with client.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                pipe.hgetall(self.key_prefix + job_id)
+            hashes = await pipe.execute()
+
+        return [self._from_hash(job_id, data) for job_id, data in zip(job_ids, hashes) if data]
+
+    async def events(self, job_id: str) -> AsyncIterator[JobStatus]:
+        """
+        The job's current status, then every published update until it finishes
+
+        Ends right away for unknown jobs and jobs that already finished.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_buffer)
+        self._subscribers[job_id].add(queue)
+
+        try:
+            # Subscribed before reading the current status, so nothing is missed
+            await self._ensure_listener()
+
+            job = await self.get(job_id)
+            if job is None:
+                return
+            yield job
+
+            while job.status not in TERMINAL_STATUSES:
+                job = await self._next_event(queue)
+                yield job
+        finally:
+            self._subscribers[job_id].discard(queue)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    async def _next_event(self, queue: asyncio.Queue) -> JobStatus:
+        """Wait for a subscriber's next event, failing if the subscription dies"""
+        get = asyncio.create_task(queue.get())
+        await asyncio.wait({get, self._listener}, return_when=asyncio.FIRST_COMPLETED)
+
+        if get.done():
+            return get.result()
+
+        get.cancel()
+        self._listener.result()  # Re-raise why the subscription ended
+        raise ConnectionError("Job event subscription ended")
+
+    async def _ensure_listener(self):
+        """Start this process's pattern subscription if it is not running"""
+        if self._listener is None or self._listener.done():
+            self._listening = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen(self._listening))
+
+        listening = asyncio.create_task(self._listening.wait())
+        await asyncio.wait({listening, self._listener}, return_when=asyncio.FIRST_COMPLETED)
+        listening.cancel()
+
+        if self._listener.done():
+            self._listener.result()  # Re-raise why the subscription failed
+
+    async def _listen(self, listening: asyncio.Event):
+        pubsub = get_redis().pubsub()
+        try:
+            await pubsub.psubscribe(self.channel_prefix + "*")
+            listening.set()
+
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                queues = self._subscribers.get(channel[len(self.channel_prefix):])
+                if not queues:
+                    continue
+
+                job = JobStatus.model_validate_json(message["data"])
+                for queue in list(queues):
+                    if queue.full():
+                        queue.get_nowait()  # Progress is a snapshot, so the oldest is safe to drop
+                    queue.put_nowait(job)
+        except Exception as e:
+            print(f"Error listening for job events: {e}")
+            raise
+        finally:
+            await pubsub.aclose()
+
+    async def close(self):
+        """Stop this process's event subscription"""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    def _from_hash(self, job_id: str, data: Dict[Any, Any]) -> JobStatus:
+        fields = {
+            (key.decode() if isinstance(key, bytes) else key): (value.decode() if isinstance(value, bytes) else value)
+            for key, value in data.items()
+        }
+        return JobStatus(
+            job_id=job_id,
+            status=fields.get("status", "queued"),
+            progress=int(fields["progress"]) if fields.get("progress") is not None else None,
+            message=fields.get("message"),
+            result=json.loads(fields["result"]) if fields.get("result") else None,
+            error=fields.get("error"),
+            created_at=datetime.fromisoformat(fields.get("created_at", fields["updated_at"])),
+            updated_at=datetime.fromisoformat(fields["updated_at"])
+        )
+
+
+# Singleton instance
+job_tracker = JobTracker()
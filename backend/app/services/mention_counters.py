@@ -0,0 +1,135 @@
+from typing import Dict, List, Tuple
+from app.utils.redis_client import get_redis
+from datetime import datetime, timedelta
+import time
+
+
+class MentionCounters:
+    """
+    Per-entity, minute-bucketed mention counters in Redis
+
+    Each entity has one hash per hour (`mentions:{entity}:{YYYYmmddHH}`)
+    holding a field per minute plus a running `total`. Hour hashes expire on
+    their own after the 24h window, so nothing needs pruning, and a 24-hour
+    histogram is one pipelined read of 24 `total` fields regardless of volume.
+
+    The stream monitor writes these counters; get_entity_velocity reads them
+    for entities the monitor has watched for at least the whole window.
+    """
+
+    def __init__(self):
+        self.key_prefix = "mentions:"
+        self.watched_key = "mentions:watched"  # Hash of entity -> unix time first watched
+        self.heartbeat_key = "mentions:heartbeat"
+        self.heartbeat_ttl_seconds = 120
+        self.bucket_ttl_seconds = 26 * 60 * 60  # Cover the 24h window plus slack
+
+    def _hour_key(self, entity: str, hour: datetime) -> str:
+        return f"{self.key_prefix}{entity.lower()}:{hour:%Y%m%d%H}"
+
+    async def add(self, counts: Dict[Tuple[str, datetime], int]):
+        """
+        Add mention counts in one pipeline
+
+        Args:
+            counts: Dictionary of (entity, minute) to number of mentions
+        """
+        if not counts:
+            return
+
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for (entity, minute), count in counts.items():
+                key = self._hour_key(entity, minute)
+                pipe.hincrby(key, f"{minute:%M}", count)
+                pipe.hincrby(key, "total", count)
+                pipe.expire(key, self.bucket_ttl_seconds)
+            await pipe.execute()
+
+    async def hourly_counts(self, entity: str, end_time: datetime, hours: int = 24) -> List[int]:
+        """
+        Mention counts per hour for the hours ending at end_time, oldest first
+
+        Args:
+            entity: The entity name
+            end_time: End of the latest hour to include (on an hour boundary)
+            hours: Number of hourly buckets
+        """
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for i in range(hours, 0, -1):
+                pipe.hget(self._hour_key(entity, end_time - timedelta(hours=i)), "total")
+            totals = await pipe.execute()
+
+        return [int(total or 0) for total in totals]
+
+    async def recent_count(self, entity: str, minutes: int = 60) -> int:
+        """Mentions in the sliding window of the last `minutes` minutes"""
+        now = datetime.utcnow().replace(second=0, microsecond=0)
+        minute_buckets = [now - timedelta(minutes=i) for i in range(minutes)]
+
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for minute in minute_buckets:
+                pipe.hget(self._hour_key(entity, minute), f"{minute:%M}")
+            values = await pipe.execute()
+
+        return sum(int(value or 0) for value in values)
+
+    async def watch(self, entities: List[str]):
+        """Record entities as watched (keeping when each was first watched)"""
+        if not entities:
+            return
+
+        now = time.time()
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for entity in entities:
+                pipe.hsetnx(self.watched_key, entity.lower(), now)
+            await pipe.execute()
+
+    async def unwatch(self, entities: List[str]):
+        """Stop treating entities as watched"""
+        if entities:
+            await get_redis().hdel(self.watched_key, *[entity.lower() for entity in entities])
+
+    async def heartbeat(self):
+        """Mark the monitor as live"""
+        await get_redis().set(self.heartbeat_key, time.time(), ex=self.heartbeat_ttl_seconds)
+
+    async def begin_session(self):
+        """
+        Called when a monitor starts: if no monitor was live, the counters
+        have a gap, so every entity's coverage starts over
+        """
+        client = get_redis()
+        if not await client.exists(self.heartbeat_key):
+            await client.delete(self.watched_key)
+        await self.heartbeat()
+
+    async def covers(self, entity: str, start_time: datetime) -> bool:
+        """
+        Whether the counters are complete for an entity since start_time
+
+        True only while the monitor is live and has watched the entity since
+        before start_time.
+        """
+        client = get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.exists(self.heartbeat_key)
+            pipe.hget(self.watched_key, entity.lower())
+            is_live, watched_since = await pipe.execute()
+
+        if not is_live or watched_since is None:
+            return False
+
+        return datetime.utcfromtimestamp(float(watched_since)) <= start_time
+
+    async def mark_trending(self, entity: str, ttl_seconds: int = 3600) -> bool:
+        """Flag an entity as trending; False if it was already flagged within the TTL"""
+        return bool(await get_redis().set(f"{self.key_prefix}trending:{entity.lower()}", 1, nx=True, ex=ttl_seconds))
+
+    async def watched_entities(self) -> List[str]:
+        """All watched entities"""
+        entities = await get_redis().hkeys(self.watched_key)
+        return [entity.decode() if isinstance(entity, bytes) else entity for entity in entities]
+
+
+# Singleton instance
+mention_counters = MentionCounters()
@@ -2,6 +2,7 @@ from neo4j import AsyncGraphDatabase, AsyncDriver
 from typing import List, Dict, Any, Optional
 from app.config import settings
 from app.models.claim import ClaimNode, ClaimWithDependencies, ClaimImpact, VulnerableClaim
+from app.services.decay_forecaster import decay_forecaster
 from uuid import UUID
 from datetime import datetime
 
@@ -14,10 +15,13 @@ class Neo4jClient:
         self.user = settings.NEO4J_USER
         self.password = settings.NEO4J_PASSWORD
         self.database = settings.NEO4J_DATABASE
+        self.lazy_decay = settings.DECAY_LAZY_AGE
         self.driver: Optional[AsyncDriver] = None
 
     async def connect(self):
         """Initialize connection to Neo4j"""
+        # A retry after a failed connect replaces the driver, so release its pool
+        await self.close()
         self.driver = AsyncGraphDatabase.driver(
             self.uri,
             auth=(self.user, self.password)
@@ -29,25 +33,35 @@ class Neo4jClient:
         """Close Neo4j connection"""
         if self.driver:
             await self.driver.close()
+            self.driver = None
 
     async def create_claim_node(self, claim: ClaimNode) -> ClaimNode:
-        """Create a new claim node in the graph"""
+        """
+        Create a claim node in the graph
+
+        Idempotent: an existing node with the claim's ID is left as is (its
+        entity links are still merged), so retried writes never duplicate.
+        """
         async with self.driver.session(database=self.database) as session:
             result = await session.run(
                 """
-                CREATE (c:Claim {
-                    id: $id,
-                    text: $text,
-                    sourceUrl: $source_url,
-                    articleId: $article_id,
-                    extractedAt: $extracted_at,
-                    decayScore: $decay_score,
-                    halfLifeDays: $half_life_days,
-                    isImmutable: $is_immutable,
-                    contradictionCount: $contradiction_count,
-                    language: $language
-                })
-                RETURN c
+                MERGE (c:Claim {id: $id})
+                ON CREATE SET
+                    c.text = $text,
+                    c.sourceUrl = $source_url,
+                    c.articleId = $article_id,
+                    c.extractedAt = $extracted_at,
+                    c.decayScore = $decay_score,
+                    c.halfLifeDays = $half_life_days,
+                    c.isImmutable = $is_immutable,
+                    c.contradictionCount = $contradiction_count,
+                    c.language = $language
+                WITH c
+                UNWIND $entities AS entity
+                MERGE (e:Entity {key: entity.key})
+                ON CREATE SET e.name = entity.name
+                MERGE (c)-[:MENTIONS]->(e)
+                RETURN count(e) AS entity_count
                 """,
                 id=str(claim.id),
                 text=claim.text,
@@ -58,11 +72,59 @@ class Neo4jClient:
                 half_life_days=claim.half_life_days,
                 is_immutable=claim.is_immutable,
                 contradiction_count=claim.contradiction_count,
-                language=claim.language
+                language=claim.language,
+                entities=self._entity_params(claim.entities)
             )
             await result.single()
             return claim
 
+    async def create_claim_nodes(self, claims: List[ClaimNode]) -> List[ClaimNode]:
+        """Create many claim nodes (and their entity links) in one idempotent query"""
+        if not claims:
+            return claims
+
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(
+                """
+                UNWIND $claims AS claim
+                MERGE (c:Claim {id: claim.id})
+                ON CREATE SET
+                    c.text = claim.text,
+                    c.sourceUrl = claim.source_url,
+                    c.articleId = claim.article_id,
+                    c.extractedAt = claim.extracted_at,
+                    c.decayScore = claim.decay_score,
+                    c.halfLifeDays = claim.half_life_days,
+                    c.isImmutable = claim.is_immutable,
+                    c.contradictionCount = claim.contradiction_count,
+                    c.language = claim.language
+                FOREACH (entity IN claim.entities |
+                    MERGE (e:Entity {key: entity.key})
+                    ON CREATE SET e.name = entity.name
+                    MERGE (c)-[:MENTIONS]->(e)
+                )
+                RETURN count(c) AS written
+                """,
+                claims=[
+                    {
+                        "id": str(claim.id),
+                        "text": claim.text,
+                        "source_url": claim.source_url,
+                        "article_id": claim.article_id,
+                        "extracted_at": claim.extracted_at.isoformat(),
+                        "decay_score": claim.decay_score,
+                        "half_life_days": claim.half_life_days,
+                        "is_immutable": claim.is_immutable,
+                        "contradiction_count": claim.contradiction_count,
+                        "language": claim.language,
+                        "entities": self._entity_params(claim.entities)
+                    }
+                    for claim in claims
+                ]
+            )
+            await result.single()
+            return claims
+
     async def create_support_relationship(self, supporting_claim_id: UUID, supported_claim_id: UUID, weight: float = 1.0):
         """Create a SUPPORTS relationship between two claims"""
         async with self.driver.session(database=self.database) as session:
@@ -95,6 +157,28 @@ class Neo4jClient:
             node = record["c"]
             return self._node_to_claim(node)
 
+    async def get_claims_by_ids(self, claim_ids: List[UUID]) -> Dict[str, ClaimNode]:
+        """Retrieve many claims in one query, keyed by claim ID string"""
+        if not claim_ids:
+            return {}
+
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(
+                """
+                UNWIND $ids AS id
+                MATCH (c:Claim {id: id})
+                RETURN c
+                """,
+                ids=[str(claim_id) for claim_id in claim_ids]
+            )
+
+            claims = {}
+            async for record in result:
+                claim = self._node_to_claim(record["c"])
+                claims[str(claim.id)] = claim
+
+            return claims
+
     async def get_claim_with_dependencies(self, claim_id: UUID) -> Optional[ClaimWithDependencies]:
         """Get claim with its immediate dependencies and dependents"""
         async with self.driver.session(database=self.database) as session:
@@ -164,15 +248,33 @@ class Neo4jClient:
                 WHERE NOT c.isImmutable
                 OPTIONAL MATCH (c)-[r:SUPPORTS]->()
                 WITH c, sum(r.weight) as dependency_weight
+                // Claims stored in lazy decay mode get their age term added here
+                WITH c, dependency_weight,
+                     CASE WHEN c.baseDecayScore IS NULL THEN 0.0
+                          ELSE 1.0 - 0.5 ^ (
+                              toFloat(duration.inDays(localdatetime(c.extractedAt), $now).days) /
+                              CASE WHEN c.isImmutable THEN $half_life_immutable ELSE $half_life_mutable END
+                          )
+                     END as age_decay
+                WITH c, dependency_weight,
+                     CASE WHEN c.baseDecayScore IS NULL THEN c.decayScore
+                          ELSE c.baseDecayScore + COALESCE(c.velocityBoost, 0.0) +
+                               CASE WHEN age_decay > 0.5 THEN 0.5 ELSE age_decay END
+                     END as raw_decay
+                WITH c, dependency_weight,
+                     CASE WHEN raw_decay > 1.0 THEN 1.0 ELSE raw_decay END as decay_score
                 WITH c, COALESCE(dependency_weight, 0.0) as dep_weight,
-                     (c.decayScore * COALESCE(dependency_weight, 1.0) * (c.contradictionCount + 1)) as vulnerability
+                     (decay_score * COALESCE(dependency_weight, 1.0) * (c.contradictionCount + 1)) as vulnerability
                 RETURN c, dep_weight, vulnerability
                 ORDER BY vulnerability DESC
                 SKIP $offset
                 LIMIT $limit
                 """,
                 offset=offset,
-                limit=limit
+                limit=limit,
+                now=datetime.utcnow(),
+                half_life_immutable=decay_forecaster.base_half_life_immutable,
+                half_life_mutable=decay_forecaster.base_half_life_mutable
             )
 
             vulnerable_claims = []
@@ -203,6 +305,107 @@ class Neo4jClient:
                 half_life_days=half_life_days
             )
 
+    async def update_decay_scores(self, updates: List[Dict[str, Any]]):
+        """
+        Update decay scores and half-lives for many claims in one query
+
+        Args:
+            updates: Dicts with claim_id, decay_score and half_life_days
+        """
+        if not updates:
+            return
+
+        async with self.driver.session(database=self.database) as session:
+            await session.run(
+                """
+                UNWIND $updates AS update
+                MATCH (c:Claim {id: update.claim_id})
+                SET c.decayScore = update.decay_score, c.halfLifeDays = update.half_life_days
+                """,
+                updates=[
+                    {
+                        "claim_id": str(u["claim_id"]),
+                        "decay_score": u["decay_score"],
+                        "half_life_days": u["half_life_days"]
+                    }
+                    for u in updates
+                ]
+            )
+
+    async def update_decay_components(self, updates: List[Dict[str, Any]]):
+        """
+        Store the time-independent decay components for many claims (lazy decay mode)
+
+        The age term is added when the claim is read, so these only need
+        rewriting when a claim's velocity boost changes.
+
+        Args:
+            updates: Dicts with claim_id, base_decay_score, velocity_boost and half_life_days
+        """
+        if not updates:
+            return
+
+        async with self.driver.session(database=self.database) as session:
+            await session.run(
+                """
+                UNWIND $updates AS update
+                MATCH (c:Claim {id: update.claim_id})
+                SET c.baseDecayScore = update.base_decay_score,
+                    c.velocityBoost = update.velocity_boost,
+                    c.halfLifeDays = update.half_life_days
+                """,
+                updates=[
+                    {
+                        "claim_id": str(u["claim_id"]),
+                        "base_decay_score": u["base_decay_score"],
+                        "velocity_boost": u["velocity_boost"],
+                        "half_life_days": u["half_life_days"]
+                    }
+                    for u in updates
+                ]
+            )
+
+    async def get_decay_inputs(
+        self,
+        after_id: Optional[str] = None,
+        limit: int = 5000,
+        mutable_only: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Page through the fields decay scoring needs, ordered by claim ID
+
+        Uses keyset pagination (pass the last ID of the previous page as
+        after_id) so deep pages stay as cheap as the first.
+
+        Args:
+            after_id: Return claims with IDs greater than this one
+            limit: Maximum number of claims to return
+            mutable_only: Skip immutable claims
+
+        Returns:
+            Dicts with claim_id, text, extracted_at (ISO string), is_immutable,
+            half_life_days and entities
+        """
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(
+                """
+                MATCH (c:Claim)
+                WHERE ($after_id IS NULL OR c.id > $after_id)
+                  AND (NOT $mutable_only OR NOT c.isImmutable)
+                RETURN c.id AS claim_id, c.text AS text,
+                       c.extractedAt AS extracted_at, c.isImmutable AS is_immutable,
+                       c.halfLifeDays AS half_life_days,
+                       [(c)-[:MENTIONS]->(e:Entity) | e.name] AS entities
+                ORDER BY c.id
+                LIMIT $limit
+                """,
+                after_id=after_id,
+                limit=limit,
+                mutable_only=mutable_only
+            )
+
+            return [record.data() async for record in result]
+
     async def increment_contradiction_count(self, claim_id: UUID):
         """Increment the contradiction count for a claim"""
         async with self.driver.session(database=self.database) as session:
@@ -214,27 +417,144 @@ class Neo4jClient:
                 id=str(claim_id)
             )
 
+    async def create_contradiction_relationships(self, contradictions: List[Dict[str, Any]]) -> int:
+        """
+        Record confirmed contradictions in bulk
+
+        Creates one CONTRADICTS relationship per pair and increments both
+        claims' contradictionCount only when the relationship is new, so
+        re-running a sweep does not inflate counts.
+
+        Args:
+            contradictions: Dicts with claim_id, other_claim_id and score
+
+        Returns:
+            Number of newly created relationships
+        """
+        if not contradictions:
+            return 0
+
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(
+                """
+                UNWIND $pairs AS pair
+                MATCH (a:Claim {id: pair.claim_id})
+                MATCH (b:Claim {id: pair.other_claim_id})
+                MERGE (a)-[r:CONTRADICTS]-(b)
+                ON CREATE SET r.score = pair.score,
+                              r.detectedAt = $detected_at,
+                              a.contradictionCount = a.contradictionCount + 1,
+                              b.contradictionCount = b.contradictionCount + 1
+                RETURN count(CASE WHEN r.detectedAt = $detected_at THEN 1 END) AS created_count
+                """,
+                pairs=[
+                    {
+                        "claim_id": str(c["claim_id"]),
+                        "other_claim_id": str(c["other_claim_id"]),
+                        "score": c["score"]
+                    }
+                    for c in contradictions
+                ],
+                detected_at=datetime.utcnow().isoformat()
+            )
+            record = await result.single()
+            return record["created_count"] if record else 0
+
+    async def get_claim_entities(self, claim_ids: List[UUID]) -> Dict[str, List[str]]:
+        """Entity names linked from many claims, keyed by claim ID string"""
+        if not claim_ids:
+            return {}
+
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(
+                """
+                UNWIND $ids AS id
+                MATCH (c:Claim {id: id})-[:MENTIONS]->(e:Entity)
+                RETURN c.id AS claim_id, collect(e.name) AS entities
+                """,
+                ids=[str(claim_id) for claim_id in claim_ids]
+            )
+            return {record["claim_id"]: record["entities"] async for record in result}
+
+    async def get_claim_ids_by_entity(
+        self,
+        entity: str,
+        after_id: Optional[str] = None,
+        limit: int = 5000,
+        mutable_only: bool = True
+    ) -> List[str]:
+        """
+        Page through the IDs of the claims that mention an entity, in ID order
+
+        Args:
+            entity: The entity name
+            after_id: Return claims with IDs greater than this one
+            limit: Maximum number of IDs to return
+            mutable_only: Skip immutable claims
+        """
+        async with self.driver.session(database=self.database) as session:
+            result = await session.run(
+                """
+                MATCH (c:Claim)-[:MENTIONS]->(:Entity {key: $key})
+                WHERE ($after_id IS NULL OR c.id > $after_id)
+                  AND (NOT $mutable_only OR NOT c.isImmutable)
+                RETURN c.id AS claim_id
+                ORDER BY c.id
+                LIMIT $limit
+                """,
+                key=entity.strip().lower(),
+                after_id=after_id,
+                limit=limit,
+                mutable_only=mutable_only
+            )
+            return [record["claim_id"] async for record in result]
+
+    def _entity_params(self, entities: List[str]) -> List[Dict[str, str]]:
+        """Entity names as MERGE parameters, deduplicated case-insensitively"""
+        params = {}
+        for entity in entities:
+            name = entity.strip()
+            if name:
+                params.setdefault(name.lower(), {"key": name.lower(), "name": name})
+        return list(params.values())
+
     async def create_indexes(self):
         """Create indexes for performance optimization"""
         async with self.driver.session(database=self.database) as session:
-            # Index on claim ID
-            await session.run("CREATE INDEX claim_id_index IF NOT EXISTS FOR (c:Claim) ON (c.id)")
+            # Unique claim ID: makes MERGE on it atomic under concurrent ingest. Its
+            # backing index replaces the plain claim_id_index, which would block it.
+            await session.run("DROP INDEX claim_id_index IF EXISTS")
+            await session.run("CREATE CONSTRAINT claim_id_unique IF NOT EXISTS FOR (c:Claim) REQUIRE c.id IS UNIQUE")
             # Index on article ID
             await session.run("CREATE INDEX article_id_index IF NOT EXISTS FOR (c:Claim) ON (c.articleId)")
             # Index on decay score
             await session.run("CREATE INDEX decay_score_index IF NOT EXISTS FOR (c:Claim) ON (c.decayScore)")
             # Index on contradiction count
             await session.run("CREATE INDEX contradiction_count_index IF NOT EXISTS FOR (c:Claim) ON (c.contradictionCount)")
+            # Unique entity key (lowercased name)
+            await session.run("CREATE CONSTRAINT entity_key_unique IF NOT EXISTS FOR (e:Entity) REQUIRE e.key IS UNIQUE")
 
     def _node_to_claim(self, node) -> ClaimNode:
         """Convert Neo4j node to ClaimNode model"""
+        extracted_at = datetime.fromisoformat(node["extractedAt"])
+
+        decay_score = node["decayScore"]
+        if node.get("baseDecayScore") is not None:
+            # Stored in lazy decay mode: add the age term now
+            decay_score = decay_forecaster.apply_age_decay(
+                base_decay_score=node["baseDecayScore"],
+                velocity_boost=node.get("velocityBoost") or 0.0,
+                is_immutable=node["isImmutable"],
+                extracted_at=extracted_at
+            )
+
         return ClaimNode(
             id=UUID(node["id"]),
             text=node["text"],
             source_url=node["sourceUrl"],
             article_id=node["articleId"],
-            extracted_at=datetime.fromisoformat(node["extractedAt"]),
-            decay_score=node["decayScore"],
+            extracted_at=extracted_at,
+            decay_score=decay_score,
             half_life_days=node["halfLifeDays"],
             is_immutable=node["isImmutable"],
             contradiction_count=node["contradictionCount"],
@@ -0,0 +1,117 @@
+from typing import List, Optional, Tuple
+from app.config import settings
+import asyncio
+import threading
+
+
+class NLIService:
+    """
+    Local multilingual NLI cross-encoder for contradiction scoring
+
+    Scores every (claim, candidate) pair for a claim in batched CPU forward
+    passes. The model is loaded lazily on first use so API startup stays fast,
+    and inference runs in a worker thread so it never blocks the event loop.
+    Inference is serialized: the fast tokenizer cannot be used from two threads
+    at once, and concurrent forward passes would only compete for torch's
+    intra-op threads.
+    """
+
+    def __init__(self):
+        self.enabled = settings.NLI_ENABLED
+        self.model_name = settings.NLI_MODEL
+        self.quantize = settings.NLI_QUANTIZE
+        self.batch_size = settings.NLI_BATCH_SIZE
+        self.max_length = settings.NLI_MAX_LENGTH
+        self.tokenizer = None
+        self.model = None
+        self.contradiction_index: Optional[int] = None
+        self._load_lock = threading.Lock()
+        self._inference_lock = threading.Lock()
+
+    @property
+    def version(self) -> str:
+        """Identifies the scorer, so cached verdicts can be tied to it"""
+        return f"{self.model_name}{':int8' if self.quantize else ''}"
+
+    async def load(self):
+        """Load the tokenizer and model if not loaded yet"""
+        if self.model is None:
+            await asyncio.to_thread(self._load)
+
+    async def score_pairs(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Score arbitrary (text, text) pairs for contradiction in one batched run
+
+        Args:
+            pairs: Pairs of claim texts
+
+        Returns:
+            Contradiction probability (0-1) per pair, averaged over both directions
+        """
+        if not pairs:
+            return []
+
+        await self.load()
+        return await asyncio.to_thread(self._score, pairs)
+
+    def _load(self):
+        """Blocking model load (run in a thread)"""
+        with self._load_lock:
+            if self.model is not None:
+                return
+
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            model.eval()
+
+            if self.quantize:
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+            labels = {label.lower(): index for index, label in model.config.id2label.items()}
+            contradiction_index = next(
+                (index for label, index in labels.items() if label.startswith("contradict")),
+                None
+            )
+            if contradiction_index is None:
+                raise ValueError(f"NLI model {self.model_name} has no contradiction label: {list(labels)}")
+
+            self.tokenizer = tokenizer
+            self.contradiction_index = contradiction_index
+            self.model = model
+
+    def _score(self, text_pairs: List[Tuple[str, str]]) -> List[float]:
+        """Blocking batched inference (run in a thread)"""
+        import torch
+
+        pairs = text_pairs + [(second, first) for first, second in text_pairs]
+
+        # Sort by length so each batch is only padded to its own longest pair
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][0]) + len(pairs[i][1]))
+        probabilities = [0.0] * len(pairs)
+
+        with self._inference_lock, torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch = order[start:start + self.batch_size]
+                encoded = self.tokenizer(
+                    [pairs[i][0] for i in batch],
+                    [pairs[i][1] for i in batch],
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="pt"
+                )
+                logits = self.model(**encoded).logits
+                scores = torch.softmax(logits, dim=-1)[:, self.contradiction_index].tolist()
+
+                for i, score in zip(batch, scores):
+                    probabilities[i] = score
+
+        count = len(text_pairs)
+        return [(probabilities[i] + probabilities[i + count]) / 2 for i in range(count)]
+
+
+# Singleton instance
+nli_service = NLIService()
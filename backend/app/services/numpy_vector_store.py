@@ -0,0 +1,435 @@
+import numpy as np
+from typing import List, Optional, Dict, Any, Tuple
+from app.services.vector_store_base import VectorStore
+from uuid import UUID
+from datetime import datetime
+import json
+import os
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    In-process vector store with exact cosine search
+
+    Vectors are L2-normalised on insert and kept in one contiguous float32
+    matrix, so a search is a single matrix product followed by a partial sort.
+    Results are exact, which makes this store a stand-in for Qdrant in tests,
+    CI and small single-process deployments, and the ground truth when
+    measuring HNSW recall.
+
+    When `path` is set the matrix is an on-disk memmap and ids/payloads are
+    written next to it on flush() and close(), so the store survives restarts.
+    Batch upserts flush before returning, so a long-lived worker that crashes
+    loses none of the batches it reported as indexed.
+    """
+
+    # Payload fields kept as integer code columns for vectorized filtering
+    coded_fields = ("language", "articleId")
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        vector_size: int = 1024,
+        initial_capacity: int = 1024,
+        collection_name: str = "claims"
+    ):
+        self.path = path
+        self.vector_size = vector_size
+        self.initial_capacity = initial_capacity
+        self.collection_name = collection_name
+        self.search_chunk_size = 256  # Queries per matrix product in search_batch
+
+        self._vectors: Optional[np.ndarray] = None
+        self._count = 0
+        self._ids: List[str] = []
+        self._payloads: List[Dict[str, Any]] = []
+        self._index: Dict[str, int] = {}
+        self._codes: Dict[str, Dict[str, int]] = {field: {} for field in self.coded_fields}
+        self._field_codes: Dict[str, np.ndarray] = {}
+
+    async def connect(self):
+        """Load the persisted store if present, otherwise allocate an empty one"""
+        if self._vectors is not None:
+            return
+
+        if self.path and os.path.exists(self._meta_file):
+            self._load()
+        else:
+            self._reset()
+
+    async def close(self):
+        """Flush the store to disk when persistence is enabled"""
+        if self._vectors is not None:
+            self.flush()
+
+    async def create_collection(self, collection_name: Optional[str] = None):
+        """Drop all stored vectors and start from an empty matrix"""
+        if collection_name:
+            self.collection_name = collection_name
+        self._reset()
+
+    async def collection_exists(self, collection_name: Optional[str] = None) -> bool:
+        """The in-process collection exists once the store is connected"""
+        return self._vectors is not None
+
+    async def upsert_claim_embedding(
+        self,
+        claim_id: UUID,
+        embedding: List[float],
+        article_id: str,
+        language: str,
+        source_url: str,
+        extracted_at: datetime
+    ):
+        """Insert or update a claim embedding"""
+        key = str(claim_id)
+        payload = self._build_payload(claim_id, article_id, language, source_url, extracted_at)
+
+        row = self._index.get(key)
+        if row is None:
+            self._ensure_capacity(self._count + 1)
+            row = self._count
+            self._count += 1
+            self._ids.append(key)
+            self._payloads.append(payload)
+            self._index[key] = row
+        else:
+            self._payloads[row] = payload
+
+        self._vectors[row] = self._normalize(np.asarray(embedding, dtype=np.float32))
+        for field in self.coded_fields:
+            self._field_codes[field][row] = self._code(field, payload.get(field))
+
+    async def upsert_claim_embeddings(self, points: List[Dict[str, Any]]):
+        """Insert or update many claim embeddings"""
+        self._ensure_capacity(self._count + len(points))
+        for point in points:
+            await self.upsert_claim_embedding(**point)
+        self.flush()
+
+    async def get_vectors(self, claim_ids: List[UUID]) -> Dict[str, List[float]]:
+        """Fetch stored (normalised) vectors by claim ID"""
+        vectors = {}
+        for claim_id in claim_ids:
+            row = self._index.get(str(claim_id))
+            if row is not None:
+                vectors[str(claim_id)] = self._vectors[row].tolist()
+        return vectors
+
+    async def search_similar_claims(
+        self,
+        query_vector: List[float],
+        limit: int = 10,
+        language: Optional[str] = None,
+        score_threshold: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """Exact top-k search for similar claims, optionally within one language"""
+        mask = self._match("language", [language]) if language else None
+        scores = self._matrix() @ self._normalize(np.asarray(query_vector, dtype=np.float32))
+
+        return [
+            {
+                "claim_id": self._ids[row],
+                "score": score,
+                "payload": self._payloads[row]
+            }
+            for row, score in self._top_k(scores, mask, limit, score_threshold)
+        ]
+
+    async def search_contradicting_claims(
+        self,
+        query_vector: List[float],
+        original_claim_id: UUID,
+        target_languages: Optional[List[str]] = None,
+        limit: int = 20,
+        score_threshold: float = 0.75,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Exact equivalent of QdrantService.search_contradicting_claims"""
+        results = await self.search_batch(
+            query_vectors=[query_vector],
+            original_claim_ids=[original_claim_id],
+            target_languages=target_languages,
+            limit=limit,
+            score_threshold=score_threshold,
+            offset=offset
+        )
+        return results[0]
+
+    async def search_batch(
+        self,
+        query_vectors: List[List[float]],
+        original_claim_ids: List[UUID],
+        target_languages: Optional[List[str]] = None,
+        limit: int = 20,
+        score_threshold: float = 0.75,
+        offset: int = 0,
+        exclude_languages: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Exact top-k search for many claims at once
+
+        Mirrors QdrantService.search_batch: the original claim, claims
+        outside target_languages and each query's exclude_languages entry are
+        excluded before ranking.
+        """
+        if len(query_vectors) != len(original_claim_ids):
+            raise ValueError("query_vectors and original_claim_ids must have the same length")
+
+        if not query_vectors:
+            return []
+
+        if self._count == 0 or limit <= 0 or offset >= self._count:
+            return [[] for _ in query_vectors]
+
+        matrix = self._matrix()
+        k = min(offset + limit, self._count)
+        language_mask = self._match("language", target_languages) if target_languages else None
+        language_codes = self._field_codes["language"][:self._count]
+        results = []
+
+        for start in range(0, len(query_vectors), self.search_chunk_size):
+            chunk = np.asarray(query_vectors[start:start + self.search_chunk_size], dtype=np.float32)
+            chunk_ids = original_claim_ids[start:start + self.search_chunk_size]
+            chunk_excludes = (exclude_languages or [])[start:start + self.search_chunk_size]
+
+            scores = self._normalize(chunk) @ matrix.T
+
+            if language_mask is not None:
+                scores[:, ~language_mask] = -np.inf
+
+            for i, language in enumerate(chunk_excludes):
+                code = self._codes["language"].get(language)
+                if code is not None:
+                    scores[i, language_codes == code] = -np.inf
+
+            # Exclude each query's own claim
+            for i, claim_id in enumerate(chunk_ids):
+                row = self._index.get(str(claim_id))
+                if row is not None:
+                    scores[i, row] = -np.inf
+
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            for rows, row_scores in zip(top[:, offset:], top_scores[:, offset:]):
+                candidates = []
+                for row, score in zip(rows.tolist(), row_scores.tolist()):
+                    if score < score_threshold:
+                        break
+                    candidates.append(
+                        self._format_contradiction_candidate(self._ids[row], score, self._payloads[row])
+                    )
+                results.append(candidates)
+
+        return results
+
+    async def delete_claim(self, claim_id: UUID):
+        """Delete a claim embedding, moving the last row into its slot"""
+        row = self._index.pop(str(claim_id), None)
+        if row is None:
+            return
+
+        last = self._count - 1
+        if row != last:
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = self._ids[last]
+            self._payloads[row] = self._payloads[last]
+            for field in self.coded_fields:
+                self._field_codes[field][row] = self._field_codes[field][last]
+            self._index[self._ids[row]] = row
+
+        self._ids.pop()
+        self._payloads.pop()
+        self._count -= 1
+
+    async def scroll(
+        self,
+        limit: int = 256,
+        offset: Optional[Any] = None,
+        with_vectors: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """
+        Page through all stored claims
+
+        Offsets are row positions, so deleting claims while scrolling may skip
+        or repeat points.
+        """
+        start = int(offset or 0)
+        end = min(start + limit, self._count)
+
+        points = [
+            {
+                "claim_id": self._ids[row],
+                "payload": self._payloads[row],
+                "vector": self._vectors[row].tolist() if with_vectors else None
+            }
+            for row in range(start, end)
+        ]
+
+        next_offset = end if end < self._count else None
+        return points, next_offset
+
+    async def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about the collection"""
+        return {
+            "name": self.collection_name,
+            "vector_size": self.vector_size,
+            "distance": "COSINE",
+            "points_count": self._count
+        }
+
+    def flush(self):
+        """Write vectors and metadata to disk (no-op without a path)"""
+        if not self.path:
+            return
+
+        self._vectors.flush()
+
+        meta = {
+            "vector_size": self.vector_size,
+            "capacity": self._vectors.shape[0],
+            "count": self._count,
+            "ids": self._ids,
+            "payloads": self._payloads
+        }
+        tmp_file = f"{self._meta_file}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, self._meta_file)
+
+    @property
+    def _vectors_file(self) -> str:
+        return os.path.join(self.path, "vectors.f32")
+
+    @property
+    def _meta_file(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def _matrix(self) -> np.ndarray:
+        """View of the populated rows of the vector matrix"""
+        return self._vectors[:self._count]
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        """L2-normalise a vector or the rows of a matrix"""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def _top_k(
+        self,
+        scores: np.ndarray,
+        mask: Optional[np.ndarray],
+        limit: int,
+        score_threshold: float
+    ) -> List[Tuple[int, float]]:
+        """Return (row, score) pairs of the best matches above the threshold"""
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(limit, scores.shape[0])
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [(int(row), float(scores[row])) for row in top if scores[row] >= score_threshold]
+
+    def _match(self, field: str, values: List[Any]) -> np.ndarray:
+        """Boolean mask of rows whose payload field equals one of values"""
+        if field in self.coded_fields:
+            codes = [self._codes[field][v] for v in values if v in self._codes[field]]
+            return np.isin(self._field_codes[field][:self._count], codes)
+
+        return np.fromiter(
+            (payload.get(field) in values for payload in self._payloads),
+            dtype=bool,
+            count=self._count
+        )
+
+    def _code(self, field: str, value: Any) -> int:
+        """Integer code for a payload value, assigning a new one if needed"""
+        codes = self._codes[field]
+        if value not in codes:
+            codes[value] = len(codes)
+        return codes[value]
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        """Allocate (or grow) the vector matrix, on disk when persistence is enabled"""
+        if not self.path:
+            return np.zeros((capacity, self.vector_size), dtype=np.float32)
+
+        os.makedirs(self.path, exist_ok=True)
+        mode = "r+b" if os.path.exists(self._vectors_file) else "w+b"
+        with open(self._vectors_file, mode) as f:
+            f.truncate(capacity * self.vector_size * np.dtype(np.float32).itemsize)
+
+        return np.memmap(self._vectors_file, dtype=np.float32, mode="r+", shape=(capacity, self.vector_size))
+
+    def _ensure_capacity(self, needed: int):
+        """Grow the vector matrix and code columns geometrically"""
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(needed, capacity * 2)
+
+        if self.path:
+            # Growing the file in place keeps existing rows
+            self._vectors.flush()
+            self._vectors = self._allocate(new_capacity)
+        else:
+            vectors = self._allocate(new_capacity)
+            vectors[:self._count] = self._vectors[:self._count]
+            self._vectors = vectors
+
+        for field in self.coded_fields:
+            codes = np.zeros(new_capacity, dtype=np.int32)
+            codes[:self._count] = self._field_codes[field][:self._count]
+            self._field_codes[field] = codes
+
+    def _reset(self):
+        """Start from an empty store"""
+        if self.path:
+            for file in (self._vectors_file, self._meta_file):
+                if os.path.exists(file):
+                    os.remove(file)
+
+        self._vectors = self._allocate(self.initial_capacity)
+        self._count = 0
+        self._ids = []
+        self._payloads = []
+        self._index = {}
+        self._codes = {field: {} for field in self.coded_fields}
+        self._field_codes = {
+            field: np.zeros(self.initial_capacity, dtype=np.int32)
+            for field in self.coded_fields
+        }
+
+    def _load(self):
+        """Load a persisted store from disk"""
+        with open(self._meta_file) as f:
+            meta = json.load(f)
+
+        if meta["vector_size"] != self.vector_size:
+            raise ValueError(
+                f"Persisted vector size {meta['vector_size']} does not match {self.vector_size}"
+            )
+
+        capacity = meta["capacity"]
+        self._vectors = np.memmap(self._vectors_file, dtype=np.float32, mode="r+", shape=(capacity, self.vector_size))
+        self._count = meta["count"]
+        self._ids = meta["ids"]
+        self._payloads = meta["payloads"]
+        self._index = {claim_id: row for row, claim_id in enumerate(self._ids)}
+        self._codes = {field: {} for field in self.coded_fields}
+        self._field_codes = {}
+
+        for field in self.coded_fields:
+            codes = np.zeros(capacity, dtype=np.int32)
+            for row, payload in enumerate(self._payloads):
+                codes[row] = self._code(field, payload.get(field))
+            self._field_codes[field] = codes
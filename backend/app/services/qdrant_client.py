@@ -1,12 +1,16 @@
 from qdrant_client import AsyncQdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
-from typing import List, Optional, Dict, Any
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, MatchAny, SearchRequest,
+    HnswConfigDiff, OptimizersConfigDiff, QuantizationConfig
+)
+from typing import List, Optional, Dict, Any, Tuple
 from app.config import settings
+from app.services.vector_store_base import VectorStore
 from uuid import UUID
 from datetime import datetime
 
 
-class QdrantService:
+class QdrantService(VectorStore):
     """Client for Qdrant vector database operations"""
 
     def __init__(self):
@@ -14,14 +18,29 @@ class QdrantService:
         self.port = settings.QDRANT_PORT
         self.api_key = settings.QDRANT_API_KEY
         self.collection_name = settings.QDRANT_COLLECTION_NAME
+        self.prefer_grpc = settings.QDRANT_PREFER_GRPC
+        self.grpc_port = settings.QDRANT_GRPC_PORT
+        self.grpc_options = settings.QDRANT_GRPC_OPTIONS
         self.client: Optional[AsyncQdrantClient] = None
         self.vector_size = 1024  # Cohere embed-multilingual-v3 dimension
 
-    async def connect(self):
-        """Initialize connection to Qdrant"""
+    async def connect(self, prefer_grpc: Optional[bool] = None):
+        """
+        Initialize connection to Qdrant
+
+        Args:
+            prefer_grpc: Use the gRPC transport instead of REST. Defaults to
+                the QDRANT_PREFER_GRPC setting.
+        """
+        if prefer_grpc is None:
+            prefer_grpc = self.prefer_grpc
+
         self.client = AsyncQdrantClient(
             host=self.host,
             port=self.port,
+            grpc_port=self.grpc_port,
+            prefer_grpc=prefer_grpc,
+            grpc_options=self.grpc_options if prefer_grpc else None,
             api_key=self.api_key,
         )
 
@@ -30,8 +49,22 @@ class QdrantService:
         if self.client:
             await self.client.close()
 
-    async def create_collection(self, collection_name: Optional[str] = None):
-        """Create a new collection for claim embeddings"""
+    async def create_collection(
+        self,
+        collection_name: Optional[str] = None,
+        hnsw_config: Optional[HnswConfigDiff] = None,
+        quantization_config: Optional[QuantizationConfig] = None,
+        optimizers_config: Optional[OptimizersConfigDiff] = None
+    ):
+        """
+        Create a new collection for claim embeddings
+
+        Args:
+            collection_name: Collection to create (defaults to the configured one)
+            hnsw_config: Optional HNSW index settings (m, ef_construct, ...)
+            quantization_config: Optional vector quantization settings
+            optimizers_config: Optional optimizer settings (e.g. indexing_threshold)
+        """
         collection_name = collection_name or self.collection_name
 
         await self.client.create_collection(
@@ -39,7 +72,10 @@ class QdrantService:
             vectors_config=VectorParams(
                 size=self.vector_size,
                 distance=Distance.COSINE
-            )
+            ),
+            hnsw_config=hnsw_config,
+            quantization_config=quantization_config,
+            optimizers_config=optimizers_config
         )
 
     async def collection_exists(self, collection_name: Optional[str] = None) -> bool:
@@ -61,13 +97,7 @@ class QdrantService:
         point = PointStruct(
             id=str(claim_id),
             vector=embedding,
-            payload={
-                "claimId": str(claim_id),
-                "articleId": article_id,
-                "language": language,
-                "sourceUrl": source_url,
-                "extractedAt": extracted_at.isoformat()
-            }
+            payload=self._build_payload(claim_id, article_id, language, source_url, extracted_at)
         )
 
         await self.client.upsert(
@@ -75,6 +105,51 @@ class QdrantService:
             points=[point]
         )
 
+    async def upsert_claim_embeddings(self, points: List[Dict[str, Any]]):
+        """Insert or update many claim embeddings in one request"""
+        if not points:
+            return
+
+        await self.client.upsert(
+            collection_name=self.collection_name,
+            points=[
+                PointStruct(
+                    id=str(point["claim_id"]),
+                    vector=point["embedding"],
+                    payload=self._build_payload(
+                        point["claim_id"],
+                        point["article_id"],
+                        point["language"],
+                        point["source_url"],
+                        point["extracted_at"]
+                    )
+                )
+                for point in points
+            ]
+        )
+
+    async def get_vectors(self, claim_ids: List[UUID]) -> Dict[str, List[float]]:
+        """
+        Fetch stored vectors by claim ID in a single request
+
+        Args:
+            claim_ids: Claims to look up
+
+        Returns:
+            Dictionary of claim ID (as string) to vector for every stored claim
+        """
+        if not claim_ids:
+            return {}
+
+        records = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[str(claim_id) for claim_id in claim_ids],
+            with_payload=False,
+            with_vectors=True
+        )
+
+        return {str(record.id): record.vector for record in records}
+
     async def search_similar_claims(
         self,
         query_vector: List[float],
@@ -128,7 +203,8 @@ class QdrantService:
         original_claim_id: UUID,
         target_languages: Optional[List[str]] = None,
         limit: int = 20,
-        score_threshold: float = 0.75
+        score_threshold: float = 0.75,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
         """
         Search for potentially contradicting claims in specified languages
@@ -143,54 +219,128 @@ class QdrantService:
             target_languages: Languages to search in
             limit: Maximum number of results
             score_threshold: Minimum similarity score
+            offset: Number of top-ranked results to skip (for paging)
 
         Returns:
             List of potentially contradicting claims
         """
-        # Build filter to exclude the original claim
-        must_not = [
-            FieldCondition(
-                key="claimId",
-                match=MatchValue(value=str(original_claim_id))
-            )
-        ]
-
-        # Add language filter if specified
-        must = []
-        if target_languages:
-            # Qdrant doesn't support OR in filters easily, so we'll search without language filter
-            # and filter in post-processing if needed
-            pass
-
-        search_filter = Filter(must_not=must_not)
-
         results = await self.client.search(
             collection_name=self.collection_name,
             query_vector=query_vector,
             limit=limit,
+            offset=offset,
             score_threshold=score_threshold,
-            query_filter=search_filter
+            query_filter=self._contradiction_filter(original_claim_id, target_languages)
         )
 
-        # Post-process to filter by language if needed
-        filtered_results = results
-        if target_languages:
-            filtered_results = [
-                r for r in results
-                if r.payload.get("language") in target_languages
-            ]
+        return [
+            self._format_contradiction_candidate(result.id, result.score, result.payload)
+            for result in results
+        ]
+
+    async def search_batch(
+        self,
+        query_vectors: List[List[float]],
+        original_claim_ids: List[UUID],
+        target_languages: Optional[List[str]] = None,
+        limit: int = 20,
+        score_threshold: float = 0.75,
+        offset: int = 0,
+        exclude_languages: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for potentially contradicting claims for many claims in one request
+
+        Equivalent to calling search_contradicting_claims once per vector, but
+        all searches are sent to Qdrant as a single batch request.
+
+        Args:
+            query_vectors: Embeddings of the claims to check
+            original_claim_ids: IDs of the claims, aligned with query_vectors
+            target_languages: Languages to search in
+            limit: Maximum number of results per claim
+            score_threshold: Minimum similarity score
+            offset: Number of top-ranked results to skip per claim (for paging)
+            exclude_languages: Language to leave out of each claim's results,
+                aligned with query_vectors
+
+        Returns:
+            One list of potentially contradicting claims per query vector
+        """
+        if len(query_vectors) != len(original_claim_ids):
+            raise ValueError("query_vectors and original_claim_ids must have the same length")
+
+        if not query_vectors:
+            return []
+
+        exclude_languages = exclude_languages or [None] * len(query_vectors)
+        requests = [
+            SearchRequest(
+                vector=query_vector,
+                filter=self._contradiction_filter(claim_id, target_languages, exclude_language),
+                limit=limit,
+                offset=offset,
+                score_threshold=score_threshold,
+                with_payload=True
+            )
+            for query_vector, claim_id, exclude_language in zip(query_vectors, original_claim_ids, exclude_languages)
+        ]
+
+        batch_results = await self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=requests
+        )
 
         return [
-            {
-                "claim_id": result.id,
-                "score": result.score,
-                "language": result.payload.get("language"),
-                "source_url": result.payload.get("sourceUrl"),
-                "extracted_at": result.payload.get("extractedAt")
-            }
-            for result in filtered_results
+            [
+                self._format_contradiction_candidate(result.id, result.score, result.payload)
+                for result in results
+            ]
+            for results in batch_results
         ]
 
+    def _contradiction_filter(
+        self,
+        claim_id: UUID,
+        target_languages: Optional[List[str]] = None,
+        exclude_language: Optional[str] = None
+    ) -> Filter:
+        """
+        Build a filter that excludes the given claim (and exclude_language)
+        and keeps target languages
+
+        Filtering languages inside the query (rather than after it) keeps
+        pages full, so an offset page shorter than its limit means the
+        ranking is exhausted.
+        """
+        must = []
+        if target_languages:
+            must.append(
+                FieldCondition(
+                    key="language",
+                    match=MatchAny(any=list(target_languages))
+                )
+            )
+
+        must_not = [
+            FieldCondition(
+                key="claimId",
+                match=MatchValue(value=str(claim_id))
+            )
+        ]
+        if exclude_language:
+            must_not.append(
+                FieldCondition(
+                    key="language",
+                    match=MatchValue(value=exclude_language)
+                )
+            )
+
+        return Filter(
+            must=must or None,
+            must_not=must_not
+        )
+
     async def delete_claim(self, claim_id: UUID):
         """Delete a claim embedding from the collection"""
         await self.client.delete(
@@ -198,6 +348,42 @@ class QdrantService:
             points_selector=[str(claim_id)]
         )
 
+    async def scroll(
+        self,
+        limit: int = 256,
+        offset: Optional[Any] = None,
+        with_vectors: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """
+        Page through all stored claims
+
+        Args:
+            limit: Maximum number of points per page
+            offset: Point ID returned by the previous call (None for the first page)
+            with_vectors: Whether to include the stored vectors
+
+        Returns:
+            Tuple of (points, next_offset); next_offset is None on the last page
+        """
+        records, next_offset = await self.client.scroll(
+            collection_name=self.collection_name,
+            limit=limit,
+            offset=offset,
+            with_payload=True,
+            with_vectors=with_vectors
+        )
+
+        points = [
+            {
+                "claim_id": record.id,
+                "payload": record.payload,
+                "vector": record.vector if with_vectors else None
+            }
+            for record in records
+        ]
+
+        return points, next_offset
+
     async def get_collection_info(self) -> Dict[str, Any]:
         """Get information about the collection"""
         info = await self.client.get_collection(collection_name=self.collection_name)
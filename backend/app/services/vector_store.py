@@ -0,0 +1,24 @@
+from app.config import settings
+from app.services.vector_store_base import VectorStore
+
+
+def create_vector_store() -> VectorStore:
+    """Create the vector store selected by the VECTOR_STORE_BACKEND setting"""
+    backend = settings.VECTOR_STORE_BACKEND.lower()
+
+    if backend == "qdrant":
+        from app.services.qdrant_client import qdrant_service
+        return qdrant_service
+
+    if backend == "numpy":
+        from app.services.numpy_vector_store import NumpyVectorStore
+        return NumpyVectorStore(
+            path=settings.VECTOR_STORE_PATH,
+            collection_name=settings.QDRANT_COLLECTION_NAME
+        )
+
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {settings.VECTOR_STORE_BACKEND}")
+
+
+# Singleton instance
+vector_store = create_vector_store()
@@ -0,0 +1,169 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
+from datetime import datetime
+
+
+class VectorStore(ABC):
+    """
+    Interface for claim embedding storage and similarity search
+
+    Implemented by QdrantService (production) and NumpyVectorStore
+    (in-process exact search for tests, CI and small deployments).
+    """
+
+    vector_size: int = 1024  # Cohere embed-multilingual-v3 dimension
+
+    @abstractmethod
+    async def connect(self):
+        """Open the underlying store"""
+
+    @abstractmethod
+    async def close(self):
+        """Release the underlying store"""
+
+    @abstractmethod
+    async def create_collection(self, collection_name: Optional[str] = None):
+        """Create the collection for claim embeddings"""
+
+    @abstractmethod
+    async def collection_exists(self, collection_name: Optional[str] = None) -> bool:
+        """Check if the collection exists"""
+
+    @abstractmethod
+    async def upsert_claim_embedding(
+        self,
+        claim_id: UUID,
+        embedding: List[float],
+        article_id: str,
+        language: str,
+        source_url: str,
+        extracted_at: datetime
+    ):
+        """Insert or update a claim embedding"""
+
+    @abstractmethod
+    async def upsert_claim_embeddings(self, points: List[Dict[str, Any]]):
+        """
+        Insert or update many claim embeddings in one request
+
+        Args:
+            points: Dicts with the upsert_claim_embedding arguments (claim_id,
+                embedding, article_id, language, source_url, extracted_at)
+        """
+
+    @abstractmethod
+    async def get_vectors(self, claim_ids: List[UUID]) -> Dict[str, List[float]]:
+        """
+        Fetch stored vectors by claim ID
+
+        Args:
+            claim_ids: Claims to look up
+
+        Returns:
+            Dictionary of claim ID (as string) to vector for every stored claim
+        """
+
+    @abstractmethod
+    async def search_similar_claims(
+        self,
+        query_vector: List[float],
+        limit: int = 10,
+        language: Optional[str] = None,
+        score_threshold: float = 0.7
+    ) -> List[Dict[str, Any]]:
+        """Search for semantically similar claims, returning claim_id, score and payload"""
+
+    @abstractmethod
+    async def search_contradicting_claims(
+        self,
+        query_vector: List[float],
+        original_claim_id: UUID,
+        target_languages: Optional[List[str]] = None,
+        limit: int = 20,
+        score_threshold: float = 0.75,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for potentially contradicting claims, excluding the original claim
+
+        Only claims in target_languages are ranked; offset skips that many
+        top-ranked results for paging.
+        """
+
+    @abstractmethod
+    async def search_batch(
+        self,
+        query_vectors: List[List[float]],
+        original_claim_ids: List[UUID],
+        target_languages: Optional[List[str]] = None,
+        limit: int = 20,
+        score_threshold: float = 0.75,
+        offset: int = 0,
+        exclude_languages: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run search_contradicting_claims for many vectors at once
+
+        exclude_languages, aligned with query_vectors, drops each query's
+        given language inside the search, so same-language neighbours never
+        take the top-k slots.
+        """
+
+    @abstractmethod
+    async def delete_claim(self, claim_id: UUID):
+        """Delete a claim embedding"""
+
+    @abstractmethod
+    async def scroll(
+        self,
+        limit: int = 256,
+        offset: Optional[Any] = None,
+        with_vectors: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[Any]]:
+        """
+        Page through all stored claims
+
+        Args:
+            limit: Maximum number of points per page
+            offset: Offset returned by the previous call (None for the first page)
+            with_vectors: Whether to include the stored vectors
+
+        Returns:
+            Tuple of (points, next_offset). Each point has claim_id, payload
+            and vector (None unless with_vectors). next_offset is None on the
+            last page.
+        """
+
+    @abstractmethod
+    async def get_collection_info(self) -> Dict[str, Any]:
+        """Get information about the collection"""
+
+    @staticmethod
+    def _build_payload(
+        claim_id: UUID,
+        article_id: str,
+        language: str,
+        source_url: str,
+        extracted_at: datetime
+    ) -> Dict[str, Any]:
+        """Build the payload stored alongside a claim embedding"""
+        return {
+            "claimId": str(claim_id),
+            "articleId": article_id,
+            "language": language,
+            "sourceUrl": source_url,
+            "extractedAt": extracted_at.isoformat()
+        }
+
+    @staticmethod
+    def _format_contradiction_candidate(point_id: Any, score: float, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a scored point into a contradiction candidate dict"""
+        return {
+            "claim_id": point_id,
+            "score": score,
+            "language": payload.get("language"),
+            "article_id": payload.get("articleId"),
+            "source_url": payload.get("sourceUrl"),
+            "extracted_at": payload.get("extractedAt")
+        }
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from typing import Dict, List
+from app.config import settings
+from app.utils.redis_client import get_redis
+import hashlib
+
+
+class VerdictCache:
+    """
+    Persistent cache of contradiction verdicts for (claim, candidate) pairs
+
+    Keys hash both claim texts in sorted order plus the assessor version, so
+    a pair has the same key whichever claim is being checked, and editing
+    either claim's text (or changing the assessor) yields a new key; stale
+    verdicts are never read and simply expire. Verdicts live in Redis with an
+    in-process LRU in front to skip the round trip for hot pairs.
+    """
+
+    def __init__(self):
+        self.enabled = settings.VERDICT_CACHE_ENABLED
+        self.ttl_seconds = settings.VERDICT_CACHE_TTL_SECONDS
+        self.lru_size = settings.VERDICT_CACHE_LRU_SIZE
+        self.key_prefix = "verdict:"
+        self._lru: "OrderedDict[str, bool]" = OrderedDict()
+
+    @staticmethod
+    def pair_key(claim_text: str, other_text: str, assessor_version: str) -> str:
+        """Order-independent key for a pair of claim texts under an assessor version"""
+        first, second = sorted((claim_text, other_text))
+        digest = hashlib.sha256()
+        for part in (assessor_version, first, second):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, bool]:
+        """
+        Look up verdicts for many pairs
+
+        Args:
+            keys: Pair keys from pair_key()
+
+        Returns:
+            Dictionary of key to verdict for every key with a known verdict
+        """
+        if not self.enabled or not keys:
+            return {}
+
+        verdicts = {}
+        missing = []
+        for key in keys:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                verdicts[key] = self._lru[key]
+            else:
+                missing.append(key)
+
+        if not missing:
+            return verdicts
+
+        try:
+            client = get_redis()
+            values = await client.mget([self.key_prefix + key for key in missing])
+        except Exception as e:
+            print(f"Error reading verdict cache: {e}")
+            return verdicts
+
+        for key, value in zip(missing, values):
+            if value is not None:
+                verdict = value == b"1"
+                verdicts[key] = verdict
+                self._remember(key, verdict)
+
+        return verdicts
+
+    async def set_many(self, verdicts: Dict[str, bool]):
+        """Store verdicts for many pairs"""
+        if not self.enabled or not verdicts:
+            return
+
+        for key, verdict in verdicts.items():
+            self._remember(key, verdict)
+
+        try:
+            client = get_redis()
+            async with client.pipeline(transaction=False) as pipe:
+                for key, verdict in verdicts.items():
+                    pipe.set(self.key_prefix + key, "1" if verdict else "0", ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            print(f"Error writing verdict cache: {e}")
+
+    def _remember(self, key: str, verdict: bool):
+        """Insert into the in-process LRU, evicting the oldest entry if full"""
+        self._lru[key] = verdict
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+
+# Singleton instance
+verdict_cache = VerdictCache()
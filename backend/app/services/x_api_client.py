@@ -1,7 +1,22 @@
-import tweepy
-from typing import List, Dict, Any, Optional
+import httpx
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from app.config import settings
+from app.utils.redis_client import get_redis
+from app.services.mention_counters import mention_counters
 from datetime import datetime, timedelta
+from uuid import uuid4
+import asyncio
+import json
+import time
+
+# Delete a lock only if it still holds our token, so an expired lock that
+# another worker has since taken is never released by us
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class XAPIClient:
@@ -13,16 +28,89 @@ class XAPIClient:
         self.access_token = settings.X_ACCESS_TOKEN
         self.access_token_secret = settings.X_ACCESS_TOKEN_SECRET
         self.bearer_token = settings.X_BEARER_TOKEN
-
-        # Initialize Tweepy client
-        self.client = tweepy.Client(
-            bearer_token=self.bearer_token,
-            consumer_key=self.api_key,
-            consumer_secret=self.api_secret,
-            access_token=self.access_token,
-            access_token_secret=self.access_token_secret,
-            wait_on_rate_limit=True
+        self.api_base = settings.X_API_BASE
+        self.timeout = httpx.Timeout(settings.X_API_TIMEOUT_SECONDS, connect=5.0)
+        self.limits = httpx.Limits(
+            max_connections=settings.X_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.X_API_MAX_CONNECTIONS
         )
+        self.max_rate_limit_wait = settings.X_API_MAX_RATE_LIMIT_WAIT_SECONDS
+        self.rate_limit: Dict[str, Any] = {"remaining": None, "reset_time": None}
+        self.velocity_cache_ttl = settings.X_API_VELOCITY_CACHE_TTL_SECONDS
+        self.velocity_lock_seconds = 30  # How long one worker may hold a fetch lock
+        self.velocity_key_prefix = "velocity:"
+        self.stream_counters_enabled = settings.X_STREAM_COUNTERS_ENABLED
+        self.stream_rule_max_length = settings.X_STREAM_RULE_MAX_LENGTH
+        self.stream_max_rules = settings.X_STREAM_MAX_RULES
+        self.stream_rule_tag = "antibody-entities"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP client for the running event loop
+
+        Connections are tied to the loop that opened them, so the client is
+        recreated whenever the running loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_base,
+                headers={"Authorization": f"Bearer {self.bearer_token}"},
+                timeout=self.timeout,
+                limits=self.limits
+            )
+            self._client_loop = loop
+
+        return self._client
+
+    async def close(self):
+        """Close pooled connections"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    async def _get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        GET an API v2 endpoint without blocking the event loop
+
+        When rate limited, waits (asynchronously, so it can be cancelled) for
+        the window to reset if that is within max_rate_limit_wait seconds;
+        otherwise the 429 is raised so callers can fall back.
+
+        Args:
+            path: Endpoint path, e.g. "/tweets/search/recent"
+            params: Query parameters
+
+        Returns:
+            Decoded JSON response
+        """
+        client = self._get_client()
+
+        while True:
+            response = await client.get(path, params=params)
+            self._record_rate_limit(response)
+
+            if response.status_code == 429:
+                wait_seconds = max((self.rate_limit["reset_time"] or time.time()) - time.time(), 1.0)
+                if wait_seconds <= self.max_rate_limit_wait:
+                    await asyncio.sleep(wait_seconds)
+                    continue
+
+            response.raise_for_status()
+            return response.json()
+
+    def _record_rate_limit(self, response: httpx.Response):
+        """Remember the rate limit headers of the latest response"""
+        remaining = response.headers.get("x-rate-limit-remaining")
+        reset = response.headers.get("x-rate-limit-reset")
+        if remaining is not None:
+            self.rate_limit["remaining"] = int(remaining)
+        if reset is not None:
+            self.rate_limit["reset_time"] = int(reset)
 
     async def get_entity_mention_count(self, entity: str, hours: int = 24) -> int:
         """
@@ -40,36 +128,176 @@ class XAPIClient:
 
         try:
             # Search recent tweets mentioning the entity
-            response = self.client.search_recent_tweets(
-                query=f'"{entity}"',
-                start_time=start_time,
-                max_results=100,
-                tweet_fields=['created_at', 'public_metrics']
+            response = await self._get(
+                "/tweets/search/recent",
+                params={
+                    "query": f'"{entity}"',
+                    "start_time": start_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                    "max_results": 100,
+                    "tweet.fields": "created_at,public_metrics"
+                }
             )
 
-            if not response.data:
+            if not response.get("data"):
                 return 0
 
-            return len(response.data)
+            return len(response["data"])
 
         except Exception as e:
             print(f"Error fetching mention count for {entity}: {e}")
             return 0
 
+    async def get_entity_hourly_counts(self, entity: str, hours: int = 24) -> List[int]:
+        """
+        Get an hourly histogram of mentions of an entity in one request
+
+        Uses the recent tweet-counts endpoint, which returns exact counts
+        (not capped like search results). Buckets cover the last `hours`
+        completed hours.
+
+        Args:
+            entity: The entity name to count
+            hours: Number of hourly buckets (up to 7 days)
+
+        Returns:
+            Mention count per hour, oldest first
+
+        Raises:
+            httpx.HTTPError: If the request fails
+        """
+        end_time = self.counts_end_time()
+        start_time = end_time - timedelta(hours=hours)
+
+        response = await self._get(
+            "/tweets/counts/recent",
+            params={
+                "query": f'"{entity}"',
+                "start_time": start_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "end_time": end_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "granularity": "hour"
+            }
+        )
+
+        counts = [bucket["tweet_count"] for bucket in response.get("data", [])]
+
+        # Pad missing leading buckets so the histogram always has `hours` entries
+        return ([0] * hours + counts)[-hours:]
+
+    def counts_end_time(self) -> datetime:
+        """End of the latest completed hour, which hourly count windows end at"""
+        now = datetime.utcnow()
+        end_time = now.replace(minute=0, second=0, microsecond=0)
+        if now - end_time < timedelta(seconds=30):
+            # The endpoint requires end_time to be a little in the past
+            end_time -= timedelta(hours=1)
+        return end_time
+
     async def get_entity_velocity(self, entity: str) -> Dict[str, Any]:
+        """
+        Calculate mention velocity for an entity, at most once per window fleet-wide
+
+        Results are cached in Redis per hourly window. Concurrent lookups
+        for the same entity in this process share one in-flight request, and
+        a short Redis lock makes other workers wait for that result instead
+        of fetching it again.
+
+        When the stream monitor has been counting the entity for the whole
+        window, the velocity is answered from its Redis counters without any
+        API call.
+
+        Args:
+            entity: The entity name
+
+        Returns:
+            Dictionary with velocity metrics
+        """
+        end_time = self.counts_end_time()
+
+        if self.stream_counters_enabled:
+            try:
+                if await mention_counters.covers(entity, end_time - timedelta(hours=24)):
+                    velocity = self.velocity_from_hourly_counts(
+                        entity,
+                        await mention_counters.hourly_counts(entity, end_time, hours=24)
+                    )
+                    velocity["mentions_last_60m"] = await mention_counters.recent_count(entity, minutes=60)
+                    velocity["source"] = "stream"
+                    return velocity
+            except Exception as e:
+                print(f"Error reading mention counters for {entity}: {e}")
+
+        key = f"{self.velocity_key_prefix}{end_time:%Y%m%d%H}:{entity.lower()}"
+
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight.get_loop() is not asyncio.get_running_loop():
+            inflight = asyncio.create_task(self._get_cached_velocity(key, entity))
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield so one caller being cancelled does not cancel the shared fetch
+        return await asyncio.shield(inflight)
+
+    async def _get_cached_velocity(self, key: str, entity: str) -> Dict[str, Any]:
+        """Read the velocity from Redis, or fetch it under a fleet-wide lock"""
+        try:
+            client = get_redis()
+
+            cached = await client.get(key)
+            if cached:
+                return json.loads(cached)
+
+            token = uuid4().hex
+            acquired = await client.set(f"{key}:lock", token, nx=True, ex=self.velocity_lock_seconds)
+            if not acquired:
+                # Another worker is fetching it; wait for its result
+                deadline = time.monotonic() + self.velocity_lock_seconds
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(0.25)
+                    cached = await client.get(key)
+                    if cached:
+                        return json.loads(cached)
+                    if not await client.exists(f"{key}:lock"):
+                        break
+        except Exception as e:
+            print(f"Error reading velocity cache: {e}")
+            return await self._fetch_entity_velocity(entity)
+
+        try:
+            velocity = await self._fetch_entity_velocity(entity)
+            await client.set(key, json.dumps(velocity), ex=self.velocity_cache_ttl)
+        finally:
+            # A waiter that gave up fetches without the lock, so it has none to release
+            if acquired:
+                try:
+                    await client.eval(RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+                except Exception as e:
+                    print(f"Error releasing velocity lock: {e}")
+
+        return velocity
+
+    async def _fetch_entity_velocity(self, entity: str) -> Dict[str, Any]:
         """
         Calculate mention velocity (change in mention rate) for an entity
 
+        All windows are derived from a single 24-bucket hourly histogram.
+
         Args:
             entity: The entity name
 
         Returns:
             Dictionary with velocity metrics
         """
-        # Get counts for different time windows
-        last_hour = await self.get_entity_mention_count(entity, hours=1)
-        last_6_hours = await self.get_entity_mention_count(entity, hours=6)
-        last_24_hours = await self.get_entity_mention_count(entity, hours=24)
+        hourly_counts = await self.get_entity_hourly_counts(entity, hours=24)
+        velocity = self.velocity_from_hourly_counts(entity, hourly_counts)
+        velocity["source"] = "api"
+        return velocity
+
+    def velocity_from_hourly_counts(self, entity: str, hourly_counts: List[int]) -> Dict[str, Any]:
+        """Derive all windows and the velocity score from a 24-bucket hourly histogram"""
+        # Sum the windows from the most recent buckets
+        last_hour = hourly_counts[-1]
+        last_6_hours = sum(hourly_counts[-6:])
+        last_24_hours = sum(hourly_counts)
 
         # Calculate rates per hour
         rate_1h = last_hour
@@ -92,55 +320,133 @@ class XAPIClient:
             "rate_per_hour_24h": rate_24h,
             "velocity_score": velocity_score,
             "is_trending": velocity_score > 2.0,  # More than 2x normal rate
+            "hourly_counts": hourly_counts,
             "timestamp": datetime.utcnow().isoformat()
         }
 
-    async def get_trending_topics(self, woeid: int = 1) -> List[Dict[str, Any]]:
+    async def get_trending_topics(self, woeid: int = 1, max_trends: int = 20) -> List[Dict[str, Any]]:
         """
-        Get trending topics (requires API v1.1, included for completeness)
+        Get trending topics for a location
 
         Args:
             woeid: Where On Earth ID (1 = worldwide)
+            max_trends: Maximum number of trends to return (1-50)
 
         Returns:
-            List of trending topics
+            List of trending topics with name and tweet_count (None when X
+            does not report a count)
         """
         try:
-            # Note: This requires API v1.1 which may need additional setup
-            # This is a placeholder for the structure
-            trends = []
-            # In production, implement using tweepy.API with v1.1 endpoints
-            return trends
+            data = await self._get(
+                f"/trends/by/woeid/{woeid}",
+                params={"max_trends": max(1, min(max_trends, 50))}
+            )
+            return [
+                {"name": trend["trend_name"], "tweet_count": trend.get("tweet_count")}
+                for trend in data.get("data", [])
+            ]
         except Exception as e:
             print(f"Error fetching trending topics: {e}")
             return []
 
-    async def monitor_entity_mentions(self, entity: str, callback=None) -> None:
+    async def monitor_entity_mentions(
+        self,
+        entities: List[str],
+        callback: Callable[[Dict[str, Any]], Awaitable[None]]
+    ) -> None:
         """
-        Set up a filtered stream to monitor entity mentions in real-time
+        Consume the filtered stream for mentions of entities in real time
+
+        Replaces this app's stream rules with rules matching the entities,
+        then calls `callback` with each matching tweet. Runs until cancelled,
+        retrying the rule sync and reconnecting with exponential backoff.
 
         Args:
-            entity: The entity to monitor
-            callback: Callback function to handle new mentions
+            entities: The entities to monitor, highest priority first (the
+                rule limits may not fit them all)
+            callback: Async callback receiving each tweet (with text and created_at)
 
         Note: This requires maintaining a persistent connection.
         In production, this should run in a separate worker process.
         """
-        # This is a placeholder for filtered stream implementation
-        # In production, use tweepy.StreamingClient with filters
-        pass
+        rules_synced = False
+        backoff = 1.0
+        while True:
+            try:
+                if not rules_synced:
+                    await self._sync_stream_rules(entities)
+                    rules_synced = True
+
+                async with self._get_client().stream(
+                    "GET",
+                    "/tweets/search/stream",
+                    params={"tweet.fields": "created_at"},
+                    # The stream sends a keep-alive newline every 20 seconds
+                    timeout=httpx.Timeout(self.timeout.connect, read=60.0)
+                ) as response:
+                    self._record_rate_limit(response)
+                    response.raise_for_status()
+                    backoff = 1.0
+
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        tweet = json.loads(line).get("data")
+                        if tweet:
+                            await callback(tweet)
+            except (httpx.HTTPError, json.JSONDecodeError) as e:
+                print(f"Mention stream failed, retrying in {backoff:.0f}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 300.0)
+
+    async def _sync_stream_rules(self, entities: List[str]):
+        """
+        Replace this app's filtered stream rules with OR-ed entity rules
+
+        Entities are packed in priority order into at most stream_max_rules
+        rules of at most stream_rule_max_length characters; the lowest
+        priority entities that do not fit are left unmonitored.
+
+        Args:
+            entities: The entities to monitor, highest priority first
+        """
+        client = self._get_client()
+
+        existing = (await self._get("/tweets/search/stream/rules", params={})).get("data", [])
+        ids = [rule["id"] for rule in existing if rule.get("tag", "").startswith(self.stream_rule_tag)]
+        if ids:
+            response = await client.post("/tweets/search/stream/rules", json={"delete": {"ids": ids}})
+            response.raise_for_status()
+
+        # Pack each quoted entity into the first rule with room for it, opening
+        # a new rule while the rule count limit allows
+        rules: List[str] = []
+        dropped = 0
+        for entity in dict.fromkeys(entities):
+            term = f'"{entity}"'
+            for i, rule in enumerate(rules):
+                if len(rule) + len(term) + 4 <= self.stream_rule_max_length:
+                    rules[i] = f"{rule} OR {term}"
+                    break
+            else:
+                if len(rules) < self.stream_max_rules and len(term) <= self.stream_rule_max_length:
+                    rules.append(term)
+                else:
+                    dropped += 1
+
+        if dropped:
+            print(f"Stream rule limits reached, not monitoring {dropped} lowest priority entities")
+
+        if rules:
+            response = await client.post(
+                "/tweets/search/stream/rules",
+                json={"add": [{"value": rule, "tag": f"{self.stream_rule_tag}:{i}"} for i, rule in enumerate(rules)]}
+            )
+            response.raise_for_status()
 
     def check_rate_limit_status(self) -> Dict[str, Any]:
-        """Check current rate limit status"""
-        try:
-            rate_limit = self.client.get_users_mentions
-            # Return rate limit info
-            return {
-                "remaining": "check_response_headers",
-                "reset_time": "check_response_headers"
-            }
-        except Exception as e:
-            return {"error": str(e)}
+        """Check current rate limit status, as reported by the latest response"""
+        return dict(self.rate_limit)
 
 
 # Singleton instance
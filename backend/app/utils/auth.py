@@ -4,7 +4,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.config import settings
 from app.models.user import TokenData
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, status, WebSocket
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 # Password hashing
@@ -113,6 +113,27 @@ async def get_current_user(
     return token_data
 
 
+async def get_websocket_user(websocket: WebSocket) -> Optional[TokenData]:
+    """
+    Get the authenticated user of a WebSocket connection
+
+    Browsers cannot set headers on WebSocket requests, so the JWT may be
+    sent either as a Bearer Authorization header or as a `token` query
+    parameter.
+
+    Args:
+        websocket: The WebSocket connection
+
+    Returns:
+        TokenData of the user, or None if authentication fails
+    """
+    scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = websocket.query_params.get("token", "")
+
+    return decode_access_token(token) if token else None
+
+
 async def require_role(required_role: str):
     """
     Dependency factory to require a specific user role
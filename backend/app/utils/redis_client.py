@@ -0,0 +1,36 @@
+import redis.asyncio as redis
+from typing import Optional
+from app.config import settings
+import asyncio
+
+_client: Optional[redis.Redis] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Get the shared async Redis client for the running event loop
+
+    Async Redis connections are tied to the loop that opened them, so the
+    client is recreated whenever the running loop changes. Worker processes
+    keep one loop (see app.workers.runtime), so there it lives as long as
+    the process.
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = redis.from_url(settings.REDIS_URL)
+        _client_loop = loop
+
+    return _client
+
+
+async def close_redis():
+    """Close the shared async Redis client"""
+    global _client, _client_loop
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
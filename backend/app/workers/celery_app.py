@@ -1,4 +1,5 @@
 from celery import Celery
+from celery.signals import celeryd_init
 from app.config import settings
 
 # Initialize Celery app
@@ -27,11 +28,54 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
-# Task routing (optional - for advanced setups with multiple queues)
+# Async execution: tasks are I/O-bound and run on the process event loop
+# (app.workers.runtime), so pool threads only wait on it. Each async worker
+# consumes one queue (WORKER_QUEUE) with that queue's concurrency, so a
+# backlog on one queue never occupies the threads of another. Prefetch is
+# one message per slot.
+if settings.WORKER_POOL == "async" and settings.WORKER_QUEUE in settings.WORKER_QUEUE_CONCURRENCY:
+    celery_app.conf.update(
+        worker_pool="threads",
+        worker_concurrency=settings.WORKER_QUEUE_CONCURRENCY[settings.WORKER_QUEUE],
+        worker_prefetch_multiplier=1,
+    )
+
+# Task routing, by task name
 celery_app.conf.task_routes = {
-    "app.workers.extraction_worker.*": {"queue": "extraction"},
-    "app.workers.retrieval_worker.*": {"queue": "retrieval"},
-    "app.workers.decay_worker.*": {"queue": "decay"}
+    "extract_claims_from_article": {"queue": "extraction"},
+    "batch_extract_*": {"queue": "extraction"},
+    "run_adversarial_retrieval": {"queue": "retrieval"},
+    "batch_adversarial_retrieval": {"queue": "retrieval"},
+    "contradiction_sweep": {"queue": "retrieval"},
+    "calculate_decay_score": {"queue": "decay"},
+    "batch_calculate_decay": {"queue": "decay"},
+    "refresh_all_decay_scores": {"queue": "decay"},
+    "rescore_entity_claims": {"queue": "decay"}
+}
+
+
+@celeryd_init.connect
+def check_worker_queues(options, **kwargs):
+    """Refuse to start an async worker that is not bound to exactly its one queue"""
+    if settings.WORKER_POOL != "async":
+        return
+
+    queues = options.get("queues") or []
+    if isinstance(queues, str):
+        queues = queues.split(",")
+
+    if settings.WORKER_QUEUE not in settings.WORKER_QUEUE_CONCURRENCY or list(queues) != [settings.WORKER_QUEUE]:
+        raise ValueError(
+            "An async worker consumes one queue: set WORKER_QUEUE to one of "
+            f"{sorted(settings.WORKER_QUEUE_CONCURRENCY)} and start it with -Q <that queue>"
+        )
+
+# Periodic tasks (run with `celery -A app.workers.celery_app beat`)
+celery_app.conf.beat_schedule = {
+    "refresh-due-decay-scores": {
+        "task": "refresh_all_decay_scores",
+        "schedule": settings.DECAY_REFRESH_TICK_SECONDS
+    }
 }
 
 
@@ -1,9 +1,14 @@
 from app.workers.celery_app import celery_app
+from app.workers.runtime import worker_runtime
 from app.services.decay_forecaster import decay_forecaster
 from app.services.neo4j_client import neo4j_client
+from app.services.decay_scheduler import decay_scheduler
+from app.models.claim import ClaimNode
+from app.config import settings
 from uuid import UUID
-from typing import List
-import asyncio
+from typing import List, Dict, Any, Tuple, Optional
+import random
+import time
 
 
 @celery_app.task(bind=True, name="calculate_decay_score")
@@ -15,7 +20,7 @@ def calculate_decay_task(self, claim_id: str, check_trending: bool = True):
         claim_id: UUID of the claim as string
         check_trending: Whether to check X API for trending signals
     """
-    return asyncio.run(calculate_decay_async(self, claim_id, check_trending))
+    return worker_runtime.run(calculate_decay_async(worker_runtime.handle(self), claim_id, check_trending))
 
 
 async def calculate_decay_async(task, claim_id: str, check_trending: bool):
@@ -24,8 +29,6 @@ async def calculate_decay_async(task, claim_id: str, check_trending: bool):
     try:
         task.update_state(state="PROGRESS", meta={"progress": 0, "status": "Fetching claim"})
 
-        await neo4j_client.connect()
-
         # Get claim from Neo4j
         claim = await neo4j_client.get_claim_by_id(UUID(claim_id))
 
@@ -34,24 +37,12 @@ async def calculate_decay_async(task, claim_id: str, check_trending: bool):
 
         task.update_state(state="PROGRESS", meta={"progress": 30, "status": "Calculating decay"})
 
-        # Calculate decay score
-        decay_score, half_life_days = await decay_forecaster.calculate_decay_score(
-            claim_text=claim.text,
-            is_immutable=claim.is_immutable,
-            extracted_at=claim.extracted_at,
+        # Calculate decay score and update it in Neo4j
+        scores = await score_and_store_decay(
+            await decay_inputs([claim], check_trending),
             check_trending=check_trending
         )
-
-        task.update_state(state="PROGRESS", meta={"progress": 70, "status": "Updating database"})
-
-        # Update in Neo4j
-        await neo4j_client.update_decay_score(
-            claim_id=UUID(claim_id),
-            decay_score=decay_score,
-            half_life_days=half_life_days
-        )
-
-        await neo4j_client.close()
+        decay_score, half_life_days = scores[0]
 
         return {
             "claim_id": claim_id,
@@ -78,92 +69,298 @@ def batch_calculate_decay_task(claim_ids: List[str], check_trending: bool = Fals
         claim_ids: List of claim UUIDs as strings
         check_trending: Whether to check trending (slower)
     """
-    return asyncio.run(batch_calculate_decay_async(claim_ids, check_trending))
+    return worker_runtime.run(batch_calculate_decay_async(claim_ids, check_trending))
 
 
 async def batch_calculate_decay_async(claim_ids: List[str], check_trending: bool):
     """Async batch decay calculation"""
 
-    await neo4j_client.connect()
-
-    results = []
+    try:
+        # Fetch every claim in one query
+        claims = await neo4j_client.get_claims_by_ids([UUID(claim_id) for claim_id in claim_ids])
+        found = [claims[claim_id] for claim_id in claim_ids if claim_id in claims]
 
-    for claim_id in claim_ids:
-        try:
-            # Get claim
-            claim = await neo4j_client.get_claim_by_id(UUID(claim_id))
+        # Score all claims in one vectorized pass and write them back in one query
+        scores = await score_and_store_decay(
+            await decay_inputs(found, check_trending),
+            check_trending=check_trending
+        )
 
-            if not claim:
+        scored = {
+            str(claim.id): (decay_score, half_life_days)
+            for claim, (decay_score, half_life_days) in zip(found, scores)
+        }
+        results = []
+        for claim_id in claim_ids:
+            if claim_id in scored:
+                decay_score, half_life_days = scored[claim_id]
+                results.append({
+                    "claim_id": claim_id,
+                    "status": "completed",
+                    "decay_score": decay_score,
+                    "half_life_days": half_life_days
+                })
+            else:
                 results.append({
                     "claim_id": claim_id,
                     "status": "error",
                     "error": "Claim not found"
                 })
-                continue
 
-            # Calculate decay
-            decay_score, half_life_days = await decay_forecaster.calculate_decay_score(
-                claim_text=claim.text,
-                is_immutable=claim.is_immutable,
-                extracted_at=claim.extracted_at,
-                check_trending=check_trending
-            )
+    except Exception as e:
+        results = [
+            {"claim_id": claim_id, "status": "error", "error": str(e)}
+            for claim_id in claim_ids
+        ]
 
-            # Update in Neo4j
-            await neo4j_client.update_decay_score(
-                claim_id=UUID(claim_id),
-                decay_score=decay_score,
-                half_life_days=half_life_days
-            )
+    return {
+        "status": "completed",
+        "processed": len(claim_ids),
+        "results": results
+    }
+
+
+@celery_app.task(name="refresh_all_decay_scores")
+def refresh_all_decay_scores_task(check_trending: bool = True):
+    """
+    Periodic task to refresh decay scores for claims that are due
+
+    Run frequently by Celery beat (every DECAY_REFRESH_TICK_SECONDS). Each
+    tick only re-scores claims whose half-life-based due time has passed.
+
+    Args:
+        check_trending: Whether to check X API for trending signals
+    """
+    return worker_runtime.run(refresh_all_decay_scores_async(check_trending))
+
+
+async def refresh_all_decay_scores_async(
+    check_trending: bool = True,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None
+):
+    """Async refresh of due decay scores, in bounded batches"""
+
+    batch_size = batch_size or settings.DECAY_REFRESH_BATCH_SIZE
+    max_batches = max_batches or settings.DECAY_REFRESH_MAX_BATCHES
+
+    seeded = 0
+    refreshed = 0
+    batches = 0
 
-            results.append({
-                "claim_id": claim_id,
-                "status": "completed",
-                "decay_score": decay_score,
-                "half_life_days": half_life_days
-            })
+    # First run (or Redis was flushed): put every claim on the schedule.
+    # Not keyed on an empty schedule, since ingestion may have added claims first.
+    if not await decay_scheduler.is_seeded():
+        seeded = await seed_decay_schedule()
+        await decay_scheduler.mark_seeded()
 
-        except Exception as e:
-            results.append({
-                "claim_id": claim_id,
-                "status": "error",
-                "error": str(e)
-            })
+    while batches < max_batches:
+        claim_ids = await decay_scheduler.pop_due(batch_size)
+        if not claim_ids:
+            break
 
-    await neo4j_client.close()
+        try:
+            claims = await neo4j_client.get_claims_by_ids([UUID(claim_id) for claim_id in claim_ids])
+            found = list(claims.values())
+
+            scores = await score_and_store_decay(
+                await decay_inputs(found, check_trending),
+                check_trending=check_trending
+            )
+        except Exception:
+            # Put the batch back so the next tick retries it
+            await decay_scheduler.schedule([(claim_id, time.time()) for claim_id in claim_ids])
+            raise
+
+        # Deleted claims are simply not rescheduled
+        now = time.time()
+        await decay_scheduler.schedule([
+            (
+                str(claim.id),
+                decay_scheduler.next_due(half_life_days, trending=_is_trending(claim.is_immutable, half_life_days), now=now)
+            )
+            for claim, (_, half_life_days) in zip(found, scores)
+        ])
+
+        refreshed += len(found)
+        batches += 1
 
     return {
         "status": "completed",
-        "processed": len(claim_ids),
-        "results": results
+        "seeded": seeded,
+        "refreshed": refreshed,
+        "batches": batches
     }
 
 
-@celery_app.task(name="refresh_all_decay_scores")
-def refresh_all_decay_scores_task():
+@celery_app.task(name="rescore_entity_claims")
+def rescore_entity_claims_task(entity: str):
     """
-    Periodic task to refresh decay scores for all mutable claims
+    Re-score every mutable claim that mentions an entity
+
+    Queued when an entity starts trending, so its claims pick up the
+    velocity boost right away instead of at their next scheduled refresh.
 
-    This should be run as a scheduled task (e.g., daily)
+    Args:
+        entity: The entity name
     """
-    return asyncio.run(refresh_all_decay_scores_async())
+    return worker_runtime.run(rescore_entity_claims_async(entity))
+
+
+async def rescore_entity_claims_async(entity: str, batch_size: Optional[int] = None):
+    """Async re-score of an entity's claims, in bounded batches"""
+
+    batch_size = batch_size or settings.DECAY_REFRESH_BATCH_SIZE
+
+    refreshed = 0
+    after_id = None
 
+    while True:
+        claim_ids = await neo4j_client.get_claim_ids_by_entity(entity, after_id=after_id, limit=batch_size)
+        if not claim_ids:
+            break
 
-async def refresh_all_decay_scores_async():
-    """Async refresh all decay scores"""
+        claims = await neo4j_client.get_claims_by_ids([UUID(claim_id) for claim_id in claim_ids])
+        found = list(claims.values())
 
-    await neo4j_client.connect()
+        # The boost is recomputed over each claim's own entities, as a scheduled
+        # refresh would, so another trending entity's boost is not overwritten.
+        # The trigger entity goes first so it is always among those checked;
+        # the others' velocities are mostly served from the stream counters
+        # or the hourly velocity cache.
+        inputs = [
+            {**claim, "entities": [entity] + [name for name in claim["entities"] if name.lower() != entity.lower()]}
+            for claim in await decay_inputs(found, True)
+        ]
+        scores = await score_and_store_decay(inputs, check_trending=True)
 
-    # This would get all mutable claims from Neo4j
-    # For now, returning a placeholder
-    # In production:
-    # claims = await neo4j_client.get_all_mutable_claims()
-    # for claim in claims:
-    #     calculate_decay_task.delay(str(claim.id), check_trending=True)
+        now = time.time()
+        await decay_scheduler.schedule([
+            (
+                str(claim.id),
+                decay_scheduler.next_due(half_life_days, trending=_is_trending(claim.is_immutable, half_life_days), now=now)
+            )
+            for claim, (_, half_life_days) in zip(found, scores)
+        ])
+
+        refreshed += len(found)
+        after_id = claim_ids[-1]
 
-    await neo4j_client.close()
+        if len(claim_ids) < batch_size:
+            break
 
     return {
-        "status": "scheduled",
-        "message": "Decay refresh tasks queued"
+        "entity": entity,
+        "status": "completed",
+        "refreshed": refreshed
     }
+
+
+async def seed_decay_schedule(page_size: int = 5000) -> int:
+    """
+    Add every claim not yet on the refresh schedule
+
+    Due times are spread uniformly over each claim's first refresh interval
+    so seeding a large graph does not make everything due at once.
+
+    Returns:
+        Number of claims seen
+    """
+    seen = 0
+    after_id = None
+
+    while True:
+        claims = await neo4j_client.get_decay_inputs(after_id=after_id, limit=page_size, mutable_only=False)
+        if not claims:
+            break
+
+        now = time.time()
+        await decay_scheduler.schedule(
+            [
+                (
+                    claim["claim_id"],
+                    now + random.uniform(0, decay_scheduler.next_due(
+                        claim["half_life_days"],
+                        trending=_is_trending(claim["is_immutable"], claim["half_life_days"]),
+                        now=0
+                    ))
+                )
+                for claim in claims
+            ],
+            only_new=True
+        )
+
+        seen += len(claims)
+        after_id = claims[-1]["claim_id"]
+
+        if len(claims) < page_size:
+            break
+
+    return seen
+
+
+async def decay_inputs(claims: List[ClaimNode], check_trending: bool) -> List[Dict[str, Any]]:
+    """Claim dicts for decay scoring, with stored entities when trending is checked"""
+    entities = {}
+    if check_trending:
+        entities = await neo4j_client.get_claim_entities([claim.id for claim in claims])
+
+    return [
+        {
+            "claim_id": claim.id,
+            "text": claim.text,
+            "is_immutable": claim.is_immutable,
+            "extracted_at": claim.extracted_at,
+            "entities": entities.get(str(claim.id), [])
+        }
+        for claim in claims
+    ]
+
+
+def _is_trending(is_immutable: bool, half_life_days: int) -> bool:
+    """Trending mutable claims have their half-life cut below the base"""
+    return not is_immutable and half_life_days < decay_forecaster.base_half_life_mutable
+
+
+async def score_and_store_decay(
+    claims: List[Dict[str, Any]],
+    check_trending: bool
+) -> List[Tuple[float, int]]:
+    """
+    Score claims in one vectorized pass and write the results in one query
+
+    In lazy decay mode only the time-independent components are stored and
+    the age term is added at read time; otherwise the full score is stored.
+
+    Args:
+        claims: Dicts with claim_id, text, is_immutable and extracted_at
+        check_trending: Whether to check X API for trending signals
+
+    Returns:
+        (decay_score, half_life_days) per claim, as of now
+    """
+    if not neo4j_client.lazy_decay:
+        scores = await decay_forecaster.batch_calculate_decay(claims, check_trending=check_trending)
+        await neo4j_client.update_decay_scores([
+            {"claim_id": claim["claim_id"], "decay_score": decay_score, "half_life_days": half_life_days}
+            for claim, (decay_score, half_life_days) in zip(claims, scores)
+        ])
+        return scores
+
+    components = await decay_forecaster.batch_calculate_decay_components(claims, check_trending=check_trending)
+    await neo4j_client.update_decay_components([
+        {
+            "claim_id": claim["claim_id"],
+            "base_decay_score": base_decay_score,
+            "velocity_boost": velocity_boost,
+            "half_life_days": half_life_days
+        }
+        for claim, (base_decay_score, velocity_boost, half_life_days) in zip(claims, components)
+    ])
+
+    decay_scores, half_life_days = decay_forecaster.calculate_decay_scores(
+        extracted_at=[claim["extracted_at"] for claim in claims],
+        is_immutable=[claim["is_immutable"] for claim in claims],
+        velocity_boosts=[velocity_boost for _, velocity_boost, _ in components]
+    )
+    return list(zip(decay_scores.tolist(), half_life_days.tolist()))
@@ -1,128 +1,384 @@
 from app.workers.celery_app import celery_app
-from app.services.grok_client import grok_client
-from app.services.neo4j_client import neo4j_client
-from app.services.qdrant_client import qdrant_service
-from app.services.embedding_service import embedding_service
-from app.models.claim import ClaimNode
-from typing import Dict, Any
-import asyncio
+from app.workers.runtime import worker_runtime
+from app.config import settings
+from app.services.extraction_pipeline import extraction_pipeline
+from app.services.job_tracker import job_tracker
+from app.services.batch_ingest import batch_ingest
+from app.workers.decay_worker import batch_calculate_decay_task
+from app.workers.retrieval_worker import batch_adversarial_retrieval_task
+from celery import chord
+from uuid import uuid4
+from typing import Dict, Any, List, Optional, Tuple
 
 
-@celery_app.task(bind=True, name="extract_claims_from_article")
+@celery_app.task(bind=True, name="extract_claims_from_article", max_retries=settings.EXTRACTION_MAX_RETRIES)
 def extract_claims_task(self, article_data: Dict[str, Any], job_id: str):
     """
     Celery task to extract claims from an article
 
+    A failed attempt is retried with the same job ID, and resumes from the
+    stages it checkpointed. Once retries run out (including an attempt cut
+    off by a soft time limit) the job is reported as failed in the result,
+    so a batch chord waiting on this article still completes.
+
     Args:
         article_data: Dictionary containing article_id, title, content, source_urls
-        job_id: Job ID for status tracking
+        job_id: Job ID for status tracking (and the extraction checkpoint)
     """
-    return asyncio.run(extract_claims_async(self, article_data, job_id))
+    try:
+        return worker_runtime.run(
+            extract_claims_async(
+                worker_runtime.handle(self),
+                article_data,
+                job_id,
+                final_attempt=self.request.retries >= self.max_retries
+            )
+        )
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e, countdown=settings.EXTRACTION_RETRY_DELAY_SECONDS)
+        return worker_runtime.run(fail_extraction_async(worker_runtime.handle(self), job_id, e))
 
 
-async def extract_claims_async(task, article_data: Dict[str, Any], job_id: str):
-    """Async implementation of claim extraction"""
+async def extract_claims_async(task, article_data: Dict[str, Any], job_id: str, final_attempt: bool = True):
+    """
+    Async implementation of claim extraction
+
+    Raises the error on a failed attempt that is not final_attempt, so the
+    task retries it; the final attempt records the job as failed instead.
+    """
+
+    async def report_progress(stats: Dict[str, int]):
+        # Extraction is 30% of the bar; storing, embedding and indexing the
+        # claims extracted so far is the other 50%. Throttled by the tracker.
+        extracted = stats["chunks_extracted"] / stats["chunks"]
+        indexed = stats["claims_indexed"] / stats["claims_extracted"] if stats["claims_extracted"] else 0.0
+        await job_tracker.update(
+            job_id,
+            progress=10 + int(30 * extracted + 50 * extracted * indexed),
+            message=(
+                f"Extracted {stats['chunks_extracted']}/{stats['chunks']} chunks, "
+                f"indexed {stats['claims_indexed']}/{stats['claims_extracted']} claims"
+            )
+        )
 
     try:
         # Update job status to processing
-        task.update_state(state="PROGRESS", meta={"progress": 0, "status": "Starting extraction"})
+        await job_tracker.update(job_id, status="processing", progress=10, message="Extracting claims with Grok")
 
-        # Extract claims using Grok API
-        task.update_state(state="PROGRESS", meta={"progress": 10, "status": "Extracting claims with Grok"})
+        # Extract with Grok, store in Neo4j, embed and index, as overlapping stages
+        result = await extraction_pipeline.run(article_data, progress_callback=report_progress, job_id=job_id)
 
-        claims = await grok_client.extract_claims(
-            article_text=article_data["content"],
-            article_id=article_data["article_id"],
-            source_urls=article_data.get("source_urls", [])
+        summary = {
+            "job_id": job_id,
+            "status": "completed",
+            "claims_extracted": result["claims_extracted"],
+            "claim_ids": result["claim_ids"]
+        }
+        await job_tracker.update(
+            job_id,
+            status="completed",
+            progress=100,
+            message=f"Extracted {result['claims_extracted']} claims",
+            result=summary
         )
+        try:
+            await extraction_pipeline.clear_checkpoint(job_id)
+        except Exception as checkpoint_error:
+            # The checkpoint expires on its own; the job already completed
+            print(f"Error clearing job {job_id} checkpoint: {checkpoint_error}")
 
-        task.update_state(state="PROGRESS", meta={"progress": 40, "status": f"Extracted {len(claims)} claims"})
-
-        # Create claim nodes in Neo4j
-        claim_nodes = []
-        for i, claim_create in enumerate(claims):
-            # Create ClaimNode
-            claim_node = ClaimNode(
-                text=claim_create.text,
-                source_url=claim_create.source_url,
-                article_id=claim_create.article_id,
-                is_immutable=claim_create.is_immutable,
-                language=claim_create.language
-            )
+        # Return success
+        return summary
 
-            # Store in Neo4j
-            await neo4j_client.create_claim_node(claim_node)
-            claim_nodes.append(claim_node)
+    except Exception as e:
+        if not final_attempt:
+            try:
+                await job_tracker.update(job_id, status="processing", message=f"Retrying after error: {e}")
+            except Exception as tracker_error:
+                print(f"Error recording job {job_id} retry: {tracker_error}")
+            raise
 
-            progress = 40 + int((i / len(claims)) * 30)
-            task.update_state(
-                state="PROGRESS",
-                meta={"progress": progress, "status": f"Storing claims in graph ({i+1}/{len(claims)})"}
-            )
+        return await fail_extraction_async(task, job_id, e)
 
-        task.update_state(state="PROGRESS", meta={"progress": 70, "status": "Generating embeddings"})
 
-        # Generate embeddings and store in Qdrant
-        await qdrant_service.connect()
+async def fail_extraction_async(task, job_id: str, error: Exception) -> Dict[str, Any]:
+    """Record an extraction job as failed and build its failed result"""
+    task.update_state(state="FAILURE", meta={"error": str(error)})
+    try:
+        await job_tracker.update(job_id, status="failed", error=str(error))
+    except Exception as tracker_error:
+        print(f"Error recording job {job_id} failure: {tracker_error}")
+    return {
+        "job_id": job_id,
+        "status": "failed",
+        "error": str(error)
+    }
 
-        for i, claim_node in enumerate(claim_nodes):
-            # Generate embedding
-            embedding = await embedding_service.embed_claim(claim_node.text)
 
-            # Store in Qdrant
-            await qdrant_service.upsert_claim_embedding(
-                claim_id=claim_node.id,
-                embedding=embedding,
-                article_id=claim_node.article_id,
-                language=claim_node.language,
-                source_url=claim_node.source_url,
-                extracted_at=claim_node.extracted_at
-            )
+@celery_app.task(name="batch_extract_claims")
+def batch_extract_claims_task(
+    articles: Optional[List[Dict[str, Any]]] = None,
+    batch_id: Optional[str] = None,
+    max_in_flight: Optional[int] = None,
+    chain_decay: bool = False,
+    chain_retrieval: bool = False
+):
+    """
+    Extract claims from many articles as one tracked, throttled workflow
 
-            progress = 70 + int((i / len(claim_nodes)) * 20)
-            task.update_state(
-                state="PROGRESS",
-                meta={"progress": progress, "status": f"Generating embeddings ({i+1}/{len(claim_nodes)})"}
-            )
+    Articles are dispatched in waves of max_in_flight. Each wave is a chord
+    whose callback records the wave's results and dispatches the next one.
+    Once every article is done, decay scoring and adversarial retrieval for
+    all new claims can be chained as one more chord, and the batch job
+    completes with a summary of the whole import.
 
-        await qdrant_service.close()
+    Args:
+        articles: List of article dictionaries (omit if already staged under batch_id)
+        batch_id: Batch ID, also its job ID (generated if not given)
+        max_in_flight: Articles extracted at once (defaults to BATCH_EXTRACTION_MAX_IN_FLIGHT)
+        chain_decay: Score decay for all new claims at the end
+        chain_retrieval: Run adversarial retrieval for all new claims at the end
+    """
+    batch_id = batch_id or str(uuid4())
 
-        task.update_state(state="PROGRESS", meta={"progress": 90, "status": "Finalizing"})
+    wave, total = worker_runtime.run(
+        start_batch_async(batch_id, articles, max_in_flight, chain_decay, chain_retrieval)
+    )
 
-        # Return success
-        return {
-            "job_id": job_id,
-            "status": "completed",
-            "claims_extracted": len(claims),
-            "claim_ids": [str(c.id) for c in claim_nodes]
-        }
+    if wave:
+        _dispatch_wave(batch_id, wave)
+    else:
+        worker_runtime.run(complete_batch_async(batch_id, []))
 
-    except Exception as e:
-        task.update_state(state="FAILURE", meta={"error": str(e)})
-        return {
-            "job_id": job_id,
-            "status": "failed",
-            "error": str(e)
-        }
+    return {
+        "batch_id": batch_id,
+        "status": "queued",
+        "count": total
+    }
 
 
-@celery_app.task(name="batch_extract_claims")
-def batch_extract_claims_task(articles: list[Dict[str, Any]]):
+async def start_batch_async(
+    batch_id: str,
+    articles: Optional[List[Dict[str, Any]]],
+    max_in_flight: Optional[int],
+    chain_decay: bool,
+    chain_retrieval: bool
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Stage the batch (unless the API already did) and take its first wave"""
+    if articles is not None:
+        await job_tracker.create(batch_id)
+        await batch_ingest.stage(batch_id, articles, max_in_flight, chain_decay, chain_retrieval)
+
+    options = await batch_ingest.options(batch_id)
+    total = (await batch_ingest.counters(batch_id))["total"]
+
+    await job_tracker.update(
+        batch_id,
+        status="processing",
+        progress=0,
+        message=f"Extracting claims from {total} articles"
+    )
+
+    return await batch_ingest.next_wave(batch_id, options["max_in_flight"]), total
+
+
+@celery_app.task(name="batch_extract_wave_done")
+def batch_extract_wave_done_task(results: List[Dict[str, Any]], batch_id: str):
     """
-    Extract claims from multiple articles in batch
+    Chord callback for one wave of a batch import
+
+    Records the wave's results, then dispatches the next wave, the chained
+    follow-up work, or the batch completion.
 
     Args:
-        articles: List of article dictionaries
+        results: extract_claims_task results for the wave
+        batch_id: The batch
+    """
+    return _advance_batch(batch_id, results)
+
+
+@celery_app.task(name="batch_extract_wave_failed")
+def batch_extract_wave_failed_task(request, exc, traceback, batch_id: str, job_ids: List[str]):
     """
+    Chord error callback for one wave of a batch import
+
+    Runs when a wave's chord fails instead of calling batch_extract_wave_done
+    (an extraction killed by a hard time limit or a lost worker). Celery calls
+    it inline wherever the failure is noticed, so it only queues the recovery.
+
+    Args:
+        request: The failed task's request
+        exc: Why the chord failed
+        traceback: The failure's traceback
+        batch_id: The batch
+        job_ids: The wave's extraction job IDs
+    """
+    batch_extract_wave_recover_task.delay(batch_id, job_ids, str(exc))
+
+
+@celery_app.task(name="batch_extract_wave_recover")
+def batch_extract_wave_recover_task(batch_id: str, job_ids: List[str], error: str):
+    """
+    Record a failed wave from its job statuses and carry on with the batch
+
+    Args:
+        batch_id: The batch
+        job_ids: The wave's extraction job IDs
+        error: Why the wave's chord failed
+    """
+    results = worker_runtime.run(wave_results_async(job_ids, error))
+    return _advance_batch(batch_id, results)
+
+
+async def wave_results_async(job_ids: List[str], error: str) -> List[Dict[str, Any]]:
+    """Rebuild a wave's extraction results from the job tracker"""
     results = []
+    for job_id in job_ids:
+        job = await job_tracker.get(job_id)
+        if job is not None and job.status == "completed" and job.result:
+            results.append(job.result)
+            continue
 
-    for article in articles:
-        # Queue individual extraction tasks
-        result = extract_claims_task.delay(article, f"batch_{article['article_id']}")
-        results.append(result.id)
+        # Killed mid-extraction: the job never reached a terminal status itself
+        message = job.error if job is not None and job.error else error
+        if job is None or job.status != "failed":
+            await job_tracker.update(job_id, status="failed", error=message)
+        results.append({"job_id": job_id, "status": "failed", "error": message})
 
-    return {
-        "status": "queued",
-        "tasks": results,
-        "count": len(articles)
-    }
+    return results
+
+
+def _advance_batch(batch_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Record a finished wave, then dispatch the next wave, the follow-ups or the completion"""
+    wave, options, counters = worker_runtime.run(record_wave_async(batch_id, results))
+
+    if wave:
+        _dispatch_wave(batch_id, wave)
+        return {"batch_id": batch_id, "status": "processing", **counters}
+
+    claim_ids = worker_runtime.run(batch_ingest.claim_ids(batch_id))
+    chunk_size = batch_ingest.followup_chunk_size
+    chunks = [claim_ids[i:i + chunk_size] for i in range(0, len(claim_ids), chunk_size)]
+
+    followups = []
+    if options["chain_decay"]:
+        followups += [batch_calculate_decay_task.s(chunk, False) for chunk in chunks]
+    if options["chain_retrieval"]:
+        followups += [batch_adversarial_retrieval_task.s(chunk) for chunk in chunks]
+
+    if not followups:
+        return worker_runtime.run(complete_batch_async(batch_id, []))
+
+    worker_runtime.run(
+        job_tracker.update(
+            batch_id,
+            status="processing",
+            progress=90,
+            message=f"Running follow-up decay scoring / retrieval for {len(claim_ids)} claims"
+        )
+    )
+    chord(
+        followups,
+        batch_extract_complete_task.s(batch_id).on_error(batch_extract_followups_failed_task.s(batch_id))
+    ).apply_async()
+
+    return {"batch_id": batch_id, "status": "processing", **counters}
+
+
+async def record_wave_async(
+    batch_id: str,
+    results: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Dict[str, int]]:
+    """Record a finished wave and take the next one"""
+    counters = await batch_ingest.record_wave(batch_id, results)
+    options = await batch_ingest.options(batch_id)
+
+    await job_tracker.update(
+        batch_id,
+        status="processing",
+        progress=int(90 * counters["done"] / max(counters["total"], 1)),
+        message=(
+            f"Extracted {counters['done']}/{counters['total']} articles "
+            f"({counters['failed']} failed, {counters['claims_extracted']} claims)"
+        )
+    )
+
+    wave = await batch_ingest.next_wave(batch_id, options["max_in_flight"])
+    return wave, options, counters
+
+
+@celery_app.task(name="batch_extract_complete")
+def batch_extract_complete_task(
+    followup_results: List[Dict[str, Any]],
+    batch_id: str,
+    followup_error: Optional[str] = None
+):
+    """
+    Chord callback for a batch import's chained decay / retrieval tasks
+
+    Args:
+        followup_results: batch_calculate_decay / batch_adversarial_retrieval results
+        batch_id: The batch
+        followup_error: Why the follow-up chord failed, if it did
+    """
+    return worker_runtime.run(complete_batch_async(batch_id, followup_results, followup_error))
+
+
+@celery_app.task(name="batch_extract_followups_failed")
+def batch_extract_followups_failed_task(request, exc, traceback, batch_id: str):
+    """
+    Chord error callback for a batch import's chained decay / retrieval tasks
+
+    Called inline wherever the failure is noticed, so it only queues the
+    batch completion (without follow-up counters) and records why.
+    """
+    batch_extract_complete_task.delay([], batch_id, followup_error=str(exc))
+
+
+async def complete_batch_async(
+    batch_id: str,
+    followup_results: List[Dict[str, Any]],
+    followup_error: Optional[str] = None
+) -> Dict[str, Any]:
+    """Aggregate the batch into its final job status and drop its working state"""
+    summary = await batch_ingest.summary(batch_id)
+    if followup_error:
+        summary["followup_error"] = followup_error
+
+    items = [item for result in followup_results for item in result.get("results", [])]
+    if followup_results:
+        summary["decay_scored"] = sum(1 for item in items if "decay_score" in item)
+        summary["retrieval_checked"] = sum(1 for item in items if "contradictions_found" in item)
+        summary["contradictions_found"] = sum(item.get("contradictions_found", 0) for item in items)
+        summary["followup_errors"] = sum(1 for item in items if item.get("status") == "error")
+
+    all_failed = summary["total"] > 0 and summary["succeeded"] == 0
+    await job_tracker.update(
+        batch_id,
+        status="failed" if all_failed else "completed",
+        progress=100,
+        message=(
+            f"Extracted {summary['claims_extracted']} claims from "
+            f"{summary['succeeded']}/{summary['total']} articles"
+        ),
+        result=summary,
+        error="Every article failed" if all_failed else None
+    )
+    await batch_ingest.cleanup(batch_id)
+
+    return {"batch_id": batch_id, "status": "failed" if all_failed else "completed", **summary}
+
+
+def _dispatch_wave(batch_id: str, articles: List[Dict[str, Any]]):
+    """
+    Queue one wave of extractions as a chord into batch_extract_wave_done
+
+    If the chord fails instead, batch_extract_wave_failed recovers the wave,
+    so the rest of the batch is still dispatched.
+    """
+    job_ids = [f"{batch_id}:{article['article_id']}" for article in articles]
+    chord(
+        [extract_claims_task.s(article, job_id) for article, job_id in zip(articles, job_ids)],
+        batch_extract_wave_done_task.s(batch_id).on_error(batch_extract_wave_failed_task.s(batch_id, job_ids))
+    ).apply_async()
@@ -0,0 +1,242 @@
+"""
+Long-running entity mention monitor
+
+Watches the entities found in mutable claims and keeps per-entity,
+minute-bucketed mention counters in Redis (see MentionCounters), so entity
+velocity can be answered without X API calls during decay refreshes.
+
+Run against the live filtered stream:
+
+    python -m app.workers.mention_monitor
+
+or against a local replay of JSON lines with `text` and `created_at`:
+
+    python -m app.workers.mention_monitor --replay tweets.jsonl --speed 60 --entities Apple,Biden
+"""
+from app.services.neo4j_client import neo4j_client
+from app.services.decay_forecaster import decay_forecaster
+from app.services.mention_counters import mention_counters
+from app.services.x_api_client import x_api_client
+from app.workers.decay_worker import rescore_entity_claims_task
+from typing import List, Dict, Any, Set, Tuple, Optional, Callable, Awaitable
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import json
+import time
+
+TweetCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+MentionSource = Callable[[List[str], TweetCallback], Awaitable[None]]
+
+
+class MentionMonitor:
+    """Matches streamed tweets against watched entities and counts mentions per minute"""
+
+    def __init__(self):
+        self.flush_interval_seconds = 5.0
+        self.trend_check_seconds = 60  # Minimum time between trending checks per entity
+        self.watch_refresh_seconds = 600  # How often the watched entity set is reloaded
+        self.page_size = 5000
+        self.entities: Dict[str, str] = {}  # Lowercase entity -> entity as written
+        self.entity_claim_counts: Dict[str, int] = {}  # Entity -> mutable claims naming it, from the last load
+        self.max_entity_words = 1
+        self.pending: Dict[Tuple[str, datetime], int] = defaultdict(int)
+        self.last_trend_check: Dict[str, float] = {}
+        self.tweets_seen = 0
+        self.mentions_counted = 0
+
+    async def load_entities(self) -> Set[str]:
+        """Collect the entities present in mutable claims, counting the claims naming each"""
+        counts: Counter = Counter()
+        after_id = None
+
+        while True:
+            claims = await neo4j_client.get_decay_inputs(after_id=after_id, limit=self.page_size)
+            for claim in claims:
+                counts.update(set(decay_forecaster.claim_entities(claim)))
+
+            if len(claims) < self.page_size:
+                self.entity_claim_counts = dict(counts)
+                return set(counts)
+
+            after_id = claims[-1]["claim_id"]
+
+    async def set_entities(self, entities: Set[str]):
+        """Replace the watched entity set, recording changes in Redis"""
+        previous = set(self.entities)
+        self.entities = {entity.lower(): entity for entity in entities}
+        self.max_entity_words = max((len(entity.split()) for entity in self.entities), default=1)
+
+        await mention_counters.unwatch(list(previous - set(self.entities)))
+        await mention_counters.watch(list(self.entities))
+
+    def stream_entities(self) -> List[str]:
+        """Watched entities for the source, those named by the most mutable claims first"""
+        return sorted(self.entities.values(), key=lambda entity: (-self.entity_claim_counts.get(entity, 0), entity))
+
+    def match(self, text: str) -> Set[str]:
+        """Watched entities mentioned in a tweet (word n-gram lookup, no regex scan)"""
+        words = [word.strip('.,!?;:"\'()#@').lower() for word in text.split()]
+        found = set()
+
+        for n in range(1, self.max_entity_words + 1):
+            for i in range(len(words) - n + 1):
+                candidate = " ".join(words[i:i + n])
+                if candidate in self.entities:
+                    found.add(candidate)
+
+        return found
+
+    async def handle_tweet(self, tweet: Dict[str, Any]):
+        """Count a tweet's entity mentions in its minute bucket"""
+        created_at = tweet.get("created_at")
+        if created_at:
+            timestamp = datetime.fromisoformat(created_at.replace("Z", "+00:00")).replace(tzinfo=None)
+        else:
+            timestamp = datetime.utcnow()
+        minute = timestamp.replace(second=0, microsecond=0)
+
+        self.tweets_seen += 1
+        for entity in self.match(tweet.get("text", "")):
+            self.pending[(entity, minute)] += 1
+            self.mentions_counted += 1
+
+    async def flush(self):
+        """Write buffered counts to Redis in one pipeline and refresh the heartbeat"""
+        pending, self.pending = self.pending, defaultdict(int)
+        await mention_counters.add(dict(pending))
+        await mention_counters.heartbeat()
+        await self.check_trending({entity for entity, _ in pending})
+
+    async def check_trending(self, entities: Set[str]):
+        """
+        Queue a re-score of an entity's claims when it starts trending
+
+        Uses only the counters (no API calls), and only for entities whose
+        counters cover the whole 24h window.
+        """
+        now = time.time()
+        end_time = x_api_client.counts_end_time()
+
+        for entity in entities:
+            if now - self.last_trend_check.get(entity, 0.0) < self.trend_check_seconds:
+                continue
+            self.last_trend_check[entity] = now
+
+            if not await mention_counters.covers(entity, end_time - timedelta(hours=24)):
+                continue
+
+            velocity = x_api_client.velocity_from_hourly_counts(
+                entity,
+                await mention_counters.hourly_counts(entity, end_time, hours=24)
+            )
+            if velocity["is_trending"] and await mention_counters.mark_trending(entity):
+                rescore_entity_claims_task.delay(self.entities.get(entity, entity))
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Error flushing mention counters: {e}")
+
+    async def run(self, source: MentionSource, entities: Optional[Set[str]] = None):
+        """
+        Consume a mention source until it ends (replay) or forever (live stream)
+
+        Args:
+            source: Callable taking (entities, callback) that feeds tweets to callback
+            entities: Fixed entity set; loaded from mutable claims (and
+                reloaded periodically) when not given
+        """
+        # Counters have a gap if the monitor was down, so coverage starts over
+        await mention_counters.begin_session()
+
+        await self.set_entities(entities if entities is not None else await self.load_entities())
+        flusher = asyncio.create_task(self._flush_periodically())
+        consumer = asyncio.create_task(source(self.stream_entities(), self.handle_tweet))
+
+        try:
+            while True:
+                refresh = None if entities is not None else self.watch_refresh_seconds
+                done, _ = await asyncio.wait({consumer}, timeout=refresh)
+
+                if consumer in done:
+                    consumer.result()  # Replay finished (or re-raise a source error)
+                    break
+
+                reloaded = await self.load_entities()
+                if {entity.lower() for entity in reloaded} != set(self.entities):
+                    # Restart the source so a live stream picks up the new rules
+                    consumer.cancel()
+                    await asyncio.gather(consumer, return_exceptions=True)
+                    await self.set_entities(reloaded)
+                    consumer = asyncio.create_task(source(self.stream_entities(), self.handle_tweet))
+        finally:
+            for task in (consumer, flusher):
+                task.cancel()
+            await asyncio.gather(consumer, flusher, return_exceptions=True)
+            await self.flush()
+
+
+def replay_source(path: str, speed: Optional[float] = None) -> MentionSource:
+    """
+    Local stand-in for the filtered stream, reading tweets from a JSON lines file
+
+    Args:
+        path: File with one tweet per line ({"text": ..., "created_at": ...})
+        speed: Replay this many times faster than real time (None = as fast as possible)
+    """
+    async def source(entities: List[str], callback: TweetCallback):
+        previous = None
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                tweet = json.loads(line)
+
+                if speed and tweet.get("created_at"):
+                    created_at = datetime.fromisoformat(tweet["created_at"].replace("Z", "+00:00"))
+                    if previous is not None:
+                        await asyncio.sleep(max((created_at - previous).total_seconds(), 0) / speed)
+                    previous = created_at
+
+                await callback(tweet)
+
+    return source
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Count entity mentions from the X filtered stream or a replay")
+    parser.add_argument("--replay", help="JSON lines file of tweets to replay instead of the live stream")
+    parser.add_argument("--speed", type=float, default=None, help="Replay speed multiplier (default: as fast as possible)")
+    parser.add_argument("--entities", help="Comma-separated entities to watch instead of loading them from Neo4j")
+    args = parser.parse_args()
+
+    entities = {entity.strip() for entity in args.entities.split(",") if entity.strip()} if args.entities else None
+    if entities is None:
+        await neo4j_client.connect()
+
+    source = replay_source(args.replay, args.speed) if args.replay else x_api_client.monitor_entity_mentions
+    monitor = MentionMonitor()
+    started = time.perf_counter()
+
+    try:
+        await monitor.run(source, entities=entities)
+    finally:
+        if entities is None:
+            await neo4j_client.close()
+        await x_api_client.close()
+
+    print(json.dumps({
+        "tweets_seen": monitor.tweets_seen,
+        "mentions_counted": monitor.mentions_counted,
+        "entities_watched": len(monitor.entities),
+        "elapsed_seconds": round(time.perf_counter() - started, 2)
+    }))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
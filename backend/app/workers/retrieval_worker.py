@@ -1,9 +1,10 @@
 from app.workers.celery_app import celery_app
+from app.workers.runtime import worker_runtime
 from app.services.adversarial_retriever import adversarial_retriever
+from app.services.contradiction_sweeper import contradiction_sweeper
 from app.services.neo4j_client import neo4j_client
 from uuid import UUID
 from typing import List, Optional
-import asyncio
 
 
 @celery_app.task(bind=True, name="run_adversarial_retrieval")
@@ -21,7 +22,9 @@ def adversarial_retrieval_task(
         claim_text: Text of the claim
         target_languages: Optional list of target languages
     """
-    return asyncio.run(adversarial_retrieval_async(self, claim_id, claim_text, target_languages))
+    return worker_runtime.run(
+        adversarial_retrieval_async(worker_runtime.handle(self), claim_id, claim_text, target_languages)
+    )
 
 
 async def adversarial_retrieval_async(
@@ -82,7 +85,7 @@ def batch_adversarial_retrieval_task(claim_ids: List[str], target_languages: Opt
         claim_ids: List of claim UUIDs as strings
         target_languages: Optional target languages
     """
-    return asyncio.run(batch_adversarial_retrieval_async(claim_ids, target_languages))
+    return worker_runtime.run(batch_adversarial_retrieval_async(claim_ids, target_languages))
 
 
 async def batch_adversarial_retrieval_async(claim_ids: List[str], target_languages: Optional[List[str]]):
@@ -90,11 +93,10 @@ async def batch_adversarial_retrieval_async(claim_ids: List[str], target_languag
 
     results = []
 
-    await neo4j_client.connect()
-
+    # Resolve claim texts first so retrieval can run as one batched sweep
+    claims_to_check = []
     for claim_id in claim_ids:
         try:
-            # Get claim text
             claim = await neo4j_client.get_claim_by_id(UUID(claim_id))
 
             if not claim:
@@ -105,31 +107,101 @@ async def batch_adversarial_retrieval_async(claim_ids: List[str], target_languag
                 })
                 continue
 
-            # Run retrieval
-            contradicting_sources = await adversarial_retriever.find_contradicting_sources(
-                claim_id=UUID(claim_id),
-                claim_text=claim.text,
-                target_languages=target_languages,
-                max_results=20
-            )
+            claims_to_check.append((UUID(claim_id), claim.text))
 
+        except Exception as e:
             results.append({
                 "claim_id": claim_id,
+                "status": "error",
+                "error": str(e)
+            })
+
+    # Run retrieval (the retriever chunks the claims into batched searches)
+    try:
+        contradictions_by_claim = await adversarial_retriever.find_contradicting_sources_batch(
+            claims=claims_to_check,
+            target_languages=target_languages,
+            max_results=20
+        )
+
+        for claim_id, _ in claims_to_check:
+            results.append({
+                "claim_id": str(claim_id),
                 "status": "completed",
-                "contradictions_found": len(contradicting_sources)
+                "contradictions_found": len(contradictions_by_claim.get(claim_id, []))
             })
 
-        except Exception as e:
+    except Exception as e:
+        for claim_id, _ in claims_to_check:
             results.append({
-                "claim_id": claim_id,
+                "claim_id": str(claim_id),
                 "status": "error",
                 "error": str(e)
             })
 
-    await neo4j_client.close()
-
     return {
         "status": "completed",
         "processed": len(claim_ids),
         "results": results
     }
+
+
+@celery_app.task(bind=True, name="contradiction_sweep")
+def contradiction_sweep_task(
+    self,
+    sweep_id: Optional[str] = None,
+    cross_language_only: bool = True,
+    max_pages: Optional[int] = None
+):
+    """
+    Corpus-wide contradiction sweep over the whole claims collection
+
+    Re-running with the same sweep_id resumes from the last checkpoint.
+    Retries of this task reuse its task ID, so they resume automatically.
+
+    Args:
+        sweep_id: Sweep to start or resume (defaults to this task's ID)
+        cross_language_only: Only assess pairs of claims in different languages
+        max_pages: Stop after this many pages (re-run to continue)
+    """
+    return worker_runtime.run(
+        contradiction_sweep_async(worker_runtime.handle(self), sweep_id or self.request.id, cross_language_only, max_pages)
+    )
+
+
+async def contradiction_sweep_async(
+    task,
+    sweep_id: str,
+    cross_language_only: bool,
+    max_pages: Optional[int]
+):
+    """Async implementation of the contradiction sweep"""
+
+    def report_progress(checkpoint):
+        task.update_state(
+            state="PROGRESS",
+            meta={
+                "status": f"Swept {checkpoint['claims_scanned']} claims",
+                "sweep_id": sweep_id,
+                "pages": checkpoint["pages"],
+                "contradictions_found": checkpoint["contradictions_found"]
+            }
+        )
+
+    try:
+        checkpoint = await contradiction_sweeper.run(
+            sweep_id=sweep_id,
+            cross_language_only=cross_language_only,
+            max_pages=max_pages,
+            progress_callback=report_progress
+        )
+
+        return checkpoint
+
+    except Exception as e:
+        task.update_state(state="FAILURE", meta={"error": str(e)})
+        return {
+            "sweep_id": sweep_id,
+            "status": "failed",
+            "error": str(e)
+        }
@@ -0,0 +1,198 @@
+"""
+Worker process runtime
+
+Each Celery worker process keeps one event loop and one set of open clients
+(Neo4j, vector store, Cohere, Grok) for its whole life. The loop starts with
+the process; the clients are opened by its first task (process init must
+report back to Celery within seconds, so it does no network I/O) and closed
+when it exits, so tasks only do their own work: no loop creation, driver
+pool or TLS handshake per task. Loop-bound clients
+(Redis, X API) are created on first use and then reused for the same reason.
+
+The loop runs in its own thread and tasks submit their coroutines to it with
+`worker_runtime.run(...)`. With the prefork pool that is one task at a time
+per process. With WORKER_POOL=async the Celery pool is threads that only wait
+on the shared loop, so one process runs many I/O-bound tasks concurrently.
+Celery's thread pool enforces no time limits, so run() applies
+task_soft_time_limit itself: the coroutine is cancelled on the loop and the
+task gets SoftTimeLimitExceeded, as it would under prefork. Each async worker
+consumes a single queue with as many threads as that
+queue's WORKER_QUEUE_CONCURRENCY, so the cap is enforced where messages are
+taken off the broker and one queue's backlog cannot hold another's threads.
+"""
+from app.services.neo4j_client import neo4j_client
+from app.services.vector_store import vector_store
+from app.services.embedding_service import embedding_service
+from app.services.grok_client import grok_client
+from app.services.x_api_client import x_api_client
+from app.utils.redis_client import close_redis
+from app.workers.celery_app import celery_app
+from celery.exceptions import SoftTimeLimitExceeded
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import threading
+
+T = TypeVar("T")
+
+
+class TaskHandle:
+    """
+    A Celery task bound to its request ID
+
+    Celery keeps the current request in thread-local state, which the loop
+    thread cannot see, so coroutines report progress through this handle.
+    """
+
+    def __init__(self, task):
+        self.task = task
+        self.request_id = task.request.id
+
+    def update_state(self, state: Optional[str] = None, meta: Optional[Dict[str, Any]] = None):
+        self.task.update_state(task_id=self.request_id, state=state, meta=meta)
+
+
+class WorkerRuntime:
+    """Long-lived event loop and connections for one worker process"""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        # (name, open, close) in opening order
+        self.resources: List[Tuple[str, Callable[[], Awaitable[None]], Callable[[], Awaitable[None]]]] = [
+            ("Neo4j", neo4j_client.connect, neo4j_client.close),
+            ("vector store", vector_store.connect, vector_store.close),
+            ("Cohere", embedding_service.connect, embedding_service.close),
+            ("Grok", grok_client.connect, grok_client.close),
+        ]
+        self.opened: List[str] = []
+        self.soft_time_limit: Optional[float] = celery_app.conf.task_soft_time_limit
+
+    @property
+    def ready(self) -> bool:
+        return self.loop is not None and len(self.opened) == len(self.resources)
+
+    def start_loop(self):
+        """Start the process event loop (no network I/O)"""
+        with self.lock:
+            self._start_loop()
+
+    def start(self):
+        """Start the process event loop and open every client not yet open"""
+        with self.lock:
+            if self.ready:
+                return
+
+            self._start_loop()
+            asyncio.run_coroutine_threadsafe(self._open(), self.loop).result()
+
+    def _start_loop(self):
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(target=self._run_loop, name="worker-event-loop", daemon=True)
+            self.thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _open(self):
+        for name, open_resource, _ in self.resources:
+            if name in self.opened:
+                continue
+            try:
+                await open_resource()
+                self.opened.append(name)
+            except Exception as e:
+                print(f"Error connecting to {name}: {e}")
+
+    def handle(self, task) -> TaskHandle:
+        """Bind a task to its current request for use inside run()"""
+        return TaskHandle(task)
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Run a task coroutine on the process event loop and wait for it
+
+        Clients are opened by the first task, and any that failed to open are
+        retried before the next one, so a worker that booted while a
+        dependency was down recovers on its own.
+
+        Args:
+            coro: The task's coroutine
+
+        Raises:
+            SoftTimeLimitExceeded: The coroutine ran past task_soft_time_limit
+        """
+        if not self.ready:
+            self.start()
+
+        future = asyncio.run_coroutine_threadsafe(self._time_limited(coro), self.loop)
+        try:
+            return future.result()
+        except BaseException:
+            # Time limit or worker shutdown: stop the coroutine too
+            future.cancel()
+            raise
+
+    async def _time_limited(self, coro: Awaitable[T]) -> T:
+        task = asyncio.ensure_future(coro)
+        if not self.soft_time_limit:
+            return await task
+
+        # asyncio.wait rather than wait_for, so a TimeoutError raised by the
+        # task itself is not mistaken for the time limit
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.soft_time_limit)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if not done:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise SoftTimeLimitExceeded(f"Task ran past its {self.soft_time_limit}s soft time limit")
+
+        return task.result()
+
+    def stop(self):
+        """Close every client and stop the event loop"""
+        with self.lock:
+            if self.loop is None:
+                return
+
+            asyncio.run_coroutine_threadsafe(self._close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = None
+            self.thread = None
+
+    async def _close(self):
+        closers = [close for name, _, close in reversed(self.resources) if name in self.opened]
+        closers += [x_api_client.close, close_redis]
+        self.opened = []
+
+        for close in closers:
+            try:
+                await close()
+            except Exception as e:
+                print(f"Error closing worker client: {e}")
+
+
+# Singleton instance
+worker_runtime = WorkerRuntime()
+
+
+@worker_process_init.connect
+def open_worker_process(**kwargs: Any):
+    """Prefork child started: start its loop (connections open on the first task)"""
+    worker_runtime.start_loop()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_worker_process(**kwargs: Any):
+    """Child (or solo/threads worker) exiting: close its connections"""
+    worker_runtime.stop()
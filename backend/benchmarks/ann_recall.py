@@ -0,0 +1,329 @@
+"""
+ANN recall/latency benchmark for the claims collection
+
+Loads a synthetic or exported vector set, computes exact top-k ground truth
+with NumpyVectorStore, then sweeps Qdrant HNSW `ef`, quantization and the
+score thresholds used by search_similar_claims (0.7) and
+search_contradicting_claims (0.75). Reports recall@k, p50/p99 latency and
+QPS per configuration as JSON.
+
+Usage (from backend/):
+    # Synthetic clustered vectors against a local Qdrant and the exact store
+    python -m benchmarks.ann_recall --points 50000 --queries 500
+
+    # Vectors exported from the live claims collection
+    python -m benchmarks.ann_recall --from-collection claims --queries 500
+
+    # A .npy matrix of vectors (queries are held out from it)
+    python -m benchmarks.ann_recall --vectors claims.npy --output results.json
+"""
+from qdrant_client.models import (
+    PointStruct, SearchParams, HnswConfigDiff, OptimizersConfigDiff, CollectionStatus,
+    ScalarQuantization, ScalarQuantizationConfig, ScalarType,
+    BinaryQuantization, BinaryQuantizationConfig, QuantizationSearchParams
+)
+from app.services.qdrant_client import QdrantService
+from app.services.numpy_vector_store import NumpyVectorStore
+from typing import List, Dict, Any, Optional, Tuple
+from uuid import uuid4
+from datetime import datetime
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+
+QUANTIZATION_CONFIGS = {
+    "none": None,
+    "int8": ScalarQuantization(
+        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+    ),
+    "binary": BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True)),
+}
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int, noise: float, seed: int) -> np.ndarray:
+    """Clustered Gaussian vectors, so neighbours have realistic similarity spread"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    assignments = rng.integers(0, clusters, size=count)
+    vectors = centers[assignments] + noise * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+async def export_collection(collection_name: str, limit: Optional[int]) -> np.ndarray:
+    """Export stored claim vectors from a Qdrant collection"""
+    service = QdrantService()
+    service.collection_name = collection_name
+    await service.connect()
+
+    vectors = []
+    offset = None
+    try:
+        while True:
+            points, offset = await service.scroll(limit=512, offset=offset, with_vectors=True)
+            vectors.extend(point["vector"] for point in points)
+            if offset is None or (limit and len(vectors) >= limit):
+                break
+    finally:
+        await service.close()
+
+    return np.asarray(vectors[:limit] if limit else vectors, dtype=np.float32)
+
+
+def _latency_stats(latencies: List[float], wall_seconds: float) -> Dict[str, float]:
+    """p50/p99 latency in milliseconds and QPS over the wall-clock run"""
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "qps": len(latencies) / wall_seconds
+    }
+
+
+def _quality(
+    results: List[List[Tuple[str, float]]],
+    ground_truth: List[List[Tuple[str, float]]],
+    k: int,
+    thresholds: List[float]
+) -> Dict[str, Any]:
+    """recall@k plus per-threshold recall against the exact thresholded result sets"""
+    hits = sum(
+        len({cid for cid, _ in found[:k]} & {cid for cid, _ in exact[:k]})
+        for found, exact in zip(results, ground_truth)
+    )
+    expected = sum(min(k, len(exact)) for exact in ground_truth)
+
+    per_threshold = {}
+    for threshold in thresholds:
+        threshold_hits = 0
+        threshold_expected = 0
+        returned = 0
+        queries_with_results = 0
+
+        for found, exact in zip(results, ground_truth):
+            found_ids = {cid for cid, score in found[:k] if score >= threshold}
+            exact_ids = {cid for cid, score in exact[:k] if score >= threshold}
+            threshold_hits += len(found_ids & exact_ids)
+            threshold_expected += len(exact_ids)
+            returned += len(found_ids)
+            queries_with_results += 1 if found_ids else 0
+
+        per_threshold[f"{threshold:.2f}"] = {
+            "recall": threshold_hits / threshold_expected if threshold_expected else 1.0,
+            "exact_results_per_query": threshold_expected / len(ground_truth),
+            "results_per_query": returned / len(results),
+            "queries_with_results": queries_with_results / len(results)
+        }
+
+    return {
+        f"recall_at_{k}": hits / expected if expected else 1.0,
+        "thresholds": per_threshold
+    }
+
+
+async def run_exact(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    ids: List[str],
+    k: int
+) -> Tuple[NumpyVectorStore, List[List[Tuple[str, float]]], Dict[str, Any]]:
+    """Load the in-process exact store, compute ground truth and time it"""
+    store = NumpyVectorStore(vector_size=vectors.shape[1], initial_capacity=len(vectors))
+    await store.connect()
+
+    extracted_at = datetime.utcnow()
+    for claim_id, vector in zip(ids, vectors):
+        await store.upsert_claim_embedding(claim_id, vector, "benchmark", "en", "", extracted_at)
+
+    # Ground truth in one batched pass
+    query_list = queries.tolist()
+    exact = await store.search_batch(
+        query_vectors=query_list,
+        original_claim_ids=[uuid4() for _ in query_list],
+        limit=k,
+        score_threshold=-1.0
+    )
+    ground_truth = [[(c["claim_id"], c["score"]) for c in candidates] for candidates in exact]
+
+    # Per-query latency, matching how the retriever calls the store
+    latencies = []
+    start = time.perf_counter()
+    for query in query_list:
+        query_start = time.perf_counter()
+        await store.search_contradicting_claims(query, uuid4(), limit=k, score_threshold=-1.0)
+        latencies.append(time.perf_counter() - query_start)
+    wall_seconds = time.perf_counter() - start
+
+    return store, ground_truth, {
+        "backend": "numpy-exact",
+        "ef": None,
+        "quantization": None,
+        "concurrency": 1,
+        **_latency_stats(latencies, wall_seconds)
+    }
+
+
+async def load_qdrant(
+    service: QdrantService,
+    vectors: np.ndarray,
+    ids: List[str],
+    quantization: str,
+    m: int,
+    ef_construct: int,
+    batch_size: int
+):
+    """Recreate the benchmark collection and wait until the HNSW index is built"""
+    if await service.collection_exists():
+        await service.client.delete_collection(collection_name=service.collection_name)
+
+    # Low thresholds force HNSW indexing and search even for small benchmark sets
+    await service.create_collection(
+        hnsw_config=HnswConfigDiff(m=m, ef_construct=ef_construct, full_scan_threshold=10),
+        quantization_config=QUANTIZATION_CONFIGS[quantization],
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=1)
+    )
+
+    extracted_at = datetime.utcnow()
+    for i in range(0, len(vectors), batch_size):
+        points = [
+            PointStruct(
+                id=claim_id,
+                vector=vector.tolist(),
+                payload=service._build_payload(claim_id, "benchmark", "en", "", extracted_at)
+            )
+            for claim_id, vector in zip(ids[i:i + batch_size], vectors[i:i + batch_size])
+        ]
+        await service.client.upsert(collection_name=service.collection_name, points=points, wait=True)
+
+    while True:
+        info = await service.client.get_collection(collection_name=service.collection_name)
+        if info.status == CollectionStatus.GREEN:
+            break
+        await asyncio.sleep(0.5)
+
+
+async def run_qdrant_ef(
+    service: QdrantService,
+    queries: np.ndarray,
+    quantization: str,
+    ef: int,
+    k: int,
+    concurrency: int,
+    oversampling: float
+) -> Tuple[List[List[Tuple[str, float]]], Dict[str, Any]]:
+    """Run all queries at one ef setting"""
+    search_params = SearchParams(
+        hnsw_ef=ef,
+        quantization=QuantizationSearchParams(rescore=True, oversampling=oversampling)
+        if QUANTIZATION_CONFIGS[quantization] is not None else None
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def search(query: List[float]) -> List[Tuple[str, float]]:
+        async with semaphore:
+            query_start = time.perf_counter()
+            hits = await service.client.search(
+                collection_name=service.collection_name,
+                query_vector=query,
+                limit=k,
+                search_params=search_params
+            )
+            latencies.append(time.perf_counter() - query_start)
+        return [(str(hit.id), hit.score) for hit in hits]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(search(query) for query in queries.tolist()))
+    wall_seconds = time.perf_counter() - start
+
+    return results, {
+        "backend": "qdrant-hnsw",
+        "ef": ef,
+        "quantization": quantization,
+        "concurrency": concurrency,
+        **_latency_stats(latencies, wall_seconds)
+    }
+
+
+async def main(args: argparse.Namespace):
+    # Load the vector set and hold out queries from the same distribution
+    if args.from_collection:
+        data = await export_collection(args.from_collection, args.points + args.queries)
+    elif args.vectors:
+        data = np.load(args.vectors).astype(np.float32)
+    else:
+        data = synthetic_vectors(args.points + args.queries, args.dim, args.clusters, args.noise, args.seed)
+
+    rng = np.random.default_rng(args.seed)
+    data = data[rng.permutation(len(data))]
+    queries, vectors = data[:args.queries], data[args.queries:]
+    ids = [str(uuid4()) for _ in range(len(vectors))]
+
+    report: Dict[str, Any] = {
+        "dataset": {
+            "source": args.from_collection or args.vectors or "synthetic",
+            "points": len(vectors),
+            "queries": len(queries),
+            "dim": int(vectors.shape[1])
+        },
+        "k": args.k,
+        "hnsw": {"m": args.m, "ef_construct": args.ef_construct},
+        "results": []
+    }
+
+    _, ground_truth, exact_row = await run_exact(vectors, queries, ids, args.k)
+    report["results"].append({**exact_row, **_quality(ground_truth, ground_truth, args.k, args.thresholds)})
+
+    if not args.skip_qdrant:
+        service = QdrantService()
+        service.collection_name = args.collection
+        service.vector_size = int(vectors.shape[1])
+        await service.connect()
+
+        try:
+            for quantization in args.quantization:
+                await load_qdrant(service, vectors, ids, quantization, args.m, args.ef_construct, args.batch_size)
+
+                for ef in args.ef:
+                    results, row = await run_qdrant_ef(
+                        service, queries, quantization, ef, args.k, args.concurrency, args.oversampling
+                    )
+                    report["results"].append({**row, **_quality(results, ground_truth, args.k, args.thresholds)})
+
+            await service.client.delete_collection(collection_name=args.collection)
+        finally:
+            await service.close()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure ANN recall and latency for the claims collection")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--from-collection", help="Export vectors from this Qdrant collection")
+    source.add_argument("--vectors", help="Path to a .npy matrix of vectors")
+    parser.add_argument("--points", type=int, default=20000, help="Indexed points (synthetic/export)")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construct", type=int, default=100)
+    parser.add_argument("--quantization", nargs="+", choices=list(QUANTIZATION_CONFIGS), default=["none", "int8"])
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--collection", default="benchmark_ann")
+    parser.add_argument("--skip-qdrant", action="store_true", help="Only run the in-process exact store")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    parser.add_argument("--seed", type=int, default=42)
+
+    asyncio.run(main(parser.parse_args()))
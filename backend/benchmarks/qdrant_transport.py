@@ -0,0 +1,161 @@
+"""
+Benchmark REST vs gRPC transport for Qdrant upserts and searches
+
+Loads random 1024-d claim vectors into a scratch collection once per
+transport and reports upsert and search throughput as JSON.
+
+Usage (from backend/):
+    python -m benchmarks.qdrant_transport --points 20000 --queries 500
+"""
+from qdrant_client.models import PointStruct
+from app.services.qdrant_client import QdrantService
+from typing import List, Dict, Any
+from uuid import uuid4
+from datetime import datetime
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+
+def _random_vectors(count: int, dim: int, seed: int) -> List[List[float]]:
+    """Generate reproducible random vectors"""
+    rng = random.Random(seed)
+    return [[rng.uniform(-1.0, 1.0) for _ in range(dim)] for _ in range(count)]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies"""
+    ordered = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+async def run_transport(
+    prefer_grpc: bool,
+    vectors: List[List[float]],
+    queries: List[List[float]],
+    collection_name: str,
+    batch_size: int,
+    search_batch_size: int
+) -> Dict[str, Any]:
+    """Run the upsert and search workload over a single transport"""
+    service = QdrantService()
+    service.collection_name = collection_name
+    await service.connect(prefer_grpc=prefer_grpc)
+
+    try:
+        if await service.collection_exists():
+            await service.client.delete_collection(collection_name=collection_name)
+        await service.create_collection()
+
+        # Batched upserts
+        extracted_at = datetime.utcnow().isoformat()
+        upsert_latencies = []
+        start = time.perf_counter()
+        for i in range(0, len(vectors), batch_size):
+            points = [
+                PointStruct(
+                    id=str(uuid4()),
+                    vector=vector,
+                    payload={
+                        "claimId": str(uuid4()),
+                        "articleId": f"bench_{i // batch_size}",
+                        "language": "en",
+                        "sourceUrl": "https://example.org",
+                        "extractedAt": extracted_at
+                    }
+                )
+                for vector in vectors[i:i + batch_size]
+            ]
+            batch_start = time.perf_counter()
+            await service.client.upsert(collection_name=collection_name, points=points, wait=True)
+            upsert_latencies.append(time.perf_counter() - batch_start)
+        upsert_seconds = time.perf_counter() - start
+
+        # Single searches through the service method used by the retriever
+        search_latencies = []
+        start = time.perf_counter()
+        for query in queries:
+            query_start = time.perf_counter()
+            await service.search_contradicting_claims(
+                query_vector=query,
+                original_claim_id=uuid4(),
+                limit=20,
+                score_threshold=0.0
+            )
+            search_latencies.append(time.perf_counter() - query_start)
+        search_seconds = time.perf_counter() - start
+
+        # Batched searches
+        start = time.perf_counter()
+        for i in range(0, len(queries), search_batch_size):
+            chunk = queries[i:i + search_batch_size]
+            await service.search_batch(
+                query_vectors=chunk,
+                original_claim_ids=[uuid4() for _ in chunk],
+                limit=20,
+                score_threshold=0.0
+            )
+        search_batch_seconds = time.perf_counter() - start
+
+        await service.client.delete_collection(collection_name=collection_name)
+    finally:
+        await service.close()
+
+    return {
+        "transport": "grpc" if prefer_grpc else "rest",
+        "upsert": {
+            "points": len(vectors),
+            "batch_size": batch_size,
+            "seconds": upsert_seconds,
+            "points_per_second": len(vectors) / upsert_seconds,
+            "batch_p50_ms": statistics.median(upsert_latencies) * 1000,
+            "batch_p99_ms": _percentile(upsert_latencies, 99) * 1000
+        },
+        "search": {
+            "queries": len(queries),
+            "qps": len(queries) / search_seconds,
+            "p50_ms": statistics.median(search_latencies) * 1000,
+            "p99_ms": _percentile(search_latencies, 99) * 1000
+        },
+        "search_batch": {
+            "queries": len(queries),
+            "batch_size": search_batch_size,
+            "qps": len(queries) / search_batch_seconds
+        }
+    }
+
+
+async def main(args: argparse.Namespace):
+    dim = QdrantService().vector_size
+    vectors = _random_vectors(args.points, dim, seed=args.seed)
+    queries = _random_vectors(args.queries, dim, seed=args.seed + 1)
+
+    results = []
+    for transport in args.transports:
+        results.append(await run_transport(
+            prefer_grpc=transport == "grpc",
+            vectors=vectors,
+            queries=queries,
+            collection_name=args.collection,
+            batch_size=args.batch_size,
+            search_batch_size=args.search_batch_size
+        ))
+
+    print(json.dumps({"vector_size": dim, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Qdrant REST and gRPC transports")
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--search-batch-size", type=int, default=64)
+    parser.add_argument("--collection", default="benchmark_transport")
+    parser.add_argument("--transports", nargs="+", choices=["rest", "grpc"], default=["rest", "grpc"])
+    parser.add_argument("--seed", type=int, default=42)
+
+    asyncio.run(main(parser.parse_args()))